@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from mostlyai.sdk.client.api import MostlyAI
+from mostlyai.sdk.client.async_api import AsyncMostlyAI
 
-__all__ = ["MostlyAI"]
+__all__ = ["MostlyAI", "AsyncMostlyAI"]
 __version__ = "4.4.9"  # Do not set this manually. Use poetry version [params].
@@ -16,10 +16,11 @@ import abc
 import functools
 import itertools
 import logging
-from copy import deepcopy
+from copy import copy, deepcopy
 from dataclasses import dataclass, field
+from types import MappingProxyType
 from typing import Any
-from collections.abc import Generator, Iterable
+from collections.abc import Generator, Iterable, Mapping
 
 import networkx as nx
 import pandas as pd
@@ -43,6 +44,9 @@ from mostlyai.sdk._data.util.common import (
 
 _LOG = logging.getLogger(__name__)
 
+# global, monotonically increasing counter to version the relation-defining fields of DataTable instances
+_RELATIONS_VERSION = itertools.count(1)
+
 
 # itertools recipe py39
 def pairwise(iterable):
@@ -126,9 +130,89 @@ class NonContextRelation(DataRelation):
         return NON_CONTEXT_COLUMN_INFIX.join([original_fk_name, self.src_table_name, IS_NULL])
 
 
+@dataclass(frozen=True)
+class RelationIndex:
+    """
+    Immutable adjacency index over the relations of a schema.
+
+    All lookups are precomputed once, so that navigating relations does not require a scan over all relations.
+    Relations are kept in the same order as they are listed by `Schema.relations`.
+    """
+
+    tables: tuple[str, ...] = ()
+    relations: tuple[DataRelation, ...] = ()
+    relations_from: Mapping[str, tuple[DataRelation, ...]] = field(default_factory=dict)
+    relations_to: Mapping[str, tuple[DataRelation, ...]] = field(default_factory=dict)
+    parent_context_relation: Mapping[str, ContextRelation] = field(default_factory=dict)
+    child_context_relations: Mapping[str, tuple[ContextRelation, ...]] = field(default_factory=dict)
+    non_context_relations_to: Mapping[str, tuple[NonContextRelation, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def from_tables(cls, tables: dict[str, "DataTable"]) -> "RelationIndex":
+        """
+        Build the index for the given tables.
+
+        :param tables: tables of the schema
+        """
+        relations = []
+        for table_name, table in tables.items():
+            for fk in table.foreign_keys:
+                if fk.referenced_table not in tables:
+                    continue  # the referenced table is outside of schema
+                parent_identifier = DataIdentifier(
+                    table=fk.referenced_table,
+                    column=tables[fk.referenced_table].primary_key,
+                )
+                child_identifier = DataIdentifier(table=table_name, column=fk.column)
+                relation_class = ContextRelation if fk.is_context else NonContextRelation
+                relations.append(relation_class(parent=parent_identifier, child=child_identifier))
+
+        relations_from, relations_to = {}, {}
+        parent_context_relation, child_context_relations, non_context_relations_to = {}, {}, {}
+        for rel in relations:
+            relations_from.setdefault(rel.parent.table, []).append(rel)
+            relations_to.setdefault(rel.child.table, []).append(rel)
+            if isinstance(rel, ContextRelation):
+                parent_context_relation.setdefault(rel.child.table, rel)
+                child_context_relations.setdefault(rel.parent.table, []).append(rel)
+            else:
+                non_context_relations_to.setdefault(rel.child.table, []).append(rel)
+
+        def _freeze(d: dict[str, list]) -> Mapping[str, tuple]:
+            return MappingProxyType({k: tuple(v) for k, v in d.items()})
+
+        return cls(
+            tables=tuple(tables.keys()),
+            relations=tuple(relations),
+            relations_from=_freeze(relations_from),
+            relations_to=_freeze(relations_to),
+            parent_context_relation=MappingProxyType(parent_context_relation),
+            child_context_relations=_freeze(child_context_relations),
+            non_context_relations_to=_freeze(non_context_relations_to),
+        )
+
+    @functools.cached_property
+    def graph(self) -> nx.MultiDiGraph:
+        g = nx.MultiDiGraph()
+        for table in self.tables:
+            g.add_node(table)
+        for rel in self.relations:
+            g.add_edge(
+                rel.parent.table,
+                rel.child.table,
+                type=type(rel),
+                parent_key=rel.parent.column,
+                child_key=rel.child.column,
+            )
+        return g
+
+
 @dataclass
 class Schema:
     tables: dict[str, "DataTable"] = field(default_factory=dict)
+    # names of tables, which are shared with the schema that this schema was subset from
+    _shared_tables: set[str] = field(default_factory=set, repr=False, compare=False)
+    _relation_index: tuple[tuple, RelationIndex] | None = field(default=None, init=False, repr=False, compare=False)
 
     def __hash__(self):
         return hash(
@@ -138,45 +222,70 @@ class Schema:
     def __eq__(self, other: "Schema"):
         return isinstance(other, Schema) and hash(self) == hash(other)
 
+    def __getstate__(self):
+        # the relation index is a cache, which is rebuilt on demand
+        return self.__dict__ | {"_relation_index": None}
+
+    def _relation_index_signature(self) -> tuple:
+        return tuple((name, table._relations_version) for name, table in self.tables.items())
+
+    @property
+    def relation_index(self) -> RelationIndex:
+        """
+        Precomputed relation index of this schema.
+
+        The index is rebuilt whenever tables are added, removed or replaced, or whenever the `primary_key` or the
+        `foreign_keys` of any of the tables are re-assigned.
+        """
+        if self._relation_index is not None:
+            signature, index = self._relation_index
+            if signature == self._relation_index_signature():
+                return index
+        index = RelationIndex.from_tables(self.tables)
+        # compute signature only after building the index, as building it may lazily fetch primary keys
+        self._relation_index = (self._relation_index_signature(), index)
+        return index
+
     @property
     def relations(self) -> list[DataRelation]:
-        relations = []
-        for table_name, table in self.tables.items():
-            for fk in table.foreign_keys:
-                if fk.referenced_table not in self.tables:
-                    continue  # the referenced table is outside of schema
-                parent_identifier = DataIdentifier(
-                    table=fk.referenced_table,
-                    column=self.tables[fk.referenced_table].primary_key,
-                )
-                child_identifier = DataIdentifier(table=table_name, column=fk.column)
-                relation_class = ContextRelation if fk.is_context else NonContextRelation
-                relations.append(relation_class(parent=parent_identifier, child=child_identifier))
-        return relations
+        return list(self.relation_index.relations)
+
+    def get_foreign_keys(self, table_name: str) -> list[ForeignKey]:
+        return list(self.tables[table_name].foreign_keys or [])
+
+    def get_writable_table(self, table_name: str) -> "DataTable":
+        """
+        Get a table that can be safely mutated without affecting the schema that this schema was subset from.
+
+        Tables which are shared with the original schema are copied on first call (copy-on-write).
+        """
+        if table_name in self._shared_tables:
+            self.tables[table_name] = self.copy_table(table_name)
+            self._shared_tables.discard(table_name)
+        return self.tables[table_name]
 
     @property
     def context_relations(self) -> list[ContextRelation]:
-        return [rel for rel in self.relations if isinstance(rel, ContextRelation)]
+        return [rel for rel in self.relation_index.relations if isinstance(rel, ContextRelation)]
 
     @property
     def non_context_relations(self) -> list[NonContextRelation]:
-        return [rel for rel in self.relations if isinstance(rel, NonContextRelation)]
+        return [rel for rel in self.relation_index.relations if isinstance(rel, NonContextRelation)]
 
     def get_relations_from_table(self, table_name: str) -> list[DataRelation]:
-        return [rel for rel in self.relations if rel.parent.table == table_name]
+        return list(self.relation_index.relations_from.get(table_name, ()))
 
     def get_relations_to_table(self, table_name: str) -> list[DataRelation]:
-        return [rel for rel in self.relations if rel.child.table == table_name]
+        return list(self.relation_index.relations_to.get(table_name, ()))
+
+    def get_non_context_relations_to_table(self, table_name: str) -> list[NonContextRelation]:
+        return list(self.relation_index.non_context_relations_to.get(table_name, ()))
 
     def get_relations_from_to_table(self, parent: str, child: str) -> list[DataRelation]:
-        return [rel for rel in self.relations if rel.parent.table == parent and rel.child.table == child]
+        return [rel for rel in self.relation_index.relations_from.get(parent, ()) if rel.child.table == child]
 
     def get_parent_context_relation(self, table_name: str) -> DataRelation | None:
-        for rel in self.relations:
-            if rel.child.table == table_name and isinstance(rel, ContextRelation):
-                return rel
-
-        return None
+        return self.relation_index.parent_context_relation.get(table_name)
 
     def get_parent(self, table_name: str) -> str:
         ctx_rel = self.get_parent_context_relation(table_name)
@@ -198,7 +307,7 @@ class Schema:
             return context_relations[0].parent
 
     def get_child_context_relations(self, parent_table: str) -> list[DataRelation]:
-        return [rel for rel in self.relations if rel.parent.table == parent_table and isinstance(rel, ContextRelation)]
+        return list(self.relation_index.child_context_relations.get(parent_table, ()))
 
     def get_context_children(self, parent_table: str) -> list[str]:
         ctx_rels = self.get_child_context_relations(parent_table)
@@ -247,16 +356,16 @@ class Schema:
     def get_scp_relations(self, table: str) -> list[ContextRelation]:
         relations = []
         while parent_table := self.get_parent(table):
-            sibling_tables = sorted(self.get_context_children(parent_table))
-            for s in sibling_tables:
-                if s < table:
-                    relations += self.get_relations_from_to_table(parent_table, s)
+            sibling_relations = sorted(
+                self.relation_index.child_context_relations.get(parent_table, ()), key=lambda rel: rel.child.table
+            )
+            relations += [rel for rel in sibling_relations if rel.child.table < table]
             table = parent_table
-        relations = [rel for rel in relations if isinstance(rel, ContextRelation)]
         return relations
 
     def update_key_encoding_types(self) -> None:
-        for tbl_name, tbl_table in self.tables.items():
+        for tbl_name in list(self.tables.keys()):
+            tbl_table = self.get_writable_table(tbl_name)
             if tbl_table.primary_key is not None:
                 if tbl_table.primary_key in tbl_table.encoding_types:
                     del tbl_table.encoding_types[tbl_table.primary_key]
@@ -266,7 +375,8 @@ class Schema:
             self.tables[tbl_name] = tbl_table
 
     def resolve_auto_encoding_types(self) -> None:
-        for tbl_name, tbl_table in self.tables.items():
+        for tbl_name in list(self.tables.keys()):
+            tbl_table = self.get_writable_table(tbl_name)
             for col_name, encoding_type in tbl_table.encoding_types.items():
                 if encoding_type == ModelEncodingType.auto:
                     promoted_enctype = V_DTYPE_ENCODING_TYPE_MAP[type(tbl_table.dtypes[col_name].to_virtual())]
@@ -280,46 +390,41 @@ class Schema:
         tables_with_cascading_keys = set()
         for table_name, table in self.tables.items():
             primary_key = table.primary_key
-            cascading_keys = [fk for fk in (table.foreign_keys or []) if fk.column == primary_key]
+            cascading_keys = [fk for fk in self.get_foreign_keys(table_name) if fk.column == primary_key]
             if cascading_keys:
                 tables_with_cascading_keys.add(table_name)
 
         # iterate over tables and their foreign keys, and remove those that cascade from identified tables
-        for table_name, table in self.tables.items():
+        for table_name in list(self.tables.keys()):
             # keep only the foreign keys that are not cascading from the identified tables
-            table.foreign_keys = [
-                fk for fk in (table.foreign_keys or []) if fk.referenced_table not in tables_with_cascading_keys
+            foreign_keys = [
+                fk for fk in self.get_foreign_keys(table_name) if fk.referenced_table not in tables_with_cascading_keys
             ]
+            self.get_writable_table(table_name).foreign_keys = foreign_keys
 
         if tables_with_cascading_keys:
             _LOG.info(f"Removed cascading keys relations for tables: {tables_with_cascading_keys}")
 
     @property
-    @functools.cache
-    def graph(self):
-        g = nx.MultiDiGraph()
-        for table in self.tables.keys():
-            g.add_node(table)
-        for rel in self.relations:
-            g.add_edge(
-                rel.parent.table,
-                rel.child.table,
-                type=type(rel),
-                parent_key=rel.parent.column,
-                child_key=rel.child.column,
-            )
-        return g
+    def graph(self) -> nx.MultiDiGraph:
+        return self.relation_index.graph
 
     def copy_table(self, name: str) -> "DataTable":
-        table = self.tables[name]
-        init_kwargs = {k: getattr(table, k) for k in ["container", "is_output"]}
-        init_kwargs |= {
-            table_field: getattr(table, table_field)
-            for table_field in table.LAZY_INIT_FIELDS
-            if hasattr(table, table_field) and table.__dict__.get(table_field) is not None
-        }
-        table_copy = type(table)(**init_kwargs)
-        return table_copy
+        return self._copy_table(self.tables[name])
+
+    @staticmethod
+    def _copy_table(table: "DataTable", **init_kwargs) -> "DataTable":
+        init_kwargs = (
+            {k: getattr(table, k) for k in ["container", "is_output"]}
+            | {
+                # shallow copy mutable metadata (e.g. encoding_types), so that the copy can be mutated independently
+                table_field: copy(getattr(table, table_field))
+                for table_field in table.LAZY_INIT_FIELDS
+                if hasattr(table, table_field) and table.__dict__.get(table_field) is not None
+            }
+            | init_kwargs
+        )
+        return type(table)(**init_kwargs)
 
     def copy_tables(self):
         tables = {}
@@ -335,19 +440,32 @@ class Schema:
         relations_to: list[str] | str | None = None,
         tables: dict[str, "DataTable"] | list[str] | None = None,
     ) -> "Schema":
+        """
+        Create a schema that is restricted to a subset of tables and relations.
+
+        Tables, whose foreign keys are not affected by the subset, are shared with this schema, and are copied on
+        write, see `get_writable_table`. All other tables are copied, so that their `foreign_keys` only hold the
+        foreign keys of the subset.
+        """
         # make sure tables is a dict
         if tables is None:
-            tables = self.copy_tables()
+            tables = dict(self.tables)
         elif isinstance(tables, list):
-            tables = {name: self.copy_table(name) for name in tables if name in self.tables}
+            tables = {name: self.tables[name] for name in tables if name in self.tables}
+        else:
+            tables = dict(tables)
 
         if isinstance(relations_from, str):
             relations_from = [relations_from]
         if isinstance(relations_to, str):
             relations_to = [relations_to]
 
-        # filter relations
-        relations = [rel for rel in self.relations if rel.parent.table in tables and rel.child.table in tables]
+        # filter relations; these are defined by the given tables, unless these are the tables of this schema
+        if all(table is self.tables.get(name) for name, table in tables.items()):
+            relations = self.relations
+        else:
+            relations = RelationIndex.from_tables(tables).relations
+        relations = [rel for rel in relations if rel.parent.table in tables and rel.child.table in tables]
         if relation_type:
             relations = [rel for rel in relations if isinstance(rel, relation_type)]
         if relations_from:
@@ -355,11 +473,14 @@ class Schema:
         if relations_to:
             relations = [rel for rel in relations if rel.child.table in relations_to]
 
-        # update the foreign keys after filtering them based on relations
+        # filter the foreign keys of the tables based on relations
+        relations = set(relations)
+        subset_tables, shared_tables = {}, set()
         for table_name, table in tables.items():
-            table.foreign_keys = [
+            foreign_keys = list(table.foreign_keys or [])
+            subset_foreign_keys = [
                 fk
-                for fk in table.foreign_keys
+                for fk in foreign_keys
                 if fk.referenced_table in tables
                 and (ContextRelation if fk.is_context else NonContextRelation)(
                     DataIdentifier(
@@ -370,8 +491,13 @@ class Schema:
                 )
                 in relations
             ]
+            if subset_foreign_keys == foreign_keys:
+                subset_tables[table_name] = table
+                shared_tables.add(table_name)
+            else:
+                subset_tables[table_name] = self._copy_table(table, foreign_keys=subset_foreign_keys)
 
-        return Schema(tables=tables)
+        return Schema(tables=subset_tables, _shared_tables=shared_tables)
 
     @property
     def table_root_map(self) -> dict[str, str]:
@@ -452,6 +578,16 @@ class DataContainer(abc.ABC):
         """
         pass
 
+    def query_chunks(self, sql: str, chunk_size: int = 100_000) -> Generator[pd.DataFrame, None, None]:
+        """
+        Execute a SQL query against this data source, and yield its results in chunks.
+
+        :param sql: SQL query to execute
+        :param chunk_size: max number of rows per chunk
+        :return: iterator over DataFrames containing the query results
+        """
+        yield self.query(sql)
+
     # DEFAULT METHODS (noop, unless applicable)
     def drop_all(self):
         """
@@ -489,7 +625,9 @@ class DataContainer(abc.ABC):
 
 class DataTable(abc.ABC):
     LAZY_INIT_FIELDS: set[str] = frozenset(DATA_TABLE_METADATA_FIELDS)
+    RELATION_FIELDS: set[str] = frozenset({"primary_key", "foreign_keys"})
     DATA_TABLE_TYPE: str | None = None
+    _relations_version: int = 0
 
     def __init__(self, *args, **kwargs):
         self.container: DataContainer | None = kwargs.get("container")
@@ -515,6 +653,12 @@ class DataTable(abc.ABC):
             self._lazy_fetch(item)
         return object.__getattribute__(self, item)
 
+    def __setattr__(self, key: str, value: Any):
+        super().__setattr__(key, value)
+        if key in DataTable.RELATION_FIELDS:
+            # let any Schema holding this table know that its relation index is outdated
+            super().__setattr__("_relations_version", next(_RELATIONS_VERSION))
+
     def __hash__(self):
         return hash((self.container, self.name))
 
@@ -75,13 +75,19 @@ def convert_connector_params_to_container_params(connector: Connector) -> dict[s
     return container_params
 
 
+def get_container_class(
+    connector_type: ConnectorType,
+) -> type[SqlAlchemyContainer | BucketBasedContainer | FileContainer]:
+    container_cls_path = CONNECTOR_TYPE_CONTAINER_CLASS_MAP.get(connector_type)
+    if not container_cls_path:
+        raise ValueError("Unsupported connector type!")
+    return locate(container_cls_path)
+
+
 def create_container_from_connector(
     connector: Connector,
 ) -> SqlAlchemyContainer | BucketBasedContainer | FileContainer:
-    container_cls_path = CONNECTOR_TYPE_CONTAINER_CLASS_MAP.get(connector.type)
-    if not container_cls_path:
-        raise ValueError("Unsupported connector type!")
-    container_cls = locate(container_cls_path)
+    container_cls = get_container_class(connector.type)
     container_params = convert_connector_params_to_container_params(connector)
     container = container_cls(**container_params)
     # Check if the container is accessible before __repr__ (workaround broken logic of sa and __repr__)
@@ -596,6 +596,15 @@ class SqlAlchemyContainer(DBContainer, abc.ABC):
                 _LOG.error(f"Error executing query: {str(e)}")
                 raise
 
+    def query_chunks(self, sql: str, chunk_size: int = 100_000) -> Generator[pd.DataFrame, None, None]:
+        assert_read_only_sql(sql)
+        with self.init_sa_connection() as engine:
+            try:
+                yield from pd.read_sql(sql, engine, chunksize=chunk_size)
+            except sa.exc.SQLAlchemyError as e:
+                _LOG.error(f"Error executing query: {str(e)}")
+                raise
+
     def drop_all(self):
         if self.sa_metadata:
             with self.use_sa_engine() as sa_engine:
@@ -18,6 +18,7 @@ import logging
 import re
 import time
 from abc import abstractmethod
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
 from typing import Any
@@ -509,7 +510,8 @@ class FileContainer(DataContainer):
 
         con.execute(create_secret_sql)
 
-    def query(self, sql: str) -> pd.DataFrame:
+    @contextmanager
+    def _init_duckdb_query(self, sql: str) -> Generator[duckdb.DuckDBPyConnection, None, None]:
         assert_read_only_sql(sql)
         try:
             with duckdb.connect(database=":memory:") as con:
@@ -519,9 +521,7 @@ class FileContainer(DataContainer):
                     SET lock_configuration = true;
                 """)
                 self._init_duckdb(con)
-                result = con.execute(sql).fetchdf()
-
-            return result
+                yield con
         except duckdb.IOException as e:
             _LOG.error(f"IO Error executing query: {str(e)}")
             raise
@@ -529,6 +529,20 @@ class FileContainer(DataContainer):
             _LOG.error(f"DuckDB Error executing query: {str(e)}")
             raise
 
+    def query(self, sql: str) -> pd.DataFrame:
+        with self._init_duckdb_query(sql) as con:
+            return con.execute(sql).fetchdf()
+
+    def query_chunks(self, sql: str, chunk_size: int = 100_000) -> Generator[pd.DataFrame, None, None]:
+        with self._init_duckdb_query(sql) as con:
+            reader = con.execute(sql).fetch_record_batch(chunk_size)
+            is_empty = True
+            for batch in reader:
+                is_empty = False
+                yield batch.to_pandas()
+            if is_empty:
+                yield reader.schema.empty_table().to_pandas()
+
 
 class LocalFileContainer(FileContainer):
     SCHEMES = ["file"]
@@ -13,14 +13,14 @@
 # limitations under the License.
 
 import logging
-import uuid
 
 import pandas as pd
 
 from mostlyai.sdk.domain import ModelType
 
 from mostlyai.sdk._data.base import Schema
-from mostlyai.sdk._data.util.common import TABLE_COLUMN_INFIX, TEMPORARY_PRIMARY_KEY
+from mostlyai.sdk._data.dtype import STRING
+from mostlyai.sdk._data.util.common import TABLE_COLUMN_INFIX, TEMPORARY_PRIMARY_KEY, generate_uuids
 
 _LOG = logging.getLogger(__name__)
 
@@ -66,7 +66,7 @@ def split_language_model(
             tgt_fk = ctx_relation.child.ref_name()
             ctx_data = pd.merge(ctx_data, other_data, how="inner", left_on=ctx_pk, right_on=tgt_fk)
 
-    tmp_keys = [str(uuid.uuid4()) for _ in range(len(ctx_data))]
+    tmp_keys = pd.array(generate_uuids(len(ctx_data)), dtype=STRING)
     tgt_data.insert(0, TEMPORARY_PRIMARY_KEY, tmp_keys)
     ctx_data.insert(0, f"{tgt}{TABLE_COLUMN_INFIX}{TEMPORARY_PRIMARY_KEY}", tmp_keys)
     return ctx_data, tgt_data
@@ -15,9 +15,15 @@
 import logging
 from copy import copy
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 from mostlyai.sdk._data.base import DataTable, Schema, NonContextRelation, DataIdentifier
+from mostlyai.sdk._data.file.base import LocalFileContainer
+from mostlyai.sdk._data.file.table.parquet import ParquetDataTable
 
 _LOG = logging.getLogger(__name__)
 
@@ -29,27 +35,60 @@ def handle_non_context_relations(
     table_name: str,
     data: pd.DataFrame,
     is_target: bool,
+    parent_keys_cache: dict[NonContextRelation, pa.Array] | None = None,
 ) -> pd.DataFrame:
-    """Handle all non-context relations for a table"""
-    non_context_relations = schema.subset(
-        relation_type=NonContextRelation,
-        relations_to=[table_name],
-    ).relations
-    for relation in non_context_relations:
+    """
+    Handle all non-context relations for a table.
+
+    Pass the same `parent_keys_cache` for all chunks of a table, so that the keys of each non-context parent
+    are read only once.
+    """
+    for relation in schema.get_non_context_relations_to_table(table_name):
         data = handle_non_context_relation(
             data=data,
             table=schema.tables[relation.parent.table],
             relation=relation,
             is_target=is_target,
+            parent_keys_cache=parent_keys_cache,
         )
     return data
 
 
+def read_parent_keys(table: DataTable) -> pa.Array:
+    """Read the unique, non-null primary keys of a non-context parent table."""
+    pk = table.primary_key
+    pk_qual_name = DataIdentifier(table.name, pk).ref_name()
+    parent_keys = table.read_data_prefixed(columns=[pk], do_coerce_dtypes=True)[pk_qual_name].dropna()
+    return pc.unique(pa.Array.from_pandas(parent_keys))
+
+
+def is_in_parent_keys(values: pd.Series, parent_keys: pa.Array) -> np.ndarray:
+    """Vectorized check whether values are present in the parent keys. Missing values are never present."""
+
+    def _kind(t: pa.DataType) -> str:
+        if pa.types.is_integer(t) or pa.types.is_floating(t):
+            return "numeric"
+        if pa.types.is_string(t) or pa.types.is_large_string(t):
+            return "string"
+        return str(t)
+
+    try:
+        arrow_values = pa.Array.from_pandas(values)
+        if not arrow_values.type.equals(parent_keys.type) and _kind(arrow_values.type) == _kind(parent_keys.type):
+            parent_keys = parent_keys.cast(arrow_values.type)
+        is_in = pc.is_in(arrow_values, value_set=parent_keys)
+        return is_in.fill_null(False).to_numpy(zero_copy_only=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # fall back to pandas for keys of incompatible types
+        return (values.isin(parent_keys.to_pandas()) & values.notna()).to_numpy()
+
+
 def handle_non_context_relation(
     data: pd.DataFrame,
     table: DataTable,
     relation: NonContextRelation,
     is_target: bool = False,
+    parent_keys_cache: dict[NonContextRelation, pa.Array] | None = None,
 ) -> pd.DataFrame:
     """Handle a single non-context relation for a table and add an is_null column."""
     _LOG.info(f"handle non-context relation {table.name}")
@@ -59,24 +98,17 @@ def handle_non_context_relation(
     if fk not in data:
         return data  # nothing to handle
 
-    # identify which values in the FK column have no corresponding entry in the non-context table
-    keys = set(data[fk].dropna())
-    if len(keys) > 0:
-        pk = table.primary_key
-        pk_qual_name = DataIdentifier(table.name, pk).ref_name()
-        # check for keys not in the parent table
-        missing_keys = keys - set(
-            table.read_data_prefixed(
-                where={pk: list(keys)},
-                columns=[pk],
-                do_coerce_dtypes=True,
-            )[pk_qual_name]
-        )
+    # identify which values in the FK column have a corresponding entry in the non-context table
+    if data[fk].notna().any():
+        parent_keys_cache = parent_keys_cache if parent_keys_cache is not None else {}
+        if relation not in parent_keys_cache:
+            parent_keys_cache[relation] = read_parent_keys(table)
+        is_present = is_in_parent_keys(data[fk], parent_keys_cache[relation])
     else:
-        missing_keys = set()
+        is_present = np.zeros(len(data), dtype=bool)
 
     # create the is_null column based on whether a non-context foreign-key is present or not
-    is_null_values = data[fk].apply(lambda x: str(pd.isna(x) or x in missing_keys))
+    is_null_values = pd.Series(np.where(is_present, "False", "True"), index=data.index, dtype="object")
 
     # replace the fk column with the is_null values and rename it accordingly
     data[fk] = is_null_values
@@ -88,24 +120,59 @@ def handle_non_context_relation(
 # POSTPROC
 
 
+class NonContextKeyPool:
+    """
+    Pool of primary keys of a non-context parent table, to sample non-context keys from.
+
+    The keys are loaded once and can then be shared across all partitions of the child table.
+    """
+
+    def __init__(self, keys: pa.ChunkedArray):
+        # avoid copying the keys, unless there are nulls to drop
+        self.keys = keys if keys.null_count == 0 else keys.filter(keys.is_valid())
+
+    @classmethod
+    def from_table(cls, table: DataTable, column: str) -> "NonContextKeyPool":
+        if isinstance(table, ParquetDataTable) and isinstance(table.container, LocalFileContainer):
+            # memory-map local parquet files, and only read the key column
+            keys = pq.read_table(table.dataset.files, columns=[column], memory_map=True).column(column)
+        else:
+            keys = pa.chunked_array(
+                [pa.Array.from_pandas(table.read_data(do_coerce_dtypes=True, columns=[column])[column])]
+            )
+        _LOG.info(f"loaded {len(keys)} keys of `{table.name}` into non-context key pool")
+        return cls(keys)
+
+    @classmethod
+    def from_series(cls, keys: pd.Series) -> "NonContextKeyPool":
+        return cls(pa.chunked_array([pa.Array.from_pandas(keys)]))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def sample(self, mask: np.ndarray, rng: np.random.Generator) -> pa.ChunkedArray:
+        """Sample a key with replacement for each True value of mask, and a null for each False value."""
+        if len(self.keys) == 0:
+            return pa.chunked_array([pa.nulls(len(mask), type=self.keys.type)])
+        positions = rng.integers(0, len(self.keys), size=len(mask))
+        return self.keys.take(pa.array(positions, mask=~mask))
+
+
 def sample_non_context_keys(
     tgt_is_null: pd.Series,
-    non_ctx_pks: pd.DataFrame,
+    non_ctx_pks: pd.Series | NonContextKeyPool,
+    rng: np.random.Generator | None = None,
 ) -> pd.Series:
     """
     Non-context matching algorithm. For each row in tgt_data, we randomly match a record in non_ctx_data.
-    Returns pd.Series of sampled row indexes.
+    Returns pd.Series of sampled keys.
     """
-    tgt_is_null = tgt_is_null.astype("string")
-    # initialize returned pd.Series with NAs
-    pk_dtype = non_ctx_pks.convert_dtypes(dtype_backend="pyarrow").dtype
-    sampled_keys = pd.Series([pd.NA] * len(tgt_is_null), dtype=pk_dtype, index=tgt_is_null.index)
-    # return immediately if no candidates to sample from
-    if len(tgt_is_null) == 0:
-        return sampled_keys
-    tgt_to_sample = tgt_is_null[tgt_is_null != "True"].index
-    samples = non_ctx_pks.sample(n=len(tgt_to_sample), replace=True).reset_index(drop=True)
-    sampled_keys[tgt_to_sample] = samples
+    key_pool = non_ctx_pks if isinstance(non_ctx_pks, NonContextKeyPool) else NonContextKeyPool.from_series(non_ctx_pks)
+    # by default, derive the generator from numpy's global random state, so that np.random.seed() applies
+    rng = rng if rng is not None else np.random.default_rng(np.random.randint(2**32, dtype=np.uint64))
+    to_sample = (tgt_is_null.astype("string") != "True").fillna(True).to_numpy(dtype=bool)
+    sampled_keys = key_pool.sample(to_sample, rng=rng).to_pandas(types_mapper=pd.ArrowDtype)
+    sampled_keys.index = tgt_is_null.index
     return sampled_keys
 
 
@@ -113,25 +180,29 @@ def postproc_non_context(
     tgt_data: pd.DataFrame,
     generated_data_schema: Schema,
     tgt: str,
+    key_pools: dict[NonContextRelation, NonContextKeyPool] | None = None,
+    rng: np.random.Generator | None = None,
 ) -> pd.DataFrame:
     """
     Apply non-context keys allocation for each non-context relation for a generated table.
+
+    Pass the same `key_pools` for all partitions of a table, so that the keys of each non-context parent are loaded
+    only once.
     """
     tgt_data = copy(tgt_data)
-    for rel in generated_data_schema.relations:
-        if not isinstance(rel, NonContextRelation) or rel.child.table != tgt:
-            continue
+    key_pools = key_pools if key_pools is not None else {}
+    for rel in generated_data_schema.get_non_context_relations_to_table(tgt):
         tgt_fk_name = rel.child.column
         tgt_is_null_column_name = rel.get_is_null_column()
         _LOG.info(f"sample non-context keys for {tgt_fk_name}")
         tgt_is_null = tgt_data[tgt_is_null_column_name]
-        # read referenced table's keys
-        non_ctx_pk_name = rel.parent.column
-        non_ctx_pks = generated_data_schema.tables[rel.parent.table].read_data(
-            do_coerce_dtypes=True, columns=[non_ctx_pk_name]
-        )[non_ctx_pk_name]
+        # load referenced table's keys
+        if rel not in key_pools:
+            key_pools[rel] = NonContextKeyPool.from_table(
+                generated_data_schema.tables[rel.parent.table], rel.parent.column
+            )
         # sample non-ctx keys
-        sampled_keys = sample_non_context_keys(tgt_is_null, non_ctx_pks)
+        sampled_keys = sample_non_context_keys(tgt_is_null, key_pools[rel], rng=rng)
         # replace is_null column with sampled keys
         tgt_data.insert(tgt_data.columns.get_loc(tgt_is_null_column_name), tgt_fk_name, sampled_keys)
         tgt_data = tgt_data.drop(columns=[tgt_is_null_column_name])
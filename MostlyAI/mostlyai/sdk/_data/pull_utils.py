@@ -746,6 +746,7 @@ def split_context(
         iterator = ctx_table.read_chunks_prefixed(do_coerce_dtypes=True, fetch_chunk_size=100_000)
         table = ctx_table
         key = schema.get_primary_key(table.name)
+        parent_keys_cache = {}
         for idx, chunk in enumerate(iterator):
             # add GPC context
             chunk = add_gpc_context(
@@ -773,6 +774,7 @@ def split_context(
                     table_name=table.name,
                     data=chunk,
                     is_target=False,
+                    parent_keys_cache=parent_keys_cache,
                 )
                 if idx == 0:
                     _LOG.info(f"{chunk.shape=} (post handle non-context relations)")
@@ -860,12 +862,14 @@ def split_target(
                 return chunk[key]
             return chunk.index
 
+        parent_keys_cache = {}
         for idx, chunk in enumerate(iterator):
             chunk = handle_non_context_relations(
                 schema=schema,
                 table_name=table.name,
                 data=chunk,
                 is_target=True,
+                parent_keys_cache=parent_keys_cache,
             )
             if idx == 0:
                 _LOG.info(f"{chunk.shape=} (post handle non-context relations)")
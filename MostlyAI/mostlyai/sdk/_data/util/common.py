@@ -23,7 +23,9 @@ from pathlib import Path
 from typing import Any, Union, Literal
 from collections.abc import Callable
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 from Cryptodome.Cipher import AES
 from Cryptodome.Util.Padding import pad, unpad
 import concurrent.futures
@@ -160,6 +162,37 @@ class absorb_errors:
         return True
 
 
+# lookup table from byte value to its two lowercase hex digits, packed as one 16-bit value
+_HEX_DIGITS = np.frombuffer(b"".join(f"{i:02x}".encode() for i in range(256)), dtype=np.uint16)
+# spans of hex digits within the 36 characters of a UUID string, e.g. `xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx`
+_UUID_HEX_SPANS = [(0, 8), (9, 13), (14, 18), (19, 23), (24, 36)]
+
+
+def generate_uuids(n: int, prefix: str = "") -> pa.Array:
+    """
+    Generate random version 4 UUIDs, formatted as strings, in bulk.
+
+    :param n: number of UUIDs to generate
+    :param prefix: optional prefix, which overwrites the leading characters, so that all keys keep a length of 36
+    :return: Arrow array of large strings, e.g. `mostly44-7f2b-4c6e-9a1d-0b3e5f6a7c8d` for prefix `mostly`
+    """
+    assert len(prefix) <= 36
+    random_bytes = np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    # set version (4) and variant (RFC 4122) bits, same as uuid.uuid4()
+    random_bytes[:, 6] = (random_bytes[:, 6] & 0x0F) | 0x40
+    random_bytes[:, 8] = (random_bytes[:, 8] & 0x3F) | 0x80
+    hex_digits = _HEX_DIGITS[random_bytes].view(np.uint8)
+    chars = np.full((n, 36), ord("-"), dtype=np.uint8)
+    hex_start = 0
+    for start, end in _UUID_HEX_SPANS:
+        chars[:, start:end] = hex_digits[:, hex_start : hex_start + end - start]
+        hex_start += end - start
+    if prefix:
+        chars[:, : len(prefix)] = np.frombuffer(prefix.encode(), dtype=np.uint8)
+    offsets = np.arange(0, 36 * (n + 1), 36, dtype=np.int64)
+    return pa.LargeStringArray.from_buffers(n, pa.py_buffer(offsets), pa.py_buffer(chars))
+
+
 def strip_column_prefix(
     prefixed_data: pd.Index | list[str] | str,
     table_name: str | None = None,
@@ -0,0 +1,255 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import os
+import sqlite3
+from collections.abc import Generator as GeneratorType
+from contextlib import closing, contextmanager
+from enum import Enum
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+
+from mostlyai.sdk.domain import Generator, GeneratorListItem, SyntheticDataset, SyntheticDatasetListItem
+
+_LOG = logging.getLogger(__name__)
+
+CATALOG_FILE = "catalog.sqlite"
+# seconds to wait for concurrent writers, e.g. job subprocesses, to release the database
+CATALOG_TIMEOUT = 30.0
+# version of the catalog schema; catalogs of another version, incl. newly created ones, are rebuilt from the JSON files
+CATALOG_VERSION = 1
+
+
+class CatalogKind(str, Enum):
+    generators = "generators"
+    synthetic_datasets = "synthetic-datasets"
+
+
+class CatalogSortBy(str, Enum):
+    recency = "RECENCY"
+    name = "NAME"
+
+
+# name of the JSON file within each resource dir, for each kind of resource
+_JSON_FILES = {
+    CatalogKind.generators: "generator.json",
+    CatalogKind.synthetic_datasets: "synthetic-dataset.json",
+}
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS resources (
+        kind TEXT NOT NULL,
+        id TEXT NOT NULL,
+        name_lower TEXT NOT NULL,
+        description_lower TEXT NOT NULL,
+        status TEXT,
+        created_at REAL NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        list_item TEXT NOT NULL,
+        PRIMARY KEY (kind, id)
+    );
+    CREATE INDEX IF NOT EXISTS resources_status ON resources (kind, status, created_at);
+    CREATE INDEX IF NOT EXISTS resources_created_at ON resources (kind, created_at);
+    CREATE INDEX IF NOT EXISTS resources_name ON resources (kind, name_lower);
+"""
+
+# catalog files, whose schema has been created by this process
+_INITIALIZED_CATALOGS: set[Path] = set()
+
+_ORDER_BY = {
+    CatalogSortBy.recency: "created_at DESC, id",
+    CatalogSortBy.name: "name_lower, created_at DESC, id",
+}
+
+
+@contextmanager
+def _connect(home_dir: Path) -> GeneratorType[sqlite3.Connection, None, None]:
+    catalog_file = home_dir / CATALOG_FILE
+    if not catalog_file.exists():
+        # the catalog is re-created, if it is lost
+        _INITIALIZED_CATALOGS.discard(catalog_file)
+    with closing(sqlite3.connect(catalog_file, timeout=CATALOG_TIMEOUT)) as con:
+        if catalog_file not in _INITIALIZED_CATALOGS:
+            # WAL allows listing while job subprocesses update the status of their resources
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(_SCHEMA)
+            (version,) = con.execute("PRAGMA user_version").fetchone()
+            if version != CATALOG_VERSION:
+                with con:
+                    for kind in CatalogKind:
+                        _sync(con, home_dir, kind)
+                    con.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+            _INITIALIZED_CATALOGS.add(catalog_file)
+        with con:
+            yield con
+
+
+def _get_created_at(resource_dir: Path, resource: Generator | SyntheticDataset) -> float:
+    if resource.metadata and resource.metadata.created_at:
+        return resource.metadata.created_at.timestamp()
+    # local resources carry no metadata, thus fall back to the creation time of their dir, where the platform
+    # provides it, and to the earlier of its modification and change time otherwise
+    stat = resource_dir.stat()
+    return getattr(stat, "st_birthtime", None) or min(stat.st_mtime, stat.st_ctime)
+
+
+def _upsert(
+    con: sqlite3.Connection,
+    kind: CatalogKind,
+    resource_dir: Path,
+    resource: Generator | SyntheticDataset,
+    mtime_ns: int,
+) -> None:
+    if kind == CatalogKind.generators:
+        # use model_construct to skip validation and warnings of extra fields
+        list_item = GeneratorListItem.model_construct(**resource.model_dump())
+        status = resource.training_status
+    else:
+        list_item = SyntheticDatasetListItem.model_construct(**resource.model_dump())
+        status = resource.generation_status
+    con.execute(
+        """
+        INSERT INTO resources (kind, id, name_lower, description_lower, status, created_at, mtime_ns, list_item)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (kind, id) DO UPDATE SET
+            name_lower = excluded.name_lower,
+            description_lower = excluded.description_lower,
+            status = excluded.status,
+            mtime_ns = excluded.mtime_ns,
+            list_item = excluded.list_item
+        """,
+        (
+            kind.value,
+            resource.id,
+            (resource.name or "").lower(),
+            (resource.description or "").lower(),
+            status.value if isinstance(status, Enum) else status,
+            _get_created_at(resource_dir, resource),
+            mtime_ns,
+            json.dumps(jsonable_encoder(list_item)),
+        ),
+    )
+
+
+def _sync(con: sqlite3.Connection, home_dir: Path, kind: CatalogKind) -> None:
+    # reconcile the catalog with the resource dirs, to pick up changes that bypassed the storage functions,
+    # e.g. resource dirs that were copied into or removed from the home dir, or resources created before the catalog
+    json_mtimes = {}
+    resources_dir = home_dir / kind.value
+    if resources_dir.is_dir():
+        with os.scandir(resources_dir) as entries:
+            for entry in entries:
+                try:
+                    json_mtimes[entry.name] = os.stat(Path(entry.path) / _JSON_FILES[kind]).st_mtime_ns
+                except OSError:
+                    continue
+    indexed_mtimes = dict(con.execute("SELECT id, mtime_ns FROM resources WHERE kind = ?", (kind.value,)))
+    stale_ids = indexed_mtimes.keys() - json_mtimes.keys()
+    con.executemany("DELETE FROM resources WHERE kind = ? AND id = ?", [(kind.value, id) for id in stale_ids])
+    for id, mtime_ns in json_mtimes.items():
+        if indexed_mtimes.get(id) == mtime_ns:
+            continue
+        json_file = resources_dir / id / _JSON_FILES[kind]
+        try:
+            data = json.loads(json_file.read_text())
+            resource = Generator(**data) if kind == CatalogKind.generators else SyntheticDataset(**data)
+        except Exception as e:
+            _LOG.warning(f"failed to index {json_file}: {e}")
+            continue
+        _upsert(con, kind, resources_dir / id, resource, mtime_ns)
+
+
+def index_resource(resource_dir: Path, resource: Generator | SyntheticDataset) -> None:
+    """Add or update a generator or synthetic dataset in the catalog of its home dir."""
+    if resource_dir.parent.name not in {kind.value for kind in CatalogKind}:
+        # resource is not stored within a home dir
+        return
+    kind = CatalogKind(resource_dir.parent.name)
+    try:
+        mtime_ns = (resource_dir / _JSON_FILES[kind]).stat().st_mtime_ns
+        with _connect(resource_dir.parent.parent) as con:
+            _upsert(con, kind, resource_dir, resource, mtime_ns)
+    except (OSError, sqlite3.Error) as e:
+        # the catalog catches up with the JSON files the next time resources are listed
+        _LOG.warning(f"failed to index {resource_dir}: {e}")
+
+
+def unindex_resource(resource_dir: Path) -> None:
+    """Remove a deleted generator or synthetic dataset from the catalog of its home dir."""
+    if resource_dir.parent.name not in {kind.value for kind in CatalogKind}:
+        # resource is not stored within a home dir
+        return
+    kind = CatalogKind(resource_dir.parent.name)
+    try:
+        with _connect(resource_dir.parent.parent) as con:
+            con.execute("DELETE FROM resources WHERE kind = ? AND id = ?", (kind.value, resource_dir.name))
+    except (OSError, sqlite3.Error) as e:
+        _LOG.warning(f"failed to unindex {resource_dir}: {e}")
+
+
+def reindex_resources(home_dir: Path) -> None:
+    """
+    Reconcile the catalog with the generators and synthetic datasets in a home dir.
+
+    The storage functions keep the catalog up to date, thus this is only needed to pick up changes that were made
+    to the home dir directly, e.g. while no server was running.
+
+    :param home_dir: the home dir of the local server
+    """
+    with _connect(home_dir) as con:
+        for kind in CatalogKind:
+            _sync(con, home_dir, kind)
+
+
+def list_resources(
+    home_dir: Path,
+    kind: CatalogKind,
+    offset: int = 0,
+    limit: int = 50,
+    search_term: str | None = None,
+    status: str | None = None,
+    sort_by: CatalogSortBy = CatalogSortBy.recency,
+) -> tuple[int, list[dict]]:
+    """
+    List generators or synthetic datasets from the catalog.
+
+    :param home_dir: the home dir of the local server
+    :param kind: the kind of resources to list
+    :param offset: number of matching resources to skip
+    :param limit: max number of resources to return
+    :param search_term: case-insensitive term to search for in name and description
+    :param status: status, or comma-separated list of statuses, to filter on
+    :param sort_by: order in which resources are returned
+    :return: total count of matching resources, and the JSON-encoded list items of the requested page
+    """
+    where, params = ["kind = ?"], [kind.value]
+    if search_term:
+        where.append("(instr(name_lower, ?) > 0 OR instr(description_lower, ?) > 0)")
+        params += [search_term.lower()] * 2
+    if status:
+        statuses = [s.strip() for s in status.split(",")]
+        where.append(f"status IN ({', '.join('?' * len(statuses))})")
+        params += statuses
+    where_sql = " AND ".join(where)
+    with _connect(home_dir) as con:
+        (total_count,) = con.execute(f"SELECT COUNT(*) FROM resources WHERE {where_sql}", params).fetchone()
+        rows = con.execute(
+            f"SELECT list_item FROM resources WHERE {where_sql} ORDER BY {_ORDER_BY[CatalogSortBy(sort_by)]} "
+            "LIMIT ? OFFSET ?",
+            params + [int(limit), int(offset)],
+        ).fetchall()
+    return total_count, [json.loads(list_item) for (list_item,) in rows]
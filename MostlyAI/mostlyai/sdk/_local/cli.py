@@ -22,11 +22,11 @@ cli = typer.Typer(pretty_exceptions_enable=False)
 
 
 @cli.command()
-def run_training(generator_id: str, home_dir: Path):
+def run_training(generator_id: str, home_dir: Path, continue_training: bool = False):
     # suppress any deprecation warnings
     with warnings.catch_warnings():
         warnings.simplefilter("ignore", DeprecationWarning)
-        execute_training_job(generator_id, home_dir)
+        execute_training_job(generator_id, home_dir, continue_training=continue_training)
 
 
 @cli.command()
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections.abc import Iterator
 from pathlib import Path
 from io import BytesIO
 import pandas as pd
@@ -84,6 +85,23 @@ def read_data_from_connector(connector: Connector, config: ConnectorReadDataConf
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def read_data_chunks_from_connector(connector: Connector, config: ConnectorReadDataConfig) -> Iterator[pd.DataFrame]:
+    if connector.access_type not in {ConnectorAccessType.read_data, ConnectorAccessType.write_data}:
+        raise HTTPException(status_code=400, detail="Connector does not have read access")
+
+    try:
+        data_table = _data_table_from_connector_and_location(
+            connector=connector, location=config.location, is_output=False
+        )
+        if config.limit is not None or config.shuffle:
+            # limiting and shuffling require the data to be read as a whole
+            yield data_table.read_data(limit=config.limit, shuffle=config.shuffle)
+        else:
+            yield from data_table.read_chunks(do_coerce_dtypes=False)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 def write_data_to_connector(connector: Connector, config: ConnectorWriteDataConfig) -> None:
     if connector.access_type != ConnectorAccessType.write_data:
         raise HTTPException(status_code=400, detail="Connector does not have write access")
@@ -120,3 +138,14 @@ def query_data_from_connector(connector: Connector, sql: str) -> pd.DataFrame:
         return data_container.query(sql)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+def query_data_chunks_from_connector(connector: Connector, sql: str) -> Iterator[pd.DataFrame]:
+    if connector.access_type not in {ConnectorAccessType.read_data, ConnectorAccessType.write_data}:
+        raise HTTPException(status_code=400, detail="Connector does not have query access")
+
+    try:
+        data_container = create_container_from_connector(connector)
+        yield from data_container.query_chunks(sql)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
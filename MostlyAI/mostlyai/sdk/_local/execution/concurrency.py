@@ -0,0 +1,78 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from collections.abc import Callable, Hashable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TypeVar
+
+_LOG = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def execute_concurrently(
+    items: list[T],
+    dependencies: dict[Hashable, set[Hashable]],
+    execute: Callable[[T], None],
+    n_jobs: int,
+    *,
+    key: Callable[[T], Hashable] = lambda item: item,
+    has_capacity: Callable[[], bool] = lambda: True,
+    is_exclusive: Callable[[T], bool] = lambda item: False,
+    break_cycles: bool = False,
+    interval: float | None = None,
+) -> None:
+    """
+    Execute items in a thread pool, each as soon as the items that it depends on are done.
+
+    Items are admitted in the given order, as long as fewer than n_jobs items are running, and `has_capacity` holds.
+    One item is always admitted if none is running, so that execution keeps making progress. Exclusive items are not
+    executed concurrently with each other. The first failure is re-raised, once the running items have finished.
+
+    :param items: items to execute
+    :param dependencies: keys of the items that each item depends on, keyed by the item's key
+    :param execute: function to execute a single item
+    :param n_jobs: max number of items to execute concurrently
+    :param key: function to get the key of an item
+    :param has_capacity: function to check whether further items can be admitted, e.g. based on available memory
+    :param is_exclusive: function to check whether an item must not run concurrently with other exclusive items
+    :param break_cycles: whether to execute items with cyclic dependencies in the given order, rather than raising
+    :param interval: interval in seconds in which admission is re-checked, even if no item completes
+    """
+    n_jobs = max(n_jobs, 1)
+    pending = list(items)
+    done: set[Hashable] = set()
+    running: dict[Future, T] = {}
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        while pending or running:
+            ready = [item for item in pending if dependencies[key(item)] <= done]
+            if not ready and not running:
+                if not break_cycles:
+                    raise ValueError(f"cyclic dependencies between {[key(item) for item in pending]}")
+                _LOG.warning(f"cyclic dependencies between {[key(item) for item in pending]}")
+                ready = pending[:1]
+            for item in ready:
+                if len(running) >= n_jobs or (running and not has_capacity()):
+                    break
+                if is_exclusive(item) and any(is_exclusive(other) for other in running.values()):
+                    continue
+                pending.remove(item)
+                running[executor.submit(execute, item)] = item
+            finished, _ = wait(running, timeout=interval, return_when=FIRST_COMPLETED)
+            for future in finished:
+                item = running.pop(future)
+                # re-raise failures; items that are already running are awaited on exit
+                future.result()
+                done.add(key(item))
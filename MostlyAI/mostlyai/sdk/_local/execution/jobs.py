@@ -11,19 +11,26 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import hashlib
 import json
 import logging
+import os
 import shutil
 import traceback
-from collections.abc import Callable
-from functools import partial
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import cache, partial
 from pathlib import Path
 
 import pandas as pd
+import psutil
 
+from mostlyai.sdk._data.base import Schema
 from mostlyai.sdk._data.file.base import LocalFileContainer
 from mostlyai.sdk._data.file.utils import make_data_table_from_container
 from mostlyai.sdk._data.util.common import strip_column_prefix, TABLE_COLUMN_INFIX, TEMPORARY_PRIMARY_KEY
+from mostlyai.sdk._local.catalog import unindex_resource
+from mostlyai.sdk._local.execution.concurrency import execute_concurrently
 from mostlyai.sdk._local.execution.step_analyze_training_data import execute_step_analyze_training_data
 from mostlyai.sdk._local.execution.step_create_data_report import execute_step_create_data_report
 from mostlyai.sdk._local.execution.step_create_model_report import (
@@ -68,6 +75,7 @@ from mostlyai.sdk.domain import (
 )
 from mostlyai.sdk._local.execution.plan import (
     ExecutionPlan,
+    Step,
     Task,
     make_generator_execution_plan,
     make_synthetic_dataset_execution_plan,
@@ -76,6 +84,16 @@ from mostlyai.sdk._local.progress import LocalProgressCallback, get_current_utc_
 
 _LOG = logging.getLogger(__name__)
 
+# max number of generation steps of a synthetic dataset to be executed concurrently
+GENERATE_N_JOBS: int = int(os.getenv("MOSTLY_GENERATE_N_JOBS", max(1, min(4, (os.cpu_count() or 1) // 4))))
+# further generation steps are only started concurrently, if at least this much memory is available
+GENERATE_MIN_AVAILABLE_MEMORY: int = 2 * 1024**3
+# interval in seconds in which held back generation steps are re-checked for admission
+GENERATE_SCHEDULE_INTERVAL: float = 1.0
+
+GENERATE_DATA_STEP_CODES = {StepCode.generate_data_tabular, StepCode.generate_data_language}
+CREATE_DATA_REPORT_STEP_CODES = {StepCode.create_data_report_tabular, StepCode.create_data_report_language}
+
 
 def _move_training_artefacts(generator_dir: Path, job_workspace_dir: Path):
     for dir in ["Logs", "ModelStore", "ModelQAReports", "ModelQAStatistics"]:
@@ -102,6 +120,16 @@ def _move_generation_artefacts(synthetic_dataset_dir: Path, job_workspace_dir: P
             path.rename(synthetic_dataset_dir / "ZIP")
         if path.is_file() and path.parent.name == "DataQAReports":
             path.rename(synthetic_dataset_dir / "DataQAReports" / path.name)
+    # keep delivered data if archives are to be built on demand
+    delivery_dir = job_workspace_dir / "FinalizedSyntheticData"
+    if delivery_dir.is_dir() and not any((synthetic_dataset_dir / "ZIP").glob("synthetic-*-data.zip")):
+        shutil.rmtree(synthetic_dataset_dir / "FinalizedSyntheticData", ignore_errors=True)
+        delivery_dir.rename(synthetic_dataset_dir / "FinalizedSyntheticData")
+
+
+def _get_job_seed(resource_id: str) -> int:
+    # stable seed per job, so that re-running the generation of a synthetic dataset yields the same data
+    return int.from_bytes(hashlib.sha256(resource_id.encode()).digest()[:8], "little")
 
 
 def _mark_in_progress(resource: Generator | SyntheticDataset, resource_dir: Path):
@@ -235,6 +263,87 @@ def _fetch_sample_seed(home_dir: Path, connector_id: str) -> pd.DataFrame:
     return data_table.read_data()
 
 
+def _get_step_model_type(step: Step) -> ModelType:
+    if step.step_code in {StepCode.generate_data_tabular, StepCode.create_data_report_tabular}:
+        return ModelType.tabular
+    return ModelType.language
+
+
+def _make_generation_step_dependencies(steps: list[Step], schema: Schema) -> dict[str, set[str]]:
+    # derive the DAG of generation steps from the context relations of the schema: data of a table is generated once
+    # the TABULAR data of its context tables, and for LANGUAGE models also of the table itself, has been generated;
+    # a data report is created once the data that it reports on has been generated
+    generate_step_ids = {
+        (step.target_table_name, _get_step_model_type(step)): step.id
+        for step in steps
+        if step.step_code in GENERATE_DATA_STEP_CODES
+    }
+    dependencies = {}
+    for step in steps:
+        model_type = _get_step_model_type(step)
+        if step.step_code in GENERATE_DATA_STEP_CODES:
+            required = [(table, ModelType.tabular) for table in schema.get_context_tables(step.target_table_name)]
+            if model_type == ModelType.language:
+                required.append((step.target_table_name, ModelType.tabular))
+        else:
+            required = [(step.target_table_name, model_type)]
+        dependencies[step.id] = {generate_step_ids[key] for key in required if key in generate_step_ids}
+    return dependencies
+
+
+@cache
+def _is_gpu_available() -> bool:
+    # import torch here to avoid pre-mature loading of large ENGINE dependencies
+    import torch
+
+    return torch.cuda.is_available()
+
+
+def _uses_gpu(step: Step) -> bool:
+    # LANGUAGE models are generated on the GPU, if available, whereas each of their engines claims most of its memory
+    return step.step_code == StepCode.generate_data_language and _is_gpu_available()
+
+
+@contextmanager
+def _limit_torch_threads(n_jobs: int) -> Iterator[None]:
+    # the intra-op thread pool of torch is shared by the whole process, thus split the CPUs across concurrent steps
+    import torch
+
+    n_threads = torch.get_num_threads()
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // max(n_jobs, 1)))
+    try:
+        yield
+    finally:
+        torch.set_num_threads(n_threads)
+
+
+def _has_generation_capacity() -> bool:
+    return psutil.virtual_memory().available >= GENERATE_MIN_AVAILABLE_MEMORY
+
+
+def _execute_steps_concurrently(
+    steps: list[Step],
+    dependencies: dict[str, set[str]],
+    execute_step: Callable[[Step], None],
+    n_jobs: int = GENERATE_N_JOBS,
+    is_exclusive: Callable[[Step], bool] = lambda step: False,
+) -> None:
+    # steps are admitted in plan order, as soon as the steps they depend on are done; as each step writes to its own
+    # workspace, the results do not depend on the order in which the steps complete; exclusive steps, e.g. those that
+    # claim the GPU, are not executed concurrently with each other
+    with _limit_torch_threads(n_jobs):
+        execute_concurrently(
+            steps,
+            dependencies,
+            execute_step,
+            n_jobs,
+            key=lambda step: step.id,
+            has_capacity=_has_generation_capacity,
+            is_exclusive=is_exclusive,
+            interval=GENERATE_SCHEDULE_INTERVAL,
+        )
+
+
 ### PLAN EXECUTION ###
 
 
@@ -246,8 +355,10 @@ class Execution:
         generator: Generator,
         synthetic_dataset: SyntheticDataset | None = None,
         home_dir: Path,
+        continue_training: bool = False,
     ):
         self._execution_plan = execution_plan
+        self._continue_training = continue_training
         self._generator = generator
         self._synthetic_dataset = synthetic_dataset
         self._home_dir = home_dir
@@ -325,7 +436,7 @@ class Execution:
         update_progress_fn = partial(LocalProgressCallback, resource_path=generator_dir, model_label=model_label)
 
         # if training shall be continued, then let's first copy the ModelStore
-        if generator.training_status == ProgressStatus.continue_:
+        if self._continue_training:
             _copy_model(generator_dir=generator_dir, model_label=model_label, workspace_dir=workspace_dir)
 
         # step: PULL_TRAINING_DATA
@@ -407,77 +518,27 @@ class Execution:
         pass
 
     def execute_task_generate(self, task: Task):
-        generator = self._generator
-        synthetic_dataset = self._synthetic_dataset
-        synthetic_dataset_dir = self._home_dir / "synthetic-datasets" / synthetic_dataset.id
-        generator_dir = self._home_dir / "generators" / generator.id
-
-        visited_tables = set()
-        table_lookup = {table.name: table for table in synthetic_dataset.tables}
+        # generate independent tables concurrently, and child tables as soon as their context is ready
+        generation_steps = [
+            step for step in task.steps if step.step_code in GENERATE_DATA_STEP_CODES | CREATE_DATA_REPORT_STEP_CODES
+        ]
+        schema = create_generation_schema(
+            generator=self._generator,
+            job_workspace_dir=self._job_workspace_dir,
+            step="pull_context_data",
+        )
+        _execute_steps_concurrently(
+            steps=generation_steps,
+            dependencies=_make_generation_step_dependencies(generation_steps, schema),
+            execute_step=self.execute_generation_step,
+            is_exclusive=_uses_gpu,
+        )
+        visited_tables = {
+            step.target_table_name for step in generation_steps if step.step_code in GENERATE_DATA_STEP_CODES
+        }
 
         for step in task.steps:
-            model_type = (
-                ModelType.tabular
-                if step.step_code in {StepCode.generate_data_tabular, StepCode.create_data_report_tabular}
-                else ModelType.language
-            )
-
-            model_label = f"{step.target_table_name}:{model_type.value.lower()}"
-            workspace_dir = self._job_workspace_dir / model_label
-            workspace_dir.mkdir(exist_ok=True)
-
-            update_progress = partial(
-                LocalProgressCallback, resource_path=synthetic_dataset_dir, model_label=model_label
-            )
-
-            if step.step_code in {StepCode.generate_data_tabular, StepCode.generate_data_language}:
-                # step: GENERATE_DATA
-                _copy_model(generator_dir=generator_dir, model_label=model_label, workspace_dir=workspace_dir)
-
-                visited_tables.add(step.target_table_name)
-
-                table = table_lookup[step.target_table_name]
-                sample_seed = (
-                    _fetch_sample_seed(
-                        home_dir=self._home_dir, connector_id=table.configuration.sample_seed_connector_id
-                    )
-                    if table.configuration.sample_seed_connector_id
-                    else None
-                )
-
-                schema = create_generation_schema(
-                    generator=generator,
-                    job_workspace_dir=self._job_workspace_dir,
-                    step="pull_context_data",
-                )
-
-                execute_step_generate_data(
-                    generator=generator,
-                    synthetic_dataset=synthetic_dataset,
-                    target_table_name=step.target_table_name,
-                    model_type=model_type,
-                    sample_seed=sample_seed,
-                    schema=schema,
-                    workspace_dir=workspace_dir,
-                    update_progress=update_progress(step_code=step.step_code),
-                )
-
-            elif step.step_code in {StepCode.create_data_report_tabular, StepCode.create_data_report_language}:
-                model_report_available = _copy_statistics(
-                    generator_dir=generator_dir, model_label=model_label, workspace_dir=workspace_dir
-                )
-                if not model_report_available:
-                    continue
-                # step: GENERATE_DATA_REPORT
-                execute_step_create_data_report(
-                    generator=generator,
-                    target_table_name=step.target_table_name,
-                    model_type=model_type,
-                    workspace_dir=workspace_dir,
-                    update_progress=update_progress(step_code=step.step_code),
-                )
-
-            elif step.step_code in {StepCode.finalize_generation, StepCode.finalize_probing}:
+            if step.step_code in {StepCode.finalize_generation, StepCode.finalize_probing}:
                 # for every LANGUAGE model generation, merge context and generated data
                 for table in visited_tables:
                     language_path = self._job_workspace_dir / f"{table}:{ModelType.language.value.lower()}"
@@ -499,6 +560,63 @@ class Execution:
             elif step.step_code == StepCode.deliver_data:
                 self.execute_deliver_data()
 
+    def execute_generation_step(self, step: Step):
+        generator = self._generator
+        synthetic_dataset = self._synthetic_dataset
+        synthetic_dataset_dir = self._home_dir / "synthetic-datasets" / synthetic_dataset.id
+        generator_dir = self._home_dir / "generators" / generator.id
+
+        model_type = _get_step_model_type(step)
+        model_label = f"{step.target_table_name}:{model_type.value.lower()}"
+        workspace_dir = self._job_workspace_dir / model_label
+        workspace_dir.mkdir(exist_ok=True)
+
+        update_progress = partial(LocalProgressCallback, resource_path=synthetic_dataset_dir, model_label=model_label)
+
+        if step.step_code in GENERATE_DATA_STEP_CODES:
+            # step: GENERATE_DATA
+            _copy_model(generator_dir=generator_dir, model_label=model_label, workspace_dir=workspace_dir)
+
+            table = next(t for t in synthetic_dataset.tables if t.name == step.target_table_name)
+            sample_seed = (
+                _fetch_sample_seed(home_dir=self._home_dir, connector_id=table.configuration.sample_seed_connector_id)
+                if table.configuration.sample_seed_connector_id
+                else None
+            )
+
+            # the schema is created per step, as it lazily reads the data generated for the context tables
+            schema = create_generation_schema(
+                generator=generator,
+                job_workspace_dir=self._job_workspace_dir,
+                step="pull_context_data",
+            )
+
+            execute_step_generate_data(
+                generator=generator,
+                synthetic_dataset=synthetic_dataset,
+                target_table_name=step.target_table_name,
+                model_type=model_type,
+                sample_seed=sample_seed,
+                schema=schema,
+                workspace_dir=workspace_dir,
+                update_progress=update_progress(step_code=step.step_code),
+            )
+
+        elif step.step_code in CREATE_DATA_REPORT_STEP_CODES:
+            model_report_available = _copy_statistics(
+                generator_dir=generator_dir, model_label=model_label, workspace_dir=workspace_dir
+            )
+            if not model_report_available:
+                return
+            # step: GENERATE_DATA_REPORT
+            execute_step_create_data_report(
+                generator=generator,
+                target_table_name=step.target_table_name,
+                model_type=model_type,
+                workspace_dir=workspace_dir,
+                update_progress=update_progress(step_code=step.step_code),
+            )
+
     def execute_finalize_generation(self):
         schema = create_generation_schema(
             generator=self._generator,
@@ -515,6 +633,7 @@ class Execution:
                 model_label=None,
                 step_code=StepCode.finalize_generation,
             ),
+            seed=_get_job_seed(self._synthetic_dataset.id),
         )
         update_total_rows(self._synthetic_dataset, usages)
 
@@ -551,22 +670,27 @@ class Execution:
             schema=schema,
             is_probe=True,
             job_workspace_dir=self._job_workspace_dir,
+            seed=_get_job_seed(self._synthetic_dataset.id),
         )
 
 
 ### JOB EXECUTION FUNCTIONS ###
 
 
-def execute_training_job(generator_id: str, home_dir: Path):
+def execute_training_job(generator_id: str, home_dir: Path, continue_training: bool = False):
     generator_dir = home_dir / "generators" / generator_id
     generator = read_generator_from_json(generator_dir)
-    if generator.training_status not in [ProgressStatus.new, ProgressStatus.continue_]:
+    if generator.training_status not in [ProgressStatus.new, ProgressStatus.continue_, ProgressStatus.queued]:
         raise ValueError("Generator has already been trained")
+    # capture the intent to continue training, before the status gets overwritten
+    continue_training = continue_training or generator.training_status == ProgressStatus.continue_
     _mark_in_progress(resource=generator, resource_dir=generator_dir)
     # PLAN
     plan = make_generator_execution_plan(generator)
     # EXECUTE
-    execution = Execution(execution_plan=plan, generator=generator, home_dir=home_dir)
+    execution = Execution(
+        execution_plan=plan, generator=generator, home_dir=home_dir, continue_training=continue_training
+    )
     try:
         execution.run()
         _set_overall_accuracy(generator)
@@ -597,7 +721,7 @@ def execute_generation_job(synthetic_dataset_id: str, home_dir: Path):
     generator = read_generator_from_json(generator_dir)
     if generator.training_status != ProgressStatus.done:
         raise ValueError("Generator has not been trained yet")
-    if synthetic_dataset.generation_status != ProgressStatus.new:
+    if synthetic_dataset.generation_status not in [ProgressStatus.new, ProgressStatus.queued]:
         raise ValueError("Synthetic Dataset has already been generated")
 
     _mark_in_progress(resource=synthetic_dataset, resource_dir=synthetic_dataset_dir)
@@ -662,4 +786,5 @@ def execute_probing_job(synthetic_dataset_id: str, home_dir: Path) -> list[Probe
         execution.clear_file_upload_connectors()
         # no artifacts of a synthetic probe job should be left
         shutil.rmtree(synthetic_dataset_dir, ignore_errors=True)
+        unindex_resource(synthetic_dataset_dir)
     return probes
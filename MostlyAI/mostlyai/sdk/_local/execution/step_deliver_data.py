@@ -12,18 +12,28 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
 from pathlib import Path
 
 from mostlyai.sdk._data.base import Schema, DataContainer
-from mostlyai.sdk._data.conversions import create_container_from_connector
+from mostlyai.sdk._data.conversions import create_container_from_connector, get_container_class
 from mostlyai.sdk._data.db.base import SqlAlchemyContainer
 from mostlyai.sdk._data.file.container.bucket_based import BucketBasedContainer
 from mostlyai.sdk._data.file.table.parquet import ParquetDataTable
 from mostlyai.sdk._data.file.utils import make_data_table_from_container
 from mostlyai.sdk._data.push import push_data_by_copying, push_data
+from mostlyai.sdk._local.execution.concurrency import execute_concurrently
 from mostlyai.sdk.domain import Connector, Generator, SyntheticDatasetDelivery
 
 
+_LOG = logging.getLogger(__name__)
+
+# max number of tables to be delivered concurrently to a bucket, resp. a database; tables are already written to
+# databases in parallel chunks, thus fewer of them are delivered at once
+BUCKET_DELIVERY_N_JOBS: int = 8
+DB_DELIVERY_N_JOBS: int = 2
+
+
 def execute_step_deliver_data(
     *,
     generator: Generator,
@@ -36,21 +46,30 @@ def execute_step_deliver_data(
     if connector is None:
         return
 
-    # create destination container
-    container = create_container_from_connector(connector)
-    container.set_location(delivery.location)
+    is_bucket = _is_bucket_destination(connector)
+    if is_bucket:
+        n_jobs = BUCKET_DELIVERY_N_JOBS
+        dependencies = {table_name: set() for table_name in schema.tables}
+    else:
+        n_jobs = DB_DELIVERY_N_JOBS
+        # deliver parents before their children, in case the destination enforces foreign keys
+        dependencies = _get_referenced_tables(schema)
 
     overwrite_tables = delivery.overwrite_tables
-    for table_name in schema.tables:
+
+    def deliver_table(table_name: str):
+        # each table is delivered via its own container, as containers hold connection state, e.g. of SSH tunnels
+        container = create_container_from_connector(connector)
+        container.set_location(delivery.location)
         local_path = job_workspace_dir / "FinalizedSyntheticData" / table_name / "parquet"
-        if isinstance(container, BucketBasedContainer):
+        if is_bucket:
             bucket_path = container.path / table_name
             push_data_by_copying(
                 source=local_path,
                 destination=bucket_path,
                 overwrite_tables=overwrite_tables,
             )
-        elif isinstance(container, SqlAlchemyContainer):
+        else:
             src_table = ParquetDataTable(path=local_path)
             table = _create_destination_table(table_name, generator, container)
             push_data(
@@ -59,8 +78,30 @@ def execute_step_deliver_data(
                 schema=schema,
                 overwrite_tables=overwrite_tables,
             )
-        else:
-            raise ValueError(f"Unsupported destination container type: {container}")
+
+    # cyclic references can not be resolved by ordering the tables, thus such tables are delivered in schema order
+    execute_concurrently(list(schema.tables), dependencies, deliver_table, n_jobs, break_cycles=True)
+
+
+def _is_bucket_destination(connector: Connector) -> bool:
+    # decide by the class of the destination container, without creating one, as that connects to the destination
+    container_cls = get_container_class(connector.type)
+    if issubclass(container_cls, BucketBasedContainer):
+        return True
+    if issubclass(container_cls, SqlAlchemyContainer):
+        return False
+    raise ValueError(f"Unsupported destination container type: {container_cls.__name__}")
+
+
+def _get_referenced_tables(schema: Schema) -> dict[str, set[str]]:
+    return {
+        table_name: {
+            fk.referenced_table
+            for fk in schema.get_foreign_keys(table_name)
+            if fk.referenced_table in schema.tables and fk.referenced_table != table_name
+        }
+        for table_name in schema.tables
+    }
 
 
 def _create_destination_table(
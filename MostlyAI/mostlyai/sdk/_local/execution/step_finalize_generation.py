@@ -11,29 +11,67 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import csv
+import io
 import logging
-import uuid
+import os
+import struct
 import zipfile
+import zlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Literal
+from typing import BinaryIO, Literal
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from filelock import FileLock
 
 from mostlyai.sdk._data.base import Schema, NonContextRelation, ForeignKey
-from mostlyai.sdk._data.dtype import is_timestamp_dtype
+from mostlyai.sdk._data.dtype import STRING, is_timestamp_dtype
 from mostlyai.sdk._data.file.base import LocalFileContainer
-from mostlyai.sdk._data.file.table.csv import CsvDataTable
 from mostlyai.sdk._data.file.table.parquet import ParquetDataTable
-from mostlyai.sdk._data.non_context import postproc_non_context
+from mostlyai.sdk._data.non_context import NonContextKeyPool, postproc_non_context
 from mostlyai.sdk._data.progress_callback import ProgressCallback, ProgressCallbackWrapper
 from mostlyai.sdk._data.util.common import (
     NON_CONTEXT_COLUMN_INFIX,
     IS_NULL,
+    generate_uuids,
 )
 from mostlyai.sdk.domain import Generator, SyntheticDataset
 
 _LOG = logging.getLogger(__name__)
 
+# max number of partitions of a table to be finalized concurrently
+FINALIZE_PARTITIONS_N_JOBS: int = min(4, os.cpu_count() or 1)
+
+# max number of rows per row group of the finalized PARQUET partitions, so that random samples can be drawn from
+# these without reading the partitions in full
+FINALIZE_ROW_GROUP_SIZE: int = 10_000
+
+# max number of chunks of a CSV file to be compressed concurrently
+ZIP_N_JOBS: int = min(4, os.cpu_count() or 1)
+ZIP_CHUNK_SIZE: int = 16 * 1024 * 1024
+ZIP_WINDOW_SIZE: int = 32 * 1024
+
+# fields of the ZIP format, which are written by `_DeflatedZipWriter`
+_ZIP64_LIMIT = 0xFFFFFFFF
+_ZIP_MAX_MEMBERS = 0xFFFF
+_ZIP_VERSION = 20
+_ZIP64_VERSION = 45
+_ZIP_CREATE_SYSTEM = 3  # UNIX, so that external attributes hold the file mode
+_ZIP_EXTERNAL_ATTR = 0o100644 << 16  # regular file, readable by all
+_ZIP_FLAGS = 0x800  # names are UTF-8 encoded
+_ZIP_CENTRAL_DIR_STRUCT = "<4s4B4HL2L5H2L"
+
+# if set, ZIP archives are built on first download instead of as part of the finalize generation step
+ZIP_ON_DEMAND: bool = os.getenv("MOSTLY_ZIP_ON_DEMAND", "").lower()[:1] in ["1", "t", "y"]
+
 
 def execute_step_finalize_generation(
     *,
@@ -41,6 +79,8 @@ def execute_step_finalize_generation(
     is_probe: bool,
     job_workspace_dir: Path,
     update_progress: ProgressCallback | None = None,
+    zip_on_demand: bool = ZIP_ON_DEMAND,
+    seed: int | None = None,
 ) -> dict[str, int]:
     # get synthetic table usage
     usages = dict()
@@ -55,6 +95,7 @@ def execute_step_finalize_generation(
                 target_table_name=table_name,
                 delivery_dir=delivery_dir,
                 export_csv=False,
+                seed=seed,
             )
         return usages
 
@@ -75,6 +116,7 @@ def execute_step_finalize_generation(
                 target_table_name=tgt,
                 delivery_dir=delivery_dir,
                 export_csv=export_csv,
+                seed=seed,
             )
             progress.update(advance=1)
 
@@ -82,6 +124,7 @@ def execute_step_finalize_generation(
         export_random_samples(
             delivery_dir=delivery_dir,
             random_samples_dir=random_samples_dir,
+            seed=seed,
         )
         progress.update(advance=1)
 
@@ -89,6 +132,12 @@ def execute_step_finalize_generation(
         export_data_to_excel(delivery_dir=delivery_dir, output_dir=zip_dir)
         progress.update(advance=1)
 
+        if zip_on_demand:
+            # archives are built from the delivered data on first download, see get_zip_data
+            _LOG.info("skip zipping synthetic data, as it is zipped on demand")
+            progress.update(advance=2)
+            return usages
+
         _LOG.info("zip parquet synthetic data")
         zip_data(delivery_dir=delivery_dir, format="parquet", out_dir=zip_dir)
         progress.update(advance=1)
@@ -114,6 +163,102 @@ def format_datetime(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _format_float_column(column: pa.Array) -> pa.Array:
+    # render floats as their shortest representation, same as Python, e.g. `1.0`; Arrow does so as well, except that
+    # it omits the fractional part of integral values, and switches to exponent notation at other magnitudes
+    values = column.to_numpy(zero_copy_only=False)
+    if not pa.types.is_float64(column.type):
+        return pa.array(values.astype(str), mask=column.is_null().to_numpy(zero_copy_only=False), type=pa.string())
+    formatted = pc.cast(column, pa.string())
+    formatted = pc.if_else(
+        pc.match_substring_regex(formatted, r"^-?\d+$"), pc.binary_join_element_wise(formatted, ".0", ""), formatted
+    )
+    magnitude = pc.abs(column)
+    differs = pc.or_kleene(
+        pc.match_substring(formatted, "e"),
+        pc.or_kleene(
+            pc.greater_equal(magnitude, 1e16),
+            pc.and_kleene(pc.less(magnitude, 1e-4), pc.not_equal(magnitude, 0)),
+        ),
+    )
+    differs = pc.fill_null(differs, False)
+    if pc.any(differs).as_py():
+        mask = differs.to_numpy(zero_copy_only=False)
+        formatted = pc.replace_with_mask(formatted, differs, pa.array(values[mask].astype(str), type=pa.string()))
+    return formatted
+
+
+def format_csv_batch(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """
+    Render values which the Arrow CSV writer formats differently than pandas: timestamps are formatted as in
+    `format_datetime`, booleans as `True` / `False`, and floats as their shortest representation, e.g. `1.0`.
+    """
+    columns = []
+    for column in batch.columns:
+        if pa.types.is_dictionary(column.type):
+            column = column.dictionary_decode()
+        if pa.types.is_timestamp(column.type):
+            column = pc.floor_temporal(column, unit="second").cast(pa.timestamp("s", column.type.tz))
+            column = pc.strftime(column, format="%Y-%m-%d %H:%M:%S")
+        elif pa.types.is_boolean(column.type):
+            column = pc.if_else(column, "True", "False")
+        elif pa.types.is_floating(column.type):
+            column = _format_float_column(column)
+        columns.append(column)
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+
+def write_csv_header(columns: list[str], csv_file: BinaryIO) -> None:
+    # quote column names only if needed, same as pandas
+    header = io.StringIO()
+    csv.writer(header, lineterminator="\n").writerow(columns)
+    csv_file.write(header.getvalue().encode("utf-8"))
+
+
+def _render_csv_column(column: pa.Array, is_single_column: bool) -> pa.Array:
+    # render values as strings, quoted only if needed, same as pandas; missing values are rendered empty
+    is_string = pa.types.is_string(column.type) or pa.types.is_large_string(column.type)
+    try:
+        column = pc.cast(column, pa.string())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # types without a cast to string, e.g. nested ones, are rendered by Python
+        column = pa.array([None if v is None else str(v) for v in column.to_pylist()], type=pa.string())
+        is_string = True
+    column = pc.fill_null(column, "")
+    if is_string:
+        needs_quoting = pc.match_substring_regex(column, r'[,"\r\n]')
+    else:
+        needs_quoting = None
+    if is_single_column:
+        # pandas quotes empty values, if these are the only value of a row
+        is_empty = pc.equal(column, "")
+        needs_quoting = is_empty if needs_quoting is None else pc.or_(needs_quoting, is_empty)
+    if needs_quoting is not None and pc.any(needs_quoting).as_py():
+        quoted = pc.binary_join_element_wise('"', pc.replace_substring(column, '"', '""'), '"', "")
+        column = pc.if_else(needs_quoting, quoted, column)
+    return column
+
+
+def write_csv_batch(batch: pa.RecordBatch, csv_file: BinaryIO) -> None:
+    """
+    Append a batch, without header, to a CSV file, formatted byte-identical to pandas `to_csv`.
+
+    The Arrow CSV writer quotes either all or no strings, whereas pandas only quotes strings which contain separators,
+    quotes or line breaks. Thus, the rows are rendered via Arrow compute functions instead, which quote only the
+    values of string columns that need it.
+    """
+    if batch.num_rows == 0 or batch.num_columns == 0:
+        return
+    batch = format_csv_batch(batch)
+    columns = [_render_csv_column(column, is_single_column=batch.num_columns == 1) for column in batch.columns]
+    rows = pc.binary_join_element_wise(*columns, ",")
+    rows = pc.binary_join_element_wise(rows, "\n", "")
+    # write the data buffer of the rendered rows as a whole
+    _, offsets, data = rows.buffers()
+    offsets = np.frombuffer(offsets, dtype=np.int32)[rows.offset : rows.offset + len(rows) + 1]
+    csv_file.write(memoryview(data)[offsets[0] : offsets[-1]])
+
+
 def postprocess_temp_columns(df: pd.DataFrame, table_name: str, schema: Schema):
     """
     1. remove the suffix of non-context temporary columns `.{parent_table_name}._is_null`
@@ -129,7 +274,11 @@ def postprocess_temp_columns(df: pd.DataFrame, table_name: str, schema: Schema):
         # fill in some random UUIDs for
         # note: these columns contains strings of boolean values
         for col in temp_columns:
-            df[col] = df[col].apply(lambda x: f"mostly{str(uuid.uuid4())[6:]}" if x == "False" else pd.NA)
+            is_key = (df[col] == "False").fillna(False).to_numpy(dtype=bool)
+            keys = pc.replace_with_mask(
+                pa.nulls(len(df), pa.large_string()), pa.array(is_key), generate_uuids(is_key.sum(), prefix="mostly")
+            )
+            df[col] = pd.Series(keys, index=df.index, dtype=STRING)
         # remove suffix
         df.rename(
             columns={c: c.removesuffix(suffix) for c in temp_columns},
@@ -147,24 +296,52 @@ def restore_column_order(df: pd.DataFrame, table_name: str, schema: Schema):
     return df
 
 
+def sample_parquet_row_groups(parquet_paths: list[Path], n: int, seed: int | None = None) -> pd.DataFrame:
+    """
+    Sample up to n random rows from parquet files, without reading them in full.
+
+    Only the file footers are read to pick random row groups across all files, until these hold at least n rows.
+    Then only the picked row groups are read, and n rows are sampled from them.
+    """
+    rng = np.random.default_rng(seed)
+    row_groups = []
+    schema = None
+    for path in parquet_paths:
+        metadata = pq.read_metadata(path)
+        schema = schema or metadata.schema.to_arrow_schema()
+        row_groups += [(path, i, metadata.row_group(i).num_rows) for i in range(metadata.num_row_groups)]
+    if schema is None:
+        return pd.DataFrame()
+
+    picked, n_picked_rows = [], 0
+    for idx in rng.permutation(len(row_groups)):
+        if n_picked_rows >= n:
+            break
+        path, row_group, num_rows = row_groups[idx]
+        if num_rows > 0:
+            picked.append((path, row_group))
+            n_picked_rows += num_rows
+
+    tables = [pq.ParquetFile(path).read_row_group(row_group) for path, row_group in picked]
+    df = (pa.concat_tables(tables) if tables else schema.empty_table()).to_pandas()
+    return df.sample(n=min(n, len(df)), random_state=rng).reset_index(drop=True)
+
+
 def export_random_samples_per_table(
     delivery_parquet_dir: Path,
     random_samples_json_path: Path,
     table_name: str,
     schema: Schema | None = None,
     limit: int = 100,
+    seed: int | None = None,
 ):
     """
-    Export random samples of a table from the first parquet file in delivery_parquet_dir
+    Export random samples of a table from random row groups of the parquet files in delivery_parquet_dir
     """
-    try:
-        # fetch a single parquet file
-        parquet_path = next(delivery_parquet_dir.glob("*.parquet"))
-    except StopIteration:
-        parquet_path = None
+    parquet_paths = sorted(delivery_parquet_dir.glob("*.parquet"))
 
-    if parquet_path:
-        df = pd.read_parquet(parquet_path).sample(frac=1).head(n=limit)
+    if parquet_paths:
+        df = sample_parquet_row_groups(parquet_paths, n=limit, seed=seed)
         df = format_datetime(df)
         if schema:
             df = postprocess_temp_columns(df, table_name, schema)
@@ -177,6 +354,7 @@ def export_random_samples(
     delivery_dir: Path,
     random_samples_dir: Path,
     limit: int = 100,
+    seed: int | None = None,
 ):
     """
     Export random samples of all the tables in the delivery directory
@@ -189,6 +367,7 @@ def export_random_samples(
             random_samples_json_path=random_samples_dir / f"{table_name}.json",
             table_name=table_name,
             limit=limit,
+            seed=seed,
         )
 
 
@@ -207,6 +386,8 @@ def finalize_table_generation(
     target_table_name: str,
     delivery_dir: Path,
     export_csv: bool,
+    n_jobs: int = FINALIZE_PARTITIONS_N_JOBS,
+    seed: int | None = None,
 ) -> None:
     """
     Post-process the generated data for a given table.
@@ -214,16 +395,15 @@ def finalize_table_generation(
     * handle reference keys
     * keep only needed columns, and in the right order
     * export to PARQUET, and optionally also to CSV (without col prefixes)
+
+    Partitions are post-processed and written to PARQUET concurrently, while the PARQUET partitions are streamed
+    into a single CSV file in partition order. Random sampling is reproducible for a given seed.
     """
 
-    # read generated "raw" data into memory
-    # Note: We should avoid reading all data into memory. E.g. by looping over source.dataset.files or over
-    # source.dataset.to_batches(), then process in batches, and then append to CSV, respectively write out
-    # as separate parquet files.
     table = generated_data_schema.tables[target_table_name]
     tgt_table_files = table.dataset.files
     n_partitions = len(tgt_table_files)
-    _LOG.info(f"POSTPROC will handle {n_partitions} partitions")
+    _LOG.info(f"POSTPROC will handle {n_partitions} partitions (n_jobs={n_jobs})")
 
     pqt_path = delivery_dir / target_table_name / "parquet"
     pqt_path.mkdir(exist_ok=True, parents=True)
@@ -236,9 +416,18 @@ def finalize_table_generation(
     else:
         csv_path = None
 
-    # instantiate container outside of loop to avoid memory to pile up
-    container = type(table.container)()
-    for part_i, part_file in enumerate(tgt_table_files, start=1):
+    # load keys of non-context parents once, and share them across all partitions
+    key_pools = {
+        rel: NonContextKeyPool.from_table(generated_data_schema.tables[rel.parent.table], rel.parent.column)
+        for rel in generated_data_schema.get_non_context_relations_to_table(target_table_name)
+    }
+    # each partition samples with its own random generator, as these are not thread-safe; by default, the seed is
+    # derived from numpy's global random state, so that np.random.seed() applies
+    seed = seed if seed is not None else np.random.randint(2**32, dtype=np.uint64)
+    seeds = np.random.SeedSequence(seed, spawn_key=(zlib.crc32(target_table_name.encode()),)).spawn(n_partitions)
+
+    def finalize_partition(part_i: int, part_file: str) -> Path:
+        container = type(table.container)()
         container.set_location(part_file)
         part_table = ParquetDataTable(container=container)
         tgt_data = part_table.read_data(do_coerce_dtypes=True)
@@ -248,32 +437,51 @@ def finalize_table_generation(
             tgt_data=tgt_data,
             generated_data_schema=generated_data_schema,
             tgt=target_table_name,
+            key_pools=key_pools,
+            rng=np.random.default_rng(seeds[part_i - 1]),
         )
 
         # keep only original columns, and in the right order
-        tgt_cols = (
-            cols if (cols := generated_data_schema.tables[target_table_name].columns) is not None else tgt_data.columns
-        )
+        tgt_cols = cols if (cols := table.columns) is not None else tgt_data.columns
         drop_cols = [c for c in tgt_cols if c not in tgt_data]
         if drop_cols:
             _LOG.info(f"remove columns from final output: {', '.join(drop_cols)}")
         keep_cols = [c for c in tgt_cols if c in tgt_data]
         tgt_data = tgt_data[keep_cols]
 
-        partition_text = f"{part_i} out of {n_partitions}"
-
         # store post-processed data as PQT files
-        _LOG.info(f"store post-processed {partition_text} as PQT")
-        pqt_post = ParquetDataTable(path=pqt_path / f"{Path(part_file).stem}.parquet", name=target_table_name)
-        pqt_post.write_data(tgt_data)
-
-        # store post-processed data as single CSV file
-        if csv_path:
-            _LOG.info(f"store post-processed {partition_text} as CSV")
-            csv_post = CsvDataTable(path=csv_path / f"{target_table_name}.csv", name=target_table_name)
-            csv_post.write_data(tgt_data)
-
-        del tgt_data
+        _LOG.info(f"store post-processed {part_i} out of {n_partitions} as PQT")
+        pqt_file = pqt_path / f"{Path(part_file).stem}.parquet"
+        pqt_post = ParquetDataTable(path=pqt_file, name=target_table_name)
+        pqt_post.write_data(tgt_data, row_group_size=FINALIZE_ROW_GROUP_SIZE)
+        return pqt_file
+
+    def append_to_csv(part_i: int, pqt_file: Path, csv_file: BinaryIO) -> None:
+        # stream post-processed PQT partition into single CSV file
+        _LOG.info(f"store post-processed {part_i} out of {n_partitions} as CSV")
+        parquet_file = pq.ParquetFile(pqt_file)
+        if csv_file.tell() == 0:
+            # write the header only once, even if there are no rows
+            write_csv_header(parquet_file.schema_arrow.names, csv_file)
+        for batch in parquet_file.iter_batches():
+            write_csv_batch(batch, csv_file)
+
+    with (
+        ThreadPoolExecutor(max_workers=max(n_jobs, 1)) as executor,
+        open(csv_path / f"{target_table_name}.csv", "wb") if csv_path else nullcontext() as csv_file,
+    ):
+        # keep at most n_jobs partitions in flight to bound memory, and consume them in partition order
+        pending = deque()
+        for part_i, part_file in enumerate(tgt_table_files, start=1):
+            pending.append((part_i, executor.submit(finalize_partition, part_i, part_file)))
+            while pending and (len(pending) >= n_jobs or part_i == n_partitions):
+                done_i, future = pending.popleft()
+                pqt_file = future.result()
+                if csv_file:
+                    append_to_csv(done_i, pqt_file, csv_file)
+        if csv_file and csv_file.tell() == 0 and table.columns:
+            # write the header, even if there are no partitions
+            write_csv_header(table.columns, csv_file)
 
 
 def export_data_to_excel(delivery_dir: Path, output_dir: Path):
@@ -329,7 +537,10 @@ def export_data_to_excel(delivery_dir: Path, output_dir: Path):
     }
 
     excel_output_path = Path(output_dir) / "synthetic-samples.xlsx"
-    with pd.ExcelWriter(str(excel_output_path), engine="xlsxwriter") as writer:
+    # constant_memory mode flushes each row once the next one is started, thus all cells are written row by row
+    with pd.ExcelWriter(
+        str(excel_output_path), engine="xlsxwriter", engine_kwargs={"options": {"constant_memory": True}}
+    ) as writer:
         workbook = writer.book
 
         # add formats
@@ -346,9 +557,6 @@ def export_data_to_excel(delivery_dir: Path, output_dir: Path):
         worksheet.write(0, 0, "Table")
         worksheet.write(0, 1, "No. of Included Samples")
         worksheet.write(0, 2, "No. of Total Samples")
-        if is_truncated:
-            worksheet.write(len(tables) + 3, 0, is_truncated_note1)
-            worksheet.write(len(tables) + 4, 0, is_truncated_note2)
         for idx, (table_name, _) in enumerate(tables.items()):
             worksheet.write_url(
                 idx + 1,
@@ -359,6 +567,9 @@ def export_data_to_excel(delivery_dir: Path, output_dir: Path):
             )
             worksheet.write(idx + 1, 1, tables[table_name]["no_of_included_samples"])
             worksheet.write(idx + 1, 2, tables[table_name]["no_of_total_samples"])
+        if is_truncated:
+            worksheet.write(len(tables) + 3, 0, is_truncated_note1)
+            worksheet.write(len(tables) + 4, 0, is_truncated_note2)
 
         # write each DataFrame to a different sheet
         sheet_names_lower = [toc_sheet_name.lower()]
@@ -390,30 +601,267 @@ def export_data_to_excel(delivery_dir: Path, output_dir: Path):
             # freeze the first row
             worksheet.freeze_panes(1, 0)
             # write column headers
-            for col_num, value in enumerate(df.columns.values):
-                worksheet.write(0, col_num, value)
-            # write data
-            for row_num, row in enumerate(df.values):
-                for col_num, _ in enumerate(row):
-                    value = df.iloc[row_num, col_num]
-                    if not pd.isna(value):
-                        worksheet.write(row_num + 1, col_num, df.iloc[row_num, col_num])
+            worksheet.write_row(0, 0, df.columns.tolist())
+            # write data; missing values are written as None, which leaves the cells empty
+            values = df.astype(object).to_numpy()
+            values[df.isna().to_numpy()] = None
+            for row_num, row in enumerate(values.tolist()):
+                worksheet.write_row(row_num + 1, 0, row)
 
 
-def zip_data(delivery_dir: Path, format: Literal["parquet", "csv"], out_dir: Path):
+def zip_data(
+    delivery_dir: Path,
+    format: Literal["parquet", "csv"],
+    out_dir: Path,
+    n_jobs: int = ZIP_N_JOBS,
+) -> Path:
+    """
+    Package the delivered PARQUET or CSV files of all tables into a single ZIP archive.
+
+    PARQUET files are already compressed, and are thus stored as-is. CSV files are split into chunks, which are
+    deflated concurrently and appended to the archive in order. The archive is first written to a temporary file,
+    so that readers never see a partially written archive.
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
     zip_path = out_dir / f"synthetic-{format}-data.zip"
+    tmp_path = zip_path.with_suffix(".zip.tmp")
 
-    # Choose the compression type based on the file format
-    compression = zipfile.ZIP_STORED if format == "parquet" else zipfile.ZIP_DEFLATED
+    members = []
+    for table_path in sorted(delivery_dir.glob("*")):
+        format_path = table_path / format
+        for file in sorted(format_path.glob("*")):
+            members.append((file, f"{table_path.name}/{file.relative_to(format_path)}"))
+
+    if format == "parquet":
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED) as zipf:
+            for file, arcname in members:
+                zipf.write(file, arcname=arcname)
+    else:
+        with open(tmp_path, "wb") as f, ThreadPoolExecutor(max_workers=max(n_jobs, 1)) as executor:
+            writer = _DeflatedZipWriter(f)
+            for file, arcname in members:
+                _write_deflated(writer, file, arcname, executor=executor, n_jobs=max(n_jobs, 1))
+            writer.close()
+    os.replace(tmp_path, zip_path)
+    return zip_path
+
+
+def _deflate_chunk(chunk: bytes, zdict: bytes, is_last: bool) -> bytes:
+    # raw DEFLATE stream, primed with the tail of the previous chunk, so that compression ratio is retained
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=zdict)
+    # a sync flush ends the chunk on a byte boundary without a final block, so that chunks can be concatenated
+    return compressor.compress(chunk) + compressor.flush(zlib.Z_FINISH if is_last else zlib.Z_SYNC_FLUSH)
+
+
+def _deflated_chunks(file: Path, executor: ThreadPoolExecutor, n_jobs: int) -> Iterator[tuple[bytes, bytes]]:
+    # yields the raw and the deflated data of each chunk, in chunk order
+    file_size = file.stat().st_size
+    # keep at most n_jobs chunks in flight to bound memory
+    pending = deque()
+    with open(file, "rb") as f:
+        zdict = b""
+        offset = 0
+        while True:
+            chunk = f.read(ZIP_CHUNK_SIZE)
+            offset += len(chunk)
+            is_last = offset >= file_size
+            pending.append((chunk, executor.submit(_deflate_chunk, chunk, zdict, is_last)))
+            zdict = chunk[-ZIP_WINDOW_SIZE:]
+            while pending and (len(pending) >= n_jobs or is_last):
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+            if is_last:
+                break
+
+
+class _DeflatedZipWriter:
+    """
+    Minimal writer of ZIP archives, whose members are deflated by the caller.
 
-    with zipfile.ZipFile(zip_path, "w", compression) as zipf:
-        for table_path in delivery_dir.glob("*"):
-            table = table_path.name
-            format_path = table_path / format
-            for file in format_path.glob("*"):
-                zip_loc = f"{table}/{file.relative_to(format_path)}"
-                zipf.write(file, arcname=zip_loc)
+    The ZipFile API compresses members itself, on a single core, and offers no public way to append already deflated
+    data. Thus, this writer produces the local headers, the central directory and the end of central directory
+    records itself. ZIP64 extensions are used wherever sizes, offsets or the number of members exceed the limits of
+    the plain ZIP format.
+    """
+
+    def __init__(self, fp: BinaryIO):
+        self.fp = fp
+        # name, DOS time and date, CRC, compressed size, uncompressed size, and header offset of each member
+        self.members: list[tuple[bytes, int, int, int, int, int, int]] = []
+        self.names: set[str] = set()
+
+    def write(self, arcname: str, date_time: tuple, file_size: int, chunks: Iterable[tuple[bytes, bytes]]) -> None:
+        """
+        Append a member with already deflated data.
+
+        :param arcname: name of the member within the archive
+        :param date_time: modification time of the member, as (year, month, day, hour, minute, second)
+        :param file_size: uncompressed size of the member
+        :param chunks: raw and deflated data of each chunk of the member, in order
+        """
+        if arcname in self.names:
+            raise ValueError(f"duplicate name in ZIP archive: {arcname}")
+        self.names.add(arcname)
+        name = arcname.encode("utf-8")
+        year, month, day, hour, minute, second = date_time[:6]
+        dos_time = hour << 11 | minute << 5 | second // 2
+        dos_date = (max(year, 1980) - 1980) << 9 | month << 5 | day
+        # decide upfront whether the local header needs ZIP64 extensions, with headroom for the deflate overhead
+        zip64 = file_size * 1.05 > _ZIP64_LIMIT
+        header_offset = self.fp.tell()
+        self.fp.write(self._local_header(name, dos_time, dos_date, 0, 0, 0, zip64))
+        crc, compress_size, size = 0, 0, 0
+        for chunk, data in chunks:
+            crc = zlib.crc32(chunk, crc)
+            compress_size += len(data)
+            size += len(chunk)
+            self.fp.write(data)
+        if size != file_size:
+            raise ValueError(f"size of {arcname} changed while writing it to the ZIP archive")
+        if not zip64 and compress_size > _ZIP64_LIMIT:
+            raise RuntimeError(f"compressed size of {arcname} exceeds the headroom for ZIP64 extensions")
+        # patch the local header, once CRC and compressed size are known
+        end_offset = self.fp.tell()
+        self.fp.seek(header_offset)
+        self.fp.write(self._local_header(name, dos_time, dos_date, crc, compress_size, size, zip64))
+        self.fp.seek(end_offset)
+        self.members.append((name, dos_time, dos_date, crc, compress_size, size, header_offset))
+
+    def close(self) -> None:
+        """
+        Write the central directory and the end of central directory records.
+        """
+        cd_offset = self.fp.tell()
+        for name, dos_time, dos_date, crc, compress_size, size, header_offset in self.members:
+            extra = b""
+            zip64_fields = [value for value in (size, compress_size, header_offset) if value >= _ZIP64_LIMIT]
+            if zip64_fields:
+                extra = struct.pack(f"<2H{len(zip64_fields)}Q", 0x0001, 8 * len(zip64_fields), *zip64_fields)
+            version = _ZIP64_VERSION if zip64_fields else _ZIP_VERSION
+            self.fp.write(
+                struct.pack(
+                    _ZIP_CENTRAL_DIR_STRUCT,
+                    b"PK\x01\x02",
+                    version,
+                    _ZIP_CREATE_SYSTEM,
+                    version,
+                    0,
+                    _ZIP_FLAGS,
+                    zipfile.ZIP_DEFLATED,
+                    dos_time,
+                    dos_date,
+                    crc,
+                    min(compress_size, _ZIP64_LIMIT),
+                    min(size, _ZIP64_LIMIT),
+                    len(name),
+                    len(extra),
+                    0,
+                    0,
+                    0,
+                    _ZIP_EXTERNAL_ATTR,
+                    min(header_offset, _ZIP64_LIMIT),
+                )
+                + name
+                + extra
+            )
+        cd_end = self.fp.tell()
+        cd_size, n_members = cd_end - cd_offset, len(self.members)
+        if n_members >= _ZIP_MAX_MEMBERS or cd_offset >= _ZIP64_LIMIT or cd_size >= _ZIP64_LIMIT:
+            # ZIP64 end of central directory record, and its locator
+            self.fp.write(
+                struct.pack(
+                    "<4sQ2H2L4Q",
+                    b"PK\x06\x06",
+                    44,
+                    _ZIP64_VERSION,
+                    _ZIP64_VERSION,
+                    0,
+                    0,
+                    n_members,
+                    n_members,
+                    cd_size,
+                    cd_offset,
+                )
+            )
+            self.fp.write(struct.pack("<4sLQL", b"PK\x06\x07", 0, cd_end, 1))
+        self.fp.write(
+            struct.pack(
+                "<4s4H2LH",
+                b"PK\x05\x06",
+                0,
+                0,
+                min(n_members, _ZIP_MAX_MEMBERS),
+                min(n_members, _ZIP_MAX_MEMBERS),
+                min(cd_size, _ZIP64_LIMIT),
+                min(cd_offset, _ZIP64_LIMIT),
+                0,
+            )
+        )
+
+    @staticmethod
+    def _local_header(
+        name: bytes, dos_time: int, dos_date: int, crc: int, compress_size: int, size: int, zip64: bool
+    ) -> bytes:
+        if zip64:
+            extra = struct.pack("<2H2Q", 0x0001, 16, size, compress_size)
+            compress_size = size = _ZIP64_LIMIT
+        else:
+            extra = b""
+        return (
+            struct.pack(
+                "<4s2B4HL2L2H",
+                b"PK\x03\x04",
+                _ZIP64_VERSION if zip64 else _ZIP_VERSION,
+                0,
+                _ZIP_FLAGS,
+                zipfile.ZIP_DEFLATED,
+                dos_time,
+                dos_date,
+                crc,
+                compress_size,
+                size,
+                len(name),
+                len(extra),
+            )
+            + name
+            + extra
+        )
+
+
+def _write_deflated(
+    writer: _DeflatedZipWriter,
+    file: Path,
+    arcname: str,
+    executor: ThreadPoolExecutor,
+    n_jobs: int,
+) -> None:
+    zinfo = zipfile.ZipInfo.from_file(file, arcname=arcname)
+    writer.write(
+        arcname=zinfo.filename,
+        date_time=zinfo.date_time,
+        file_size=zinfo.file_size,
+        chunks=_deflated_chunks(file, executor=executor, n_jobs=n_jobs),
+    )
+
+
+def get_zip_data(delivery_dir: Path, format: Literal["parquet", "csv"], out_dir: Path) -> Path | None:
+    """
+    Return the ZIP archive of the delivered PARQUET or CSV files, and build it on first request if it doesn't
+    exist yet. Returns None if there is neither an archive nor delivered data for the requested format.
+    """
+    zip_path = out_dir / f"synthetic-{format}-data.zip"
+    if zip_path.exists():
+        return zip_path
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # concurrent requests wait for the archive being built by the first one
+    with FileLock(out_dir / f"synthetic-{format}-data.zip.lock"):
+        if zip_path.exists():
+            return zip_path
+        if not any(delivery_dir.glob(f"*/{format}/*")):
+            return None
+        _LOG.info(f"zip {format} synthetic data on demand")
+        zip_data(delivery_dir=delivery_dir, format=format, out_dir=out_dir)
+    return zip_path
 
 
 def create_generation_schema(
@@ -11,17 +11,39 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import uuid
+import json
+import logging
+import math
+import os
+import re
+import shutil
 from pathlib import Path
 from collections.abc import Callable
 
 import pandas as pd
+import psutil
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from mostlyai.sdk import _data as data
 from mostlyai.sdk._data.base import Schema
-from mostlyai.sdk._data.util.common import TABLE_COLUMN_INFIX, TEMPORARY_PRIMARY_KEY
+from mostlyai.sdk._data.util.common import TABLE_COLUMN_INFIX, TEMPORARY_PRIMARY_KEY, generate_uuids
 from mostlyai.sdk.domain import Generator, SyntheticDataset, ModelType
 
+_LOG = logging.getLogger(__name__)
+
+# max memory to be held by the samples of a generation batch, e.g. `4GB`; defaults to half of the available memory
+GENERATE_MAX_MEMORY: str | None = os.getenv("MOSTLY_GENERATE_MAX_MEMORY")
+# min number of samples per generation batch, as each batch comes with the overhead of loading the model
+GENERATE_MIN_BATCH_SIZE: int = 10_000
+# bytes per value of a sample, while it is held one-hot encoded, resp. decoded before being persisted
+ONE_HOT_VALUE_BYTES: int = 4
+DECODED_VALUE_BYTES: int = 64
+# location of the stats of the trained model within the workspace, as written by the engine
+TGT_STATS_FILE: Path = Path("ModelStore") / "tgt-stats" / "stats.json"
+# bytes per unit of memory strings, e.g. `4GB`
+_MEMORY_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
 
 def execute_step_generate_data(
     *,
@@ -57,8 +79,8 @@ def execute_step_generate_data(
             ctx_data_dir.mkdir(parents=True)
             ctx_primary_key = f"{tgt_g_table.name}{TABLE_COLUMN_INFIX}{TEMPORARY_PRIMARY_KEY}"
             dummy_ctx_length = config.sample_size if sample_seed is None else sample_seed.shape[0]
-            dummy_ctx = pd.DataFrame({ctx_primary_key: [str(uuid.uuid4()) for _ in range(dummy_ctx_length)]})
-            dummy_ctx.to_parquet(ctx_data_dir / "part.00000-ctx.parquet")
+            dummy_ctx = pa.table({ctx_primary_key: generate_uuids(dummy_ctx_length)})
+            pq.write_table(dummy_ctx, ctx_data_dir / "part.00000-ctx.parquet")
         ### TODO: FIX
 
     if model_type == ModelType.language:
@@ -88,11 +110,8 @@ def execute_step_generate_data(
         imputation = config.imputation
         fairness = config.fairness
 
-    # call GENERATE
-    engine.generate(
+    generate_kwargs = dict(
         ctx_data=ctx_data,
-        seed_data=sample_seed,
-        sample_size=sample_size,
         batch_size=None,
         sampling_temperature=config.sampling_temperature,
         sampling_top_p=config.sampling_top_p,
@@ -102,5 +121,122 @@ def execute_step_generate_data(
         imputation=imputation,
         fairness=fairness,
         workspace_dir=workspace_dir,
+    )
+
+    # samples of subject tables only depend on the sample size / seed, thus large requests can be split into batches
+    n_samples = len(sample_seed) if sample_seed is not None else sample_size
+    if is_subject and model_type == ModelType.tabular and n_samples is not None:
+        batch_size = get_generation_batch_size(workspace_dir=workspace_dir)
+        if batch_size is not None and n_samples > batch_size:
+            _generate_in_batches(
+                sample_seed=sample_seed,
+                n_samples=n_samples,
+                batch_size=batch_size,
+                update_progress=update_progress,
+                **generate_kwargs,
+            )
+            return
+
+    # call GENERATE
+    engine.generate(
+        seed_data=sample_seed,
+        sample_size=sample_size,
         update_progress=update_progress,
+        **generate_kwargs,
     )
+
+
+def _parse_memory(memory: str | None) -> int | None:
+    # e.g. `4GB` -> 4 * 1024**3
+    match = re.fullmatch(r"(\d+(?:\.\d+)?) ?([bkmgt]?)b?", (memory or "").strip().lower())
+    return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2)]) if match else None
+
+
+def get_generation_batch_size(workspace_dir: Path, max_memory: int | None = None) -> int | None:
+    """
+    Determine the number of samples to generate per batch, so that a batch fits into the given memory.
+
+    :param workspace_dir: the workspace dir, which holds the stats of the trained model
+    :param max_memory: max memory in bytes to be held by the samples of a batch; defaults to `GENERATE_MAX_MEMORY`
+    :return: the number of samples per batch, or None if the stats of the trained model can not be read, in which
+        case samples are not generated in batches
+    """
+    try:
+        tgt_stats = json.loads((workspace_dir / TGT_STATS_FILE).read_text())
+        max_seq_len = tgt_stats["seq_len"]["max"] if tgt_stats.get("is_sequential") else 1
+        columns = tgt_stats.get("columns", {})
+        cardinality = sum(sum(c.get("cardinalities", {}).values()) for c in columns.values())
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        _LOG.warning(f"failed to read stats of the trained model, thus generating without batches: {e}")
+        return None
+    if tgt_stats.get("is_sequential"):
+        # sequence length, index and end are one-hot encoded, too
+        cardinality += 2 * (max_seq_len + 1) + 10
+    if max_memory is None:
+        max_memory = _parse_memory(GENERATE_MAX_MEMORY) or psutil.virtual_memory().available // 2
+    # estimate the footprint of a sample from the stats of the trained model; sequential samples consist of up to
+    # max sequence length records
+    sample_bytes = (cardinality * ONE_HOT_VALUE_BYTES + len(columns) * DECODED_VALUE_BYTES) * max_seq_len
+    return max(GENERATE_MIN_BATCH_SIZE, max_memory // max(1, sample_bytes))
+
+
+class _BatchProgressCallback:
+    # maps the progress of each batch onto the progress of the overall generation, counted in samples, as the engine
+    # reports progress in its own units, and starts over with every batch
+    def __init__(self, update_progress: Callable, n_samples: int):
+        self.update_progress = update_progress
+        self.n_samples = n_samples
+        self._completed = 0  # samples of the batches that are done
+        self._batch_size = 0
+        self._batch_total = 1
+        self._batch_completed = 0
+
+    def start_batch(self, batch_size: int):
+        self._completed += self._batch_size
+        self._batch_size = batch_size
+        self._batch_total, self._batch_completed = 1, 0
+
+    def __call__(self, total: int | None = None, completed: int | None = None, advance: int | None = None, **kwargs):
+        if total is not None:
+            self._batch_total = max(total, 1)
+        if completed is not None:
+            self._batch_completed = completed
+        if advance is not None:
+            self._batch_completed += advance
+        batch_completed = self._batch_size * min(self._batch_completed / self._batch_total, 1.0)
+        return self.update_progress(total=self.n_samples, completed=self._completed + int(batch_completed), **kwargs)
+
+
+def _generate_in_batches(
+    *,
+    sample_seed: pd.DataFrame | None,
+    n_samples: int,
+    batch_size: int,
+    workspace_dir: Path,
+    update_progress: Callable,
+    **generate_kwargs,
+):
+    import mostlyai.engine as engine
+
+    output_path = workspace_dir / "SyntheticData"
+    batches_path = workspace_dir / "SyntheticDataBatches"
+    shutil.rmtree(batches_path, ignore_errors=True)
+    batches_path.mkdir(parents=True)
+    n_batches = math.ceil(n_samples / batch_size)
+    _LOG.info(f"generate {n_samples:,} samples in {n_batches} batches of {batch_size:,} samples")
+    progress = _BatchProgressCallback(update_progress, n_samples=n_samples)
+    for batch in range(n_batches):
+        start, end = batch * batch_size, min(n_samples, (batch + 1) * batch_size)
+        progress.start_batch(end - start)
+        engine.generate(
+            seed_data=sample_seed.iloc[start:end].reset_index(drop=True) if sample_seed is not None else None,
+            sample_size=end - start if sample_seed is None else None,
+            workspace_dir=workspace_dir,
+            update_progress=progress,
+            **generate_kwargs,
+        )
+        # move the parts of the batch aside, as the engine resets its output dir with every call
+        for idx, fn in enumerate(sorted(output_path.glob("part.*.parquet"))):
+            fn.rename(batches_path / f"part.{batch:06}.{idx:06}.parquet")
+    shutil.rmtree(output_path, ignore_errors=True)
+    batches_path.rename(output_path)
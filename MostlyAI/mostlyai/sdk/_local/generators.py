@@ -14,10 +14,13 @@
 
 from pathlib import Path
 
+import pyarrow.parquet as pq
+
 from mostlyai.sdk._local.storage import (
     write_generator_to_json,
     write_connector_to_json,
     write_job_progress_to_json,
+    read_connector_from_json,
     read_generator_from_json,
 )
 from mostlyai.sdk._local.execution.plan import (
@@ -45,20 +48,36 @@ from mostlyai.sdk.domain import (
 )
 
 
+# name of the data file of FILE_UPLOAD connectors
+FILE_UPLOAD_DATA_FILE = "data.parquet"
+
+
+def create_file_upload_connector(home_dir: Path) -> tuple[Connector, Path]:
+    """
+    Create a FILE_UPLOAD connector, whose data is yet to be written.
+
+    :param home_dir: the home dir of the local server
+    :return: the connector, and the path to write its data to as a Parquet file
+    """
+    connector = Connector(
+        **{
+            "name": "FILE_UPLOAD",
+            "type": ConnectorType.file_upload,
+            "access_type": ConnectorAccessType.source,
+        }
+    )
+    connector_dir = home_dir / "connectors" / connector.id
+    connector_dir.mkdir(parents=True, exist_ok=True)
+    write_connector_to_json(connector_dir, connector)
+    return connector, connector_dir / FILE_UPLOAD_DATA_FILE
+
+
 def create_generator(home_dir: Path, config: GeneratorConfig) -> Generator:
     # handle file uploads -> create_connectors
     for t in config.tables or []:
         if t.data is not None:
-            connector = Connector(
-                **{
-                    "name": "FILE_UPLOAD",
-                    "type": ConnectorType.file_upload,
-                    "access_type": ConnectorAccessType.source,
-                }
-            )
+            connector, fn = create_file_upload_connector(home_dir)
             df = convert_to_df(data=t.data, format="parquet")
-            fn = home_dir / "connectors" / connector.id / "data.parquet"
-            fn.parent.mkdir(parents=True, exist_ok=True)
             df.to_parquet(fn)
             t.data = None
             t.source_connector_id = connector.id
@@ -70,7 +89,15 @@ def create_generator(home_dir: Path, config: GeneratorConfig) -> Generator:
                     )
                     for c in list(df.columns)
                 ]
-            write_connector_to_json(home_dir / "connectors" / connector.id, connector)
+        elif t.source_connector_id and t.location is None:
+            # data has been uploaded as a binary file beforehand
+            connector_dir = home_dir / "connectors" / t.source_connector_id
+            fn = connector_dir / FILE_UPLOAD_DATA_FILE
+            if not fn.exists() or read_connector_from_json(connector_dir).type != ConnectorType.file_upload:
+                continue
+            t.location = str(fn.absolute())
+            if t.columns is None:
+                t.columns = [SourceColumnConfig(name=c) for c in pq.read_schema(fn).names]
 
     # create generator
     generator = Generator(
@@ -12,15 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 import math
 import datetime
 from pathlib import Path
 
 from pydantic import BaseModel
 
-from mostlyai.sdk._local.storage import write_to_json
-from mostlyai.sdk.domain import StepCode, JobProgress, ProgressStatus
+from mostlyai.sdk._local.storage import (
+    JobProgressEvent,
+    append_job_progress_event,
+    apply_job_progress_event,
+    compact_job_progress,
+    read_job_progress_from_json,
+)
+from mostlyai.sdk.domain import StepCode, ProgressStatus
+
+# number of progress events after which these are folded into job_progress.json
+JOB_PROGRESS_COMPACTION_EVENTS = 100
 
 
 def get_current_utc_time() -> datetime.datetime:
@@ -43,8 +51,9 @@ class LocalProgressCallback:
         self._last_send_progress_time = None
         self._total = None
 
-        self.progress_file = self.resource_path / "job_progress.json"
-        self.job_progress = JobProgress(**json.loads(self.progress_file.read_text()))
+        # number of events appended to the progress event log since its last compaction
+        self._n_events = 0
+        self.job_progress = read_job_progress_from_json(self.resource_path)
 
     def _check_elapsed_interval(self):
         now = get_current_utc_time()
@@ -95,33 +104,30 @@ class LocalProgressCallback:
         progress_step = next(
             s for s in self.job_progress.steps if s.step_code == self.step_code and s.model_label == self.model_label
         )
-        if progress_step.start_date is None:
-            progress_step.start_date = now
-            progress_step.status = ProgressStatus.in_progress
+        event = JobProgressEvent(
+            model_label=self.model_label,
+            step_code=self.step_code,
+            status=progress_step.status,
+            start_date=progress_step.start_date,
+            end_date=progress_step.end_date,
+            value=progress_step.progress.value,
+            max=progress_step.progress.max,
+            message=message,
+            date=now,
+        )
+        if event.start_date is None:
+            event.start_date = now
+            event.status = ProgressStatus.in_progress
         if advance is not None:
-            progress_step.progress.value += advance
+            event.value += advance
         if completed is not None:
-            progress_step.progress.value = completed
+            event.value = completed
         if total is not None:
-            progress_step.progress.max = total
-        if progress_step.progress.value >= progress_step.progress.max:
-            progress_step.end_date = now
-            progress_step.status = ProgressStatus.done
-        if message is not None:
-            if progress_step.messages is None:
-                progress_step.messages = []
-            progress_step.messages.append(message)
-        self.job_progress.steps = [
-            progress_step if (s.model_label == self.model_label and s.step_code == self.step_code) else s
-            for s in self.job_progress.steps
-        ]
-        self.job_progress.progress.value = len([s for s in self.job_progress.steps if s.status == ProgressStatus.done])
-        self.job_progress.progress.max = len(self.job_progress.steps)  # of steps
-        if self.job_progress.start_date is None:
-            self.job_progress.start_date = now
-        if self.job_progress.progress.value >= self.job_progress.progress.max:
-            self.job_progress.end_date = now
-            self.job_progress.status = ProgressStatus.done
+            event.max = total
+        if event.value >= event.max:
+            event.end_date = now
+            event.status = ProgressStatus.done
+        apply_job_progress_event(self.job_progress, event)
 
         # send progress if we are DONE, or if we have a message to pass,
         # or if enough time has passed since last progress update
@@ -133,6 +139,11 @@ class LocalProgressCallback:
             or (completed is not None and elapsed_enough_time)
             or (increase_by > 0 and elapsed_enough_time)
         ):
-            write_to_json(self.progress_file, self.job_progress)
+            append_job_progress_event(self.resource_path, event)
+            self._n_events += 1
+            # keep the event log short, so that readers which start from scratch only need to replay a few events
+            if self._n_events >= JOB_PROGRESS_COMPACTION_EVENTS or self.job_progress.status == ProgressStatus.done:
+                compact_job_progress(self.resource_path)
+                self._n_events = 0
 
         return {}
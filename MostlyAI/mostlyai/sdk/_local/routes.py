@@ -11,25 +11,34 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import os
+import functools
 import shutil
-import subprocess
-import sys
 import uuid
 import zipfile
 from io import BytesIO
 from pathlib import Path
 import tempfile
-
-from fastapi import APIRouter, Body, HTTPException, UploadFile, File, Form
+import time
+from collections.abc import Callable, Iterator
+from itertools import chain
+
+import anyio
+from anyio import CapacityLimiter, to_thread
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import APIRouter, Body, Header, HTTPException, Request, UploadFile, File, Form
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse, HTMLResponse, RedirectResponse, Response
 from starlette.background import BackgroundTask
 
 from mostlyai import sdk
 from mostlyai.sdk._data.conversions import create_container_from_connector
 from mostlyai.sdk._local import generators, synthetic_datasets
+from mostlyai.sdk._local.catalog import CatalogKind, CatalogSortBy, list_resources, unindex_resource
 from mostlyai.sdk._local.execution.jobs import execute_probing_job
+from mostlyai.sdk._local.execution.step_finalize_generation import get_zip_data
+from mostlyai.sdk._local.scheduler import JobKind, JobScheduler
 from mostlyai.sdk._local.generators import create_generator as create_generator_model
 from mostlyai.sdk._local import connectors
 from mostlyai.sdk.domain import (
@@ -38,7 +47,6 @@ from mostlyai.sdk.domain import (
     CurrentUser,
     Generator,
     GeneratorPatchConfig,
-    GeneratorListItem,
     GeneratorConfig,
     ProgressStatus,
     JobProgress,
@@ -57,31 +65,100 @@ from mostlyai.sdk.domain import (
     GeneratorCloneConfig,
     GeneratorCloneTrainingStatus,
     SyntheticDatasetReportType,
-    SyntheticDatasetListItem,
     ConnectorReadDataConfig,
     IfExists,
     ConnectorWriteDataConfig,
     ConnectorDeleteDataConfig,
 )
+from mostlyai.sdk.client._base_utils import ARROW_STREAM_MEDIA_TYPE, encode_arrow_stream
 from mostlyai.sdk._local.storage import (
     read_generator_from_json,
     write_generator_to_json,
+    get_job_progress_version,
     read_job_progress_from_json,
     read_connector_from_json,
     read_synthetic_dataset_from_json,
     write_synthetic_dataset_to_json,
-    create_zip_in_memory,
+    stream_zip,
     write_connector_to_json,
 )
 from mostlyai.sdk._data.file.utils import read_data_table_from_path
 
+# max number of long-running requests, e.g. connector reads, zipping or probing, to be served concurrently
+LONG_RUNNING_REQUESTS_N_THREADS: int = 8
+# interval in seconds in which progress streams check for updates of the job progress
+PROGRESS_STREAM_INTERVAL: float = 0.25
+# interval in seconds in which progress streams send keep-alive comments, if there are no updates
+PROGRESS_STREAM_KEEP_ALIVE: float = 5.0
+
 
 class Routes:
     def __init__(self, home_dir: Path):
         self.home_dir = home_dir
         self.router = APIRouter()
+        # dispatches training and generation jobs; its background thread, which resumes jobs that were queued before a
+        # restart, is started and stopped by the server
+        self.scheduler = JobScheduler(home_dir)
+        # bounds the threads for long-running requests, so that these never exhaust the threadpool in which
+        # FastAPI serves all other sync endpoints, e.g. progress polling
+        self._long_running_limiter = CapacityLimiter(LONG_RUNNING_REQUESTS_N_THREADS)
         self._initialize_routes()
 
+    def _offload(self, endpoint: Callable) -> Callable:
+        """Run a blocking endpoint in a worker thread, bounded by the limiter for long-running requests."""
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return await to_thread.run_sync(
+                functools.partial(endpoint, *args, **kwargs), limiter=self._long_running_limiter
+            )
+
+        return wrapper
+
+    @staticmethod
+    def _progress_stream_response(resource_dir: Path) -> StreamingResponse:
+        if not resource_dir.exists():
+            raise HTTPException(status_code=404, detail="Resource not found")
+
+        async def events():
+            # send the job progress as Server-Sent Events whenever it changes, until the job has finished
+            last_version, last_sent = None, time.monotonic()
+            while True:
+                version = get_job_progress_version(resource_dir)
+                if version is not None and version != last_version:
+                    job_progress = await to_thread.run_sync(read_job_progress_from_json, resource_dir)
+                    yield f"data: {job_progress.model_dump_json(by_alias=True)}\n\n"
+                    last_version, last_sent = version, time.monotonic()
+                    if job_progress.status in (ProgressStatus.done, ProgressStatus.failed, ProgressStatus.canceled):
+                        return
+                elif time.monotonic() - last_sent > PROGRESS_STREAM_KEEP_ALIVE:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+                await anyio.sleep(PROGRESS_STREAM_INTERVAL)
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    @staticmethod
+    def _arrow_stream_response(chunks: Iterator[pd.DataFrame]) -> StreamingResponse:
+        # fetch the first chunk eagerly, so that errors are still reported with a proper status code
+        first_chunk = next(chunks, None)
+        chunks = chain([first_chunk], chunks) if first_chunk is not None else chunks
+        return StreamingResponse(encode_arrow_stream(chunks), media_type=ARROW_STREAM_MEDIA_TYPE)
+
+    @staticmethod
+    def _parquet_response(df: pd.DataFrame, filename: str) -> StreamingResponse:
+        # this file can only be safely removed once the streaming response is complete
+        with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as tmp_file:
+            tmp_path = tmp_file.name
+            df.to_parquet(tmp_path)
+
+        return StreamingResponse(
+            open(tmp_path, mode="rb"),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+            background=BackgroundTask(Path(tmp_path).unlink, missing_ok=True),
+        )
+
     def _html(self, title: str, body: str):
         return f"""
                 <!DOCTYPE html>
@@ -141,7 +218,7 @@ class Routes:
         ## CONNECTORS
 
         @self.router.get("/connectors")
-        async def list_connectors(
+        def list_connectors(
             offset=0, limit=50, searchTerm: str | None = None, access_type: str | None = None
         ) -> JSONResponse:
             connector_dirs = [p for p in (self.home_dir / "connectors").glob("*") if p.is_dir()]
@@ -165,18 +242,38 @@ class Routes:
             )
 
         @self.router.post("/connectors", response_model=Connector)
-        async def create_connector(config: ConnectorConfig = Body(...), testConnection: bool = True) -> Connector:
+        @self._offload
+        def create_connector(config: ConnectorConfig = Body(...), testConnection: bool = True) -> Connector:
             connector = connectors.create_connector(self.home_dir, config, test_connection=testConnection)
             return connector
 
+        @self.router.post("/connectors/file-upload", response_model=Connector)
+        async def upload_file(request: Request) -> Connector:
+            # the Parquet file is written to disk as it arrives, so that uploads never need to fit into memory
+            connector, fn = await to_thread.run_sync(generators.create_file_upload_connector, self.home_dir)
+            try:
+                async with await anyio.open_file(fn, "wb") as f:
+                    async for chunk in request.stream():
+                        await f.write(chunk)
+                await to_thread.run_sync(pq.read_schema, fn)
+            except pa.ArrowInvalid:
+                shutil.rmtree(fn.parent, ignore_errors=True)
+                raise HTTPException(status_code=400, detail="Invalid Parquet file")
+            except BaseException:
+                # e.g. the client disconnected before completing the upload
+                shutil.rmtree(fn.parent, ignore_errors=True)
+                raise
+            return connector
+
         @self.router.get("/connectors/{id}", response_model=Connector)
-        async def get_connector(id: str) -> Connector:
+        def get_connector(id: str) -> Connector:
             connector_dir = self.home_dir / "connectors" / id
             connector = read_connector_from_json(connector_dir)
             return connector
 
         @self.router.patch("/connectors/{id}", response_model=Connector)
-        async def patch_connector(
+        @self._offload
+        def patch_connector(
             id: str, config: ConnectorPatchConfig = Body(...), testConnection: bool = True
         ) -> Connector:
             config = connectors.encrypt_connector_config(config)
@@ -191,12 +288,13 @@ class Routes:
             return connector
 
         @self.router.delete("/connectors/{id}")
-        async def delete_connector(id: str):
+        def delete_connector(id: str):
             connector_dir = self.home_dir / "connectors" / id
             shutil.rmtree(connector_dir, ignore_errors=True)
 
         @self.router.get("/connectors/{id}/locations")
-        async def list_connector_locations(id: str, prefix: str):
+        @self._offload
+        def list_connector_locations(id: str, prefix: str):
             connector_dir = self.home_dir / "connectors" / id
             connector = read_connector_from_json(connector_dir)
             container = create_container_from_connector(connector)
@@ -204,7 +302,8 @@ class Routes:
             return locations
 
         @self.router.get("/connectors/{id}/schema")
-        async def location_schema(id: str, location: str):
+        @self._offload
+        def location_schema(id: str, location: str):
             connector_dir = self.home_dir / "connectors" / id
             connector = read_connector_from_json(connector_dir)
             container = create_container_from_connector(connector)
@@ -229,25 +328,21 @@ class Routes:
             return JSONResponse(status_code=200, content=columns)
 
         @self.router.post("/connectors/{id}/read-data")
-        async def read_data(id: str, config: ConnectorReadDataConfig = Body(...)) -> StreamingResponse:
+        @self._offload
+        def read_data(
+            id: str, config: ConnectorReadDataConfig = Body(...), accept: str | None = Header(None)
+        ) -> StreamingResponse:
             connector_dir = self.home_dir / "connectors" / id
             connector = read_connector_from_json(connector_dir)
+            if ARROW_STREAM_MEDIA_TYPE in (accept or ""):
+                return self._arrow_stream_response(connectors.read_data_chunks_from_connector(connector, config))
+            # older clients expect the data as a single Parquet file
             df = connectors.read_data_from_connector(connector, config)
-
-            # this file can only be safely removed once the streaming response is complete
-            with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as tmp_file:
-                tmp_path = tmp_file.name
-                df.to_parquet(tmp_path)
-
-            return StreamingResponse(
-                open(tmp_path, mode="rb"),
-                media_type="application/octet-stream",
-                headers={"Content-Disposition": "attachment; filename=data.parquet"},
-                background=BackgroundTask(Path(tmp_path).unlink, missing_ok=True),
-            )
+            return self._parquet_response(df, filename="data.parquet")
 
         @self.router.post("/connectors/{id}/write-data")
-        async def write_data(
+        @self._offload
+        def write_data(
             id: str,
             file: UploadFile | None = File(None),
             location: str = Form(...),
@@ -255,70 +350,56 @@ class Routes:
         ) -> None:
             connector_dir = self.home_dir / "connectors" / id
             connector = read_connector_from_json(connector_dir)
-            file_content = await file.read() if file else None
+            file_content = file.file.read() if file else None
             config = ConnectorWriteDataConfig(location=location, file=file_content, if_exists=if_exists)
             connectors.write_data_to_connector(connector, config)
 
         @self.router.post("/connectors/{id}/delete-data")
-        async def delete_data(id: str, config: ConnectorDeleteDataConfig = Body(...)) -> None:
+        @self._offload
+        def delete_data(id: str, config: ConnectorDeleteDataConfig = Body(...)) -> None:
             connector_dir = self.home_dir / "connectors" / id
             connector = read_connector_from_json(connector_dir)
             connectors.delete_data_from_connector(connector, config)
 
         @self.router.post("/connectors/{id}/query")
-        async def query(id: str, sql: str = Body(..., embed=True)) -> StreamingResponse:
+        @self._offload
+        def query(id: str, sql: str = Body(..., embed=True), accept: str | None = Header(None)) -> StreamingResponse:
             connector_dir = self.home_dir / "connectors" / id
             connector = read_connector_from_json(connector_dir)
+            if ARROW_STREAM_MEDIA_TYPE in (accept or ""):
+                return self._arrow_stream_response(connectors.query_data_chunks_from_connector(connector, sql))
+            # older clients expect the data as a single Parquet file
             df = connectors.query_data_from_connector(connector, sql)
-
-            # this file can only be safely removed once the streaming response is complete
-            with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as tmp_file:
-                tmp_path = tmp_file.name
-                df.to_parquet(tmp_path)
-
-            return StreamingResponse(
-                open(tmp_path, mode="rb"),
-                media_type="application/octet-stream",
-                headers={"Content-Disposition": "attachment; filename=query_result.parquet"},
-                background=BackgroundTask(Path(tmp_path).unlink, missing_ok=True),
-            )
+            return self._parquet_response(df, filename="query_result.parquet")
 
         ## GENERATORS
 
         @self.router.get("/generators")
-        async def list_generators(
-            offset: int = 0, limit: int = 50, searchTerm: str | None = None, status: str | None = None
+        def list_generators(
+            offset: int = 0,
+            limit: int = 50,
+            searchTerm: str | None = None,
+            status: str | None = None,
+            sortBy: CatalogSortBy = CatalogSortBy.recency,
         ) -> JSONResponse:
-            generator_dirs = [p for p in (self.home_dir / "generators").glob("*") if p.is_dir()]
-            generator_list_items = []
-            for generator_dir in generator_dirs:
-                generator = read_generator_from_json(generator_dir)
-                if (
-                    not searchTerm
-                    or searchTerm.lower() in (generator.name or "").lower()
-                    or searchTerm.lower() in (generator.description or "").lower()
-                ):
-                    if not status or status == generator.training_status:
-                        # use model_construct to skip validation and warnings of extra fields
-                        generator_list_items.append(GeneratorListItem.model_construct(**generator.model_dump()))
-            # use jsonable_encoder to handle non-serializable objects like datetime
-            return JSONResponse(
-                status_code=200,
-                content=jsonable_encoder(
-                    {
-                        "totalCount": len(generator_list_items),
-                        "results": generator_list_items[int(offset) : int(offset) + int(limit)],
-                    }
-                ),
+            total_count, list_items = list_resources(
+                self.home_dir,
+                kind=CatalogKind.generators,
+                offset=offset,
+                limit=limit,
+                search_term=searchTerm,
+                status=status,
+                sort_by=sortBy,
             )
+            return JSONResponse(status_code=200, content={"totalCount": total_count, "results": list_items})
 
         @self.router.post("/generators", response_model=Generator)
-        async def create_generator(config: GeneratorConfig = Body(...)) -> Generator:
+        def create_generator(config: GeneratorConfig = Body(...)) -> Generator:
             generator = generators.create_generator(self.home_dir, config)
             return generator
 
         @self.router.get("/generators/{id}", response_model=Generator)
-        async def get_generator(id: str) -> Generator:
+        def get_generator(id: str) -> Generator:
             generator_dir = self.home_dir / "generators" / id
             if not generator_dir.exists():
                 raise HTTPException(status_code=404, detail=f"Generator `{id}` not found")
@@ -326,7 +407,7 @@ class Routes:
             return generator
 
         @self.router.patch("/generators/{id}", response_model=Generator)
-        async def patch_generator(id: str, config: GeneratorPatchConfig = Body(...)) -> Generator:
+        def patch_generator(id: str, config: GeneratorPatchConfig = Body(...)) -> Generator:
             generator_dir = self.home_dir / "generators" / id
             generator = read_generator_from_json(generator_dir)
             for key, value in config.model_dump().items():
@@ -336,12 +417,14 @@ class Routes:
             return generator
 
         @self.router.delete("/generators/{id}")
-        async def delete_generator(id: str):
+        def delete_generator(id: str):
             generator_dir = self.home_dir / "generators" / id
             shutil.rmtree(generator_dir, ignore_errors=True)
+            unindex_resource(generator_dir)
 
         @self.router.post("/generators/{id}/clone", response_model=Generator)
-        async def clone_generator(id: str, config: GeneratorCloneConfig = Body(...)) -> Generator:
+        @self._offload
+        def clone_generator(id: str, config: GeneratorCloneConfig = Body(...)) -> Generator:
             generator_dir = self.home_dir / "generators" / id
             generator = read_generator_from_json(generator_dir)
             connector_dirs = [
@@ -369,7 +452,7 @@ class Routes:
             return new_generator
 
         @self.router.get("/generators/{id}/tables/{table_id}/report", response_class=HTMLResponse)
-        async def get_model_report(id: str, table_id: str, modelType: str) -> HTMLResponse:
+        def get_model_report(id: str, table_id: str, modelType: str) -> HTMLResponse:
             generator_dir = self.home_dir / "generators" / id
             generator = read_generator_from_json(generator_dir)
             table = next((t for t in generator.tables if t.id == table_id), None)
@@ -378,13 +461,17 @@ class Routes:
             return HTMLResponse(content=fn.read_text())
 
         @self.router.get("/generators/{id}/training", response_model=JobProgress)
-        async def get_training_progress(id: str) -> JobProgress:
+        def get_training_progress(id: str) -> JobProgress:
             generator_dir = self.home_dir / "generators" / id
             job_progress = read_job_progress_from_json(generator_dir)
             return job_progress
 
+        @self.router.get("/generators/{id}/training/stream", response_class=StreamingResponse)
+        def stream_training_progress(id: str) -> StreamingResponse:
+            return self._progress_stream_response(self.home_dir / "generators" / id)
+
         @self.router.post("/generators/{id}/training/start", response_model=None)
-        async def start_training(id: str):
+        def start_training(id: str):
             generator_dir = self.home_dir / "generators" / id
             generator = read_generator_from_json(generator_dir)
 
@@ -392,42 +479,48 @@ class Routes:
             if generator.training_status not in [ProgressStatus.new, ProgressStatus.continue_]:
                 raise HTTPException(status_code=400)
 
-            # call shell script to start training job
-            cli_py = str((Path(os.path.dirname(os.path.realpath(__file__))) / "cli.py").absolute())
-            cmd = [sys.executable, cli_py, "run-training", generator.id, str(self.home_dir.absolute())]
-            subprocess.Popen(cmd)
+            # enqueue training job; it is started as a subprocess once there is capacity
+            self.scheduler.submit(JobKind.training, generator.id)
+
+        @self.router.post("/generators/{id}/training/cancel", response_model=None)
+        def cancel_training(id: str):
+            generator_dir = self.home_dir / "generators" / id
+            if not generator_dir.exists():
+                raise HTTPException(status_code=404, detail="Generator not found")
+            self.scheduler.cancel(JobKind.training, id)
 
         @self.router.get("/generators/{id}/training/logs", response_class=StreamingResponse)
-        async def download_training_logs(id: str, slft: str) -> StreamingResponse:
+        @self._offload
+        def download_training_logs(id: str, slft: str) -> StreamingResponse:
             _ = slft  # ignore parameter
             generator_dir = self.home_dir / "generators" / id
-            zip_buffer = create_zip_in_memory(generator_dir, "*.log")
             return StreamingResponse(
-                zip_buffer,
+                stream_zip(generator_dir, "*.log"),
                 media_type="application/zip",
                 headers={"Content-Disposition": f"attachment; filename=generator-{id[:8]}-logs.zip"},
             )
 
         @self.router.get("/generators/{id}/export-to-file", response_class=StreamingResponse)
-        async def export_generator_to_file(id: str) -> StreamingResponse:
+        @self._offload
+        def export_generator_to_file(id: str) -> StreamingResponse:
             generator_dir = self.home_dir / "generators" / id
             generator = read_generator_from_json(generator_dir)
             if generator.training_status != ProgressStatus.done:
                 raise HTTPException(status_code=400, detail="Cannot export generator that is not trained")
-            zip_buffer = create_zip_in_memory(generator_dir)
             return StreamingResponse(
-                zip_buffer,
+                stream_zip(generator_dir),
                 media_type="application/zip",
                 headers={"Content-Disposition": f"attachment; filename=generator-{id[:8]}.zip"},
             )
 
         @self.router.post("/generators/import-from-file", response_model=Generator)
-        async def import_generator_from_file(file: UploadFile = File(...)) -> Generator:
+        @self._offload
+        def import_generator_from_file(file: UploadFile = File(...)) -> Generator:
             generator_id = str(uuid.uuid4())  # generate new UUID
             generator_dir = self.home_dir / "generators" / generator_id
             generator_dir.mkdir(parents=True, exist_ok=True)
 
-            file_content = await file.read()
+            file_content = file.file.read()
             try:
                 with zipfile.ZipFile(BytesIO(file_content)) as zip_ref:
                     zip_ref.extractall(generator_dir)
@@ -443,47 +536,37 @@ class Routes:
             return generator
 
         @self.router.get("/generators/{id}/config", response_model=GeneratorConfig)
-        async def get_generator_config(id: str) -> GeneratorConfig:
+        def get_generator_config(id: str) -> GeneratorConfig:
             return generators.get_generator_config(self.home_dir, id)
 
         ### SYNTHETIC DATASETS
 
         @self.router.get("/synthetic-datasets")
-        async def list_synthetic_datasets(
-            offset: int = 0, limit: int = 50, searchTerm: str | None = None, status: str | None = None
+        def list_synthetic_datasets(
+            offset: int = 0,
+            limit: int = 50,
+            searchTerm: str | None = None,
+            status: str | None = None,
+            sortBy: CatalogSortBy = CatalogSortBy.recency,
         ) -> JSONResponse:
-            synthetic_dataset_dirs = [p for p in (self.home_dir / "synthetic-datasets").glob("*") if p.is_dir()]
-            synthetic_dataset_list_items = []
-            for synthetic_dataset_dir in synthetic_dataset_dirs:
-                synthetic_dataset = read_synthetic_dataset_from_json(synthetic_dataset_dir)
-                if (
-                    not searchTerm
-                    or searchTerm.lower() in (synthetic_dataset.name or "").lower()
-                    or searchTerm.lower() in (synthetic_dataset.description or "").lower()
-                ):
-                    if not status or status == synthetic_dataset.generation_status:
-                        # use model_construct to skip validation and warnings of extra fields
-                        synthetic_dataset_list_items.append(
-                            SyntheticDatasetListItem.model_construct(**synthetic_dataset.model_dump())
-                        )
-            # use jsonable_encoder to handle non-serializable objects like datetime
-            return JSONResponse(
-                status_code=200,
-                content=jsonable_encoder(
-                    {
-                        "totalCount": len(synthetic_dataset_list_items),
-                        "results": synthetic_dataset_list_items[int(offset) : int(offset) + int(limit)],
-                    }
-                ),
+            total_count, list_items = list_resources(
+                self.home_dir,
+                kind=CatalogKind.synthetic_datasets,
+                offset=offset,
+                limit=limit,
+                search_term=searchTerm,
+                status=status,
+                sort_by=sortBy,
             )
+            return JSONResponse(status_code=200, content={"totalCount": total_count, "results": list_items})
 
         @self.router.post("/synthetic-datasets", response_model=SyntheticDataset)
-        async def create_synthetic_dataset(config: SyntheticDatasetConfig = Body(...)) -> SyntheticDataset:
+        def create_synthetic_dataset(config: SyntheticDatasetConfig = Body(...)) -> SyntheticDataset:
             synthetic_dataset = synthetic_datasets.create_synthetic_dataset(self.home_dir, config)
             return synthetic_dataset
 
         @self.router.get("/synthetic-datasets/{id}", response_model=SyntheticDataset)
-        async def get_synthetic_dataset(id: str) -> SyntheticDataset:
+        def get_synthetic_dataset(id: str) -> SyntheticDataset:
             synthetic_dataset_dir = self.home_dir / "synthetic-datasets" / id
             if not synthetic_dataset_dir.exists():
                 raise HTTPException(status_code=404, detail=f"Synthetic Dataset `{id}` not found")
@@ -491,7 +574,7 @@ class Routes:
             return synthetic_dataset
 
         @self.router.patch("/synthetic-datasets/{id}", response_model=SyntheticDataset)
-        async def patch_synthetic_dataset(id: str, config: SyntheticDatasetPatchConfig = Body(...)) -> SyntheticDataset:
+        def patch_synthetic_dataset(id: str, config: SyntheticDatasetPatchConfig = Body(...)) -> SyntheticDataset:
             synthetic_dataset_dir = self.home_dir / "synthetic-datasets" / id
             synthetic_dataset = read_synthetic_dataset_from_json(synthetic_dataset_dir)
             for key, value in config.model_dump().items():
@@ -501,12 +584,13 @@ class Routes:
             return synthetic_dataset
 
         @self.router.delete("/synthetic-datasets/{id}")
-        async def delete_synthetic_dataset(id: str):
+        def delete_synthetic_dataset(id: str):
             synthetic_dataset_dir = self.home_dir / "synthetic-datasets" / id
             shutil.rmtree(synthetic_dataset_dir, ignore_errors=True)
+            unindex_resource(synthetic_dataset_dir)
 
         @self.router.get("/synthetic-datasets/{id}/tables/{table_id}/report", response_class=HTMLResponse)
-        async def get_data_report(id: str, table_id: str, reportType: str, modelType: str) -> HTMLResponse:
+        def get_data_report(id: str, table_id: str, reportType: str, modelType: str) -> HTMLResponse:
             synthetic_dataset_dir = self.home_dir / "synthetic-datasets" / id
             synthetic_dataset = read_synthetic_dataset_from_json(synthetic_dataset_dir)
             table = next((t for t in synthetic_dataset.tables if t.id == table_id), None)
@@ -518,13 +602,17 @@ class Routes:
             return HTMLResponse(content=fn.read_text())
 
         @self.router.get("/synthetic-datasets/{id}/generation", response_model=JobProgress)
-        async def get_generation_progress(id: str) -> JobProgress:
+        def get_generation_progress(id: str) -> JobProgress:
             synthetic_dataset_dir = self.home_dir / "synthetic-datasets" / id
             job_progress = read_job_progress_from_json(synthetic_dataset_dir)
             return job_progress
 
+        @self.router.get("/synthetic-datasets/{id}/generation/stream", response_class=StreamingResponse)
+        def stream_generation_progress(id: str) -> StreamingResponse:
+            return self._progress_stream_response(self.home_dir / "synthetic-datasets" / id)
+
         @self.router.post("/synthetic-datasets/{id}/generation/start", response_model=None)
-        async def start_generation(id: str):
+        def start_generation(id: str):
             synthetic_dataset_dir = self.home_dir / "synthetic-datasets" / id
             synthetic_dataset = read_synthetic_dataset_from_json(synthetic_dataset_dir)
 
@@ -532,46 +620,63 @@ class Routes:
             if synthetic_dataset.generation_status not in [ProgressStatus.new, ProgressStatus.continue_]:
                 raise HTTPException(status_code=400)
 
-            # call shell script to start generation job
-            cli_py = str((Path(os.path.dirname(os.path.realpath(__file__))) / "cli.py").absolute())
-            cmd = [sys.executable, cli_py, "run-generation", synthetic_dataset.id, str(self.home_dir.absolute())]
-            subprocess.Popen(cmd)
+            # enqueue generation job; it is started as a subprocess once there is capacity
+            self.scheduler.submit(JobKind.generation, synthetic_dataset.id)
+
+        @self.router.post("/synthetic-datasets/{id}/generation/cancel", response_model=None)
+        def cancel_generation(id: str):
+            synthetic_dataset_dir = self.home_dir / "synthetic-datasets" / id
+            if not synthetic_dataset_dir.exists():
+                raise HTTPException(status_code=404, detail="Synthetic dataset not found")
+            self.scheduler.cancel(JobKind.generation, id)
 
         @self.router.get("/synthetic-datasets/{id}/generation/logs", response_class=StreamingResponse)
-        async def download_generation_logs(id: str, slft: str) -> StreamingResponse:
+        @self._offload
+        def download_generation_logs(id: str, slft: str) -> StreamingResponse:
             _ = slft  # ignore parameter
             synthetic_dataset_dir = self.home_dir / "synthetic-datasets" / id
-            zip_buffer = create_zip_in_memory(synthetic_dataset_dir, "*.log")
             return StreamingResponse(
-                zip_buffer,
+                stream_zip(synthetic_dataset_dir, "*.log"),
                 media_type="application/zip",
                 headers={"Content-Disposition": f"attachment; filename=synthetic-dataset-{id[:8]}-logs.zip"},
             )
 
         @self.router.get("/synthetic-datasets/{id}/config", response_model=SyntheticDatasetConfig)
-        async def get_synthetic_dataset_config(id: str) -> SyntheticDatasetConfig:
+        def get_synthetic_dataset_config(id: str) -> SyntheticDatasetConfig:
             return synthetic_datasets.get_synthetic_dataset_config(self.home_dir, id)
 
         @self.router.get("/synthetic-datasets/{id}/download", response_class=FileResponse)
-        async def download_synthetic_dataset(id: str, slft: str, format: str) -> FileResponse:
+        @self._offload
+        def download_synthetic_dataset(
+            id: str, slft: str, format: str, if_none_match: str | None = Header(None)
+        ) -> FileResponse:
             _ = slft  # ignore parameter
             synthetic_dataset_dir = self.home_dir / "synthetic-datasets" / id
-            if format == SyntheticDatasetFormat.parquet:
-                filename = "synthetic-parquet-data.zip"
-            elif format == SyntheticDatasetFormat.csv:
-                filename = "synthetic-csv-data.zip"
+            zip_dir = synthetic_dataset_dir / "ZIP"
+            if format in (SyntheticDatasetFormat.parquet, SyntheticDatasetFormat.csv):
+                # archives may not exist yet, if they are built on demand
+                path = get_zip_data(
+                    delivery_dir=synthetic_dataset_dir / "FinalizedSyntheticData",
+                    format=format.lower(),
+                    out_dir=zip_dir,
+                )
             elif format == SyntheticDatasetFormat.xlsx:
-                filename = "synthetic-samples.xlsx"
+                path = zip_dir / "synthetic-samples.xlsx"
             else:
                 raise HTTPException(status_code=400, detail="Invalid format")
+            if path is None or not path.exists():
+                raise HTTPException(status_code=404, detail=f"Synthetic data is not available as {format}")
 
-            return FileResponse(
-                path=(synthetic_dataset_dir / "ZIP" / filename).absolute(),
-            )
+            response = FileResponse(path=path.absolute(), stat_result=path.stat())
+            # FileResponse serves range requests and sets the ETag, but doesn't handle conditional requests
+            if if_none_match is not None and response.headers["etag"] in map(str.strip, if_none_match.split(",")):
+                return Response(status_code=304, headers={"etag": response.headers["etag"]})
+            return response
 
         ### SYNTHETIC PROBES
 
         @self.router.post("/synthetic-probes", response_model=list[Probe])
-        async def create_synthetic_probe(config: SyntheticProbeConfig = Body(...)) -> list[Probe]:
+        @self._offload
+        def create_synthetic_probe(config: SyntheticProbeConfig = Body(...)) -> list[Probe]:
             synthetic_dataset = synthetic_datasets.create_synthetic_dataset(home_dir=self.home_dir, config=config)
             return execute_probing_job(synthetic_dataset_id=synthetic_dataset.id, home_dir=self.home_dir)
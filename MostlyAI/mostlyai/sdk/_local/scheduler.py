@@ -0,0 +1,283 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+
+import psutil
+from filelock import FileLock
+from pydantic import BaseModel, Field
+
+from mostlyai.sdk._local.storage import (
+    read_generator_from_json,
+    read_job_progress_from_json,
+    read_synthetic_dataset_from_json,
+    write_generator_to_json,
+    write_job_progress_to_json,
+    write_synthetic_dataset_to_json,
+)
+from mostlyai.sdk.domain import Generator, ProgressStatus, SyntheticDataset
+
+_LOG = logging.getLogger(__name__)
+
+# max number of training and generation jobs to be executed concurrently
+MAX_CONCURRENT_JOBS: int = int(os.getenv("MOSTLY_MAX_CONCURRENT_JOBS", max(1, min(4, (os.cpu_count() or 1) // 4))))
+# further jobs are only admitted if at least this much memory is available, and CPU usage is at most this threshold
+MIN_AVAILABLE_MEMORY: int = 2 * 1024**3
+MAX_CPU_PERCENT: float = 90.0
+# interval in seconds in which the queue is checked for finished and admissible jobs
+SCHEDULE_INTERVAL: float = 2.0
+
+
+class JobKind(str, Enum):
+    training = "TRAINING"
+    generation = "GENERATION"
+
+
+class ScheduledJob(BaseModel):
+    resource_id: str
+    kind: JobKind
+    status: ProgressStatus = ProgressStatus.queued
+    submitted_at: datetime = Field(default_factory=datetime.now)
+    pid: int | None = None
+    pid_create_time: float | None = None
+    # whether training continues from the model of the generator, as the resource status is overwritten once queued
+    continue_training: bool = False
+
+
+class JobQueue(BaseModel):
+    jobs: list[ScheduledJob] = Field(default_factory=list)
+
+
+class JobScheduler:
+    """
+    Execute training and generation jobs as subprocesses, with bounded concurrency.
+
+    Jobs are kept in a FIFO queue, which is persisted under the home dir, so that queued and running jobs survive
+    restarts of the server. Beyond the first running job, further jobs are only admitted if enough memory and CPU
+    are available.
+    """
+
+    def __init__(
+        self,
+        home_dir: Path,
+        max_concurrent_jobs: int = MAX_CONCURRENT_JOBS,
+        min_available_memory: int = MIN_AVAILABLE_MEMORY,
+        max_cpu_percent: float = MAX_CPU_PERCENT,
+    ):
+        self.home_dir = home_dir
+        self.max_concurrent_jobs = max(max_concurrent_jobs, 1)
+        self.min_available_memory = min_available_memory
+        self.max_cpu_percent = max_cpu_percent
+        self._queue_file = home_dir / "jobs" / "queue.json"
+        self._lock = FileLock(self._queue_file.with_suffix(".lock"))
+        # handles of processes spawned by this instance, so that these can be reaped
+        self._processes: dict[int, subprocess.Popen] = {}
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start dispatching queued jobs in a background thread."""
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop dispatching; running jobs are not affected."""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, kind: JobKind, resource_id: str) -> ScheduledJob:
+        """Enqueue a job, and mark its resource as queued."""
+        with self._lock:
+            queue = self._read_queue()
+            job = self._find(queue, kind, resource_id)
+            if job is None:
+                job = ScheduledJob(
+                    resource_id=resource_id, kind=kind, continue_training=self._is_continue_training(kind, resource_id)
+                )
+                queue.jobs.append(job)
+                self._mark_resource(job, ProgressStatus.queued)
+                self._write_queue(queue)
+        self.schedule()
+        return job
+
+    def cancel(self, kind: JobKind, resource_id: str) -> bool:
+        """Dequeue or terminate a job, and mark its resource as canceled. Returns False if the job is not active."""
+        with self._lock:
+            queue = self._read_queue()
+            job = self._find(queue, kind, resource_id)
+            if job is None:
+                return False
+            if job.status == ProgressStatus.in_progress:
+                self._terminate(job)
+                shutil.rmtree(self.home_dir / "in_progress" / resource_id, ignore_errors=True)
+            queue.jobs.remove(job)
+            self._mark_resource(job, ProgressStatus.canceled)
+            self._write_queue(queue)
+        self.schedule()
+        return True
+
+    def status(self, kind: JobKind, resource_id: str) -> ScheduledJob | None:
+        """Return the queued or running job for a resource, if any."""
+        with self._lock:
+            return self._find(self._read_queue(), kind, resource_id)
+
+    def schedule(self) -> None:
+        """Remove finished jobs from the queue, and start queued jobs as long as there is capacity."""
+        with self._lock:
+            queue = self._read_queue()
+            for job in [job for job in queue.jobs if job.status == ProgressStatus.in_progress]:
+                if not self._is_alive(job):
+                    _LOG.info(f"{job.kind.value.lower()} job for {job.resource_id} has finished")
+                    queue.jobs.remove(job)
+                    # jobs mark their resources as done or failed themselves, unless they got killed
+                    self._mark_resource(job, ProgressStatus.failed, only_if_active=True)
+            for job in [job for job in queue.jobs if job.status == ProgressStatus.queued]:
+                n_running = sum(job.status == ProgressStatus.in_progress for job in queue.jobs)
+                if not self._has_capacity(n_running):
+                    break
+                self._spawn(job)
+            self._write_queue(queue)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.schedule()
+            except Exception as e:
+                _LOG.warning(f"failed to schedule jobs: {e}")
+            self._stop_event.wait(SCHEDULE_INTERVAL)
+
+    def _has_capacity(self, n_running: int) -> bool:
+        if n_running >= self.max_concurrent_jobs:
+            return False
+        if n_running == 0:
+            # always admit one job, so that the queue keeps making progress
+            return True
+        available_memory = psutil.virtual_memory().available
+        cpu_percent = psutil.cpu_percent(interval=None)
+        return available_memory >= self.min_available_memory and cpu_percent <= self.max_cpu_percent
+
+    def _command(self, job: ScheduledJob) -> list[str]:
+        cli_py = str((Path(os.path.dirname(os.path.realpath(__file__))) / "cli.py").absolute())
+        command = "run-training" if job.kind == JobKind.training else "run-generation"
+        args = [sys.executable, cli_py, command, job.resource_id, str(self.home_dir.absolute())]
+        if job.continue_training:
+            args.append("--continue-training")
+        return args
+
+    def _spawn(self, job: ScheduledJob) -> None:
+        process = subprocess.Popen(self._command(job))
+        self._processes[process.pid] = process
+        job.status = ProgressStatus.in_progress
+        job.pid = process.pid
+        job.pid_create_time = psutil.Process(process.pid).create_time()
+        _LOG.info(f"started {job.kind.value.lower()} job for {job.resource_id} (pid={job.pid})")
+
+    def _is_alive(self, job: ScheduledJob) -> bool:
+        process = self._processes.get(job.pid)
+        if process is not None:
+            if process.poll() is None:
+                return True
+            del self._processes[job.pid]
+            return False
+        # process has been spawned by an earlier server instance; guard against re-used PIDs
+        try:
+            proc = psutil.Process(job.pid)
+            return proc.create_time() == job.pid_create_time and proc.status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
+    def _terminate(self, job: ScheduledJob) -> None:
+        if not self._is_alive(job):
+            return
+        try:
+            proc = psutil.Process(job.pid)
+            procs = [proc] + proc.children(recursive=True)
+        except psutil.Error:
+            return
+        for p in procs:
+            try:
+                p.terminate()
+            except psutil.Error:
+                pass
+        _, alive = psutil.wait_procs(procs, timeout=5)
+        for p in alive:
+            try:
+                p.kill()
+            except psutil.Error:
+                pass
+        if (process := self._processes.pop(job.pid, None)) is not None:
+            process.wait()
+
+    def _mark_resource(self, job: ScheduledJob, status: ProgressStatus, only_if_active: bool = False) -> None:
+        if job.kind == JobKind.training:
+            resource_dir = self.home_dir / "generators" / job.resource_id
+            if not resource_dir.exists():
+                return
+            resource: Generator | SyntheticDataset = read_generator_from_json(resource_dir)
+            current_status = resource.training_status
+        else:
+            resource_dir = self.home_dir / "synthetic-datasets" / job.resource_id
+            if not resource_dir.exists():
+                return
+            resource = read_synthetic_dataset_from_json(resource_dir)
+            current_status = resource.generation_status
+        if only_if_active and current_status not in (ProgressStatus.queued, ProgressStatus.in_progress):
+            return
+        job_progress = read_job_progress_from_json(resource_dir)
+        job_progress.status = status
+        for step in job_progress.steps or []:
+            if step.status != ProgressStatus.done:
+                step.status = status
+        write_job_progress_to_json(resource_dir, job_progress)
+        if isinstance(resource, Generator):
+            resource.training_status = status
+            write_generator_to_json(resource_dir, resource)
+        else:
+            resource.generation_status = status
+            write_synthetic_dataset_to_json(resource_dir, resource)
+
+    def _is_continue_training(self, kind: JobKind, resource_id: str) -> bool:
+        resource_dir = self.home_dir / "generators" / resource_id
+        if kind != JobKind.training or not resource_dir.exists():
+            return False
+        return read_generator_from_json(resource_dir).training_status == ProgressStatus.continue_
+
+    @staticmethod
+    def _find(queue: JobQueue, kind: JobKind, resource_id: str) -> ScheduledJob | None:
+        return next((job for job in queue.jobs if job.kind == kind and job.resource_id == resource_id), None)
+
+    def _read_queue(self) -> JobQueue:
+        if not self._queue_file.exists():
+            return JobQueue()
+        return JobQueue(**json.loads(self._queue_file.read_text()))
+
+    def _write_queue(self, queue: JobQueue) -> None:
+        # replace atomically, so that a crash while writing never leaves a truncated queue behind
+        self._queue_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self._queue_file.with_suffix(".tmp")
+        tmp_file.write_text(queue.model_dump_json(indent=2))
+        os.replace(tmp_file, self._queue_file)
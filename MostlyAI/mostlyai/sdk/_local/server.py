@@ -24,6 +24,7 @@ import rich
 from fastapi import FastAPI
 import uvicorn
 
+from mostlyai.sdk._local.catalog import reindex_resources
 from mostlyai.sdk._local.routes import Routes
 
 import os
@@ -66,8 +67,8 @@ class LocalServer:
             "deploying these then to a MOSTLY AI platform. Enjoy!",
             version="1.0.0",
         )
-        routes = Routes(self.home_dir)
-        self._app.include_router(routes.router)
+        self._routes = Routes(self.home_dir)
+        self._app.include_router(self._routes.router)
         self.register_exception_handlers()
         self._server = None
         self._thread = None
@@ -90,6 +91,9 @@ class LocalServer:
 
     def start(self):
         if not self._server:
+            # pick up changes to the home dir, which were made while no server was running
+            reindex_resources(self.home_dir)
+            self._routes.scheduler.start()  # Dispatch queued jobs, incl. those queued before a restart
             self._create_server()
             self._thread = Thread(target=self._run_server, daemon=True)
             self._thread.start()
@@ -104,6 +108,7 @@ class LocalServer:
             self._server.should_exit = True  # Signal the server to shut down
             self._thread.join()  # Wait for the server thread to finish
             self._clear_socket_file()
+        self._routes.scheduler.stop()  # Stop dispatching queued jobs; running jobs continue
 
     def __enter__(self):
         # Ensure the server is running
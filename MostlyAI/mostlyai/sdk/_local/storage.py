@@ -12,14 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import io
 import json
+import os
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 import zipfile
-from io import BytesIO
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from filelock import FileLock
-from mostlyai.sdk.domain import Generator, JobProgress, Connector, SyntheticDataset
+from mostlyai.sdk._local.catalog import index_resource
+from mostlyai.sdk.domain import Generator, JobProgress, Connector, ProgressStatus, StepCode, SyntheticDataset
 
 
 def read_generator_from_json(generator_dir: Path) -> Generator:
@@ -31,6 +38,7 @@ def write_generator_to_json(generator_dir: Path, generator: Generator) -> None:
     json_file = generator_dir / "generator.json"
     generator_dir.mkdir(parents=True, exist_ok=True)
     write_to_json(json_file, generator)
+    index_resource(generator_dir, generator)
 
 
 def read_connector_from_json(connector_dir: Path) -> Connector:
@@ -44,18 +52,158 @@ def write_connector_to_json(connector_dir: Path, connector: Connector) -> None:
     write_to_json(json_file, connector)
 
 
-def read_job_progress_from_json(resource_dir: Path) -> JobProgress:
+class JobProgressEvent(BaseModel):
+    # snapshot of a single progress step, as appended to the progress event log
+    model_config = ConfigDict(protected_namespaces=())
+
+    model_label: str | None = None
+    step_code: StepCode | None = None
+    status: ProgressStatus | None = None
+    start_date: datetime.datetime | None = None
+    end_date: datetime.datetime | None = None
+    value: int | None = None
+    max: int | None = None
+    message: dict[str, Any] | None = None
+    date: datetime.datetime
+
+
+@dataclass
+class _CachedJobProgress:
+    generation: int
+    log_offset: int
+    job_progress: JobProgress
+
+
+# max number of resource dirs, for which the job progress is cached by this process
+JOB_PROGRESS_CACHE_SIZE = 128
+# job progress per resource dir, as last read by this process; allows readers to tail the progress event log
+_JOB_PROGRESS_CACHE: OrderedDict[Path, _CachedJobProgress] = OrderedDict()
+
+
+def _job_progress_files(resource_dir: Path) -> tuple[Path, Path, FileLock]:
     progress_file = resource_dir / "job_progress.json"
-    lock_file = progress_file.with_suffix(".lock")
-    lock = FileLock(lock_file)
+    log_file = resource_dir / "job_progress.events.jsonl"
+    return progress_file, log_file, FileLock(progress_file.with_suffix(".lock"))
+
+
+def _job_progress_generation_file(resource_dir: Path) -> Path:
+    # holds a counter, which is incremented whenever job_progress.json is (re-)written and the event log is reset
+    return resource_dir / "job_progress.generation"
+
+
+def _read_job_progress_generation(resource_dir: Path) -> int:
+    try:
+        return int(_job_progress_generation_file(resource_dir).read_text())
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def _write_job_progress_generation(resource_dir: Path, generation: int) -> None:
+    # replace atomically, so that readers without the lock never see a partially written counter
+    generation_file = _job_progress_generation_file(resource_dir)
+    tmp_file = generation_file.with_suffix(".tmp")
+    tmp_file.write_text(str(generation))
+    os.replace(tmp_file, generation_file)
+
+
+def _cache_job_progress(resource_dir: Path, cached: _CachedJobProgress) -> None:
+    _JOB_PROGRESS_CACHE[resource_dir] = cached
+    _JOB_PROGRESS_CACHE.move_to_end(resource_dir)
+    while len(_JOB_PROGRESS_CACHE) > JOB_PROGRESS_CACHE_SIZE:
+        _JOB_PROGRESS_CACHE.popitem(last=False)
+
+
+def apply_job_progress_event(job_progress: JobProgress, event: JobProgressEvent) -> None:
+    step = next(s for s in job_progress.steps if s.step_code == event.step_code and s.model_label == event.model_label)
+    step.status = event.status
+    step.start_date = event.start_date
+    step.end_date = event.end_date
+    step.progress.value = event.value
+    step.progress.max = event.max
+    if event.message is not None:
+        step.messages = (step.messages or []) + [event.message]
+    job_progress.progress.value = len([s for s in job_progress.steps if s.status == ProgressStatus.done])
+    job_progress.progress.max = len(job_progress.steps)  # of steps
+    if job_progress.start_date is None:
+        job_progress.start_date = event.date
+    if job_progress.progress.value >= job_progress.progress.max:
+        job_progress.end_date = event.date
+        job_progress.status = ProgressStatus.done
+
+
+def _read_job_progress_events(log_file: Path, offset: int) -> tuple[list[JobProgressEvent], int]:
+    # read complete lines from offset onwards; returns the events, and the offset after the last complete line
+    try:
+        with open(log_file, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return [], offset
+    data = data[: data.rfind(b"\n") + 1]
+    events = [JobProgressEvent.model_validate_json(line) for line in data.splitlines() if line.strip()]
+    return events, offset + len(data)
+
+
+def _read_cached_job_progress(resource_dir: Path, progress_file: Path, log_file: Path) -> JobProgress:
+    # must be called while holding the job progress lock
+    generation = _read_job_progress_generation(resource_dir)
+    cached = _JOB_PROGRESS_CACHE.get(resource_dir)
+    if cached is None or cached.generation != generation:
+        # (re-)read the compacted job progress, and the full event log
+        job_progress = JobProgress(**json.loads(progress_file.read_text()))
+        cached = _CachedJobProgress(generation, 0, job_progress)
+    _cache_job_progress(resource_dir, cached)
+    # only parse events which have been appended since the last read
+    events, cached.log_offset = _read_job_progress_events(log_file, cached.log_offset)
+    for event in events:
+        apply_job_progress_event(cached.job_progress, event)
+    return cached.job_progress
+
+
+def _write_cached_job_progress(resource_dir: Path, progress_file: Path, log_file: Path, job_progress: JobProgress):
+    # must be called while holding the job progress lock
+    progress_file.write_text(_to_json_str(job_progress))
+    # job progress is written as a whole, so any logged events are superseded
+    log_file.unlink(missing_ok=True)
+    generation = _read_job_progress_generation(resource_dir) + 1
+    _write_job_progress_generation(resource_dir, generation)
+    _cache_job_progress(resource_dir, _CachedJobProgress(generation, 0, job_progress.model_copy(deep=True)))
+
+
+def get_job_progress_version(resource_dir: Path) -> tuple[int, int] | None:
+    # cheap check for changes of the job progress, without reading it
+    progress_file, log_file, _ = _job_progress_files(resource_dir)
+    if not progress_file.exists():
+        return None
+    log_size = log_file.stat().st_size if log_file.exists() else 0
+    return _read_job_progress_generation(resource_dir), log_size
+
+
+def read_job_progress_from_json(resource_dir: Path) -> JobProgress:
+    progress_file, log_file, lock = _job_progress_files(resource_dir)
     with lock:
-        return JobProgress(**json.loads(progress_file.read_text()))
+        return _read_cached_job_progress(resource_dir, progress_file, log_file).model_copy(deep=True)
 
 
 def write_job_progress_to_json(resource_dir: Path, job_progress: JobProgress) -> None:
-    progress_file = resource_dir / "job_progress.json"
+    progress_file, log_file, lock = _job_progress_files(resource_dir)
     resource_dir.mkdir(parents=True, exist_ok=True)
-    write_to_json(progress_file, job_progress)
+    with lock:
+        _write_cached_job_progress(resource_dir, progress_file, log_file, job_progress)
+
+
+def append_job_progress_event(resource_dir: Path, event: JobProgressEvent) -> None:
+    _, log_file, lock = _job_progress_files(resource_dir)
+    with lock, open(log_file, "a") as f:
+        f.write(event.model_dump_json() + "\n")
+
+
+def compact_job_progress(resource_dir: Path) -> None:
+    # fold the progress event log into job_progress.json
+    progress_file, log_file, lock = _job_progress_files(resource_dir)
+    with lock:
+        job_progress = _read_cached_job_progress(resource_dir, progress_file, log_file)
+        _write_cached_job_progress(resource_dir, progress_file, log_file, job_progress)
 
 
 def read_synthetic_dataset_from_json(synthetic_dataset_dir: Path) -> SyntheticDataset:
@@ -67,33 +215,65 @@ def write_synthetic_dataset_to_json(synthetic_dataset_dir: Path, synthetic_datas
     json_file = synthetic_dataset_dir / "synthetic-dataset.json"
     synthetic_dataset_dir.mkdir(parents=True, exist_ok=True)
     write_to_json(json_file, synthetic_dataset)
+    index_resource(synthetic_dataset_dir, synthetic_dataset)
 
 
-def create_zip_in_memory(path: Path, pattern: str = "*") -> BytesIO:
-    # Create an in-memory zip file
-    zip_buffer = BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w") as zip_file:
-        if path.is_dir():
-            # Iterate over all files in the directory and subdirectories
-            for file_path in path.rglob(pattern):
-                if file_path.is_file():  # Ensure it's a file (not a directory)
-                    # Add file to the zip archive, keeping the directory structure
-                    zip_file.write(file_path, file_path.relative_to(path))
-        else:
-            # Add the single file to the zip archive
-            zip_file.write(path, path.name)
-    # Ensure the buffer is ready for streaming
-    zip_buffer.seek(0)
-    return zip_buffer
+# size of the chunks in which files are read into, and handed out of, streamed zip archives
+ZIP_STREAM_CHUNK_SIZE = 1024 * 1024
 
 
-def write_to_json(file_path: Path, obj: BaseModel) -> None:
-    json_str = obj.model_dump_json(
+class _ZipStreamSink(io.RawIOBase):
+    # non-seekable sink, so that zipfile writes data descriptors instead of seeking back to patch local headers
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._buffer += b
+        return len(b)
+
+    def pop(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def stream_zip(path: Path, pattern: str = "*", chunk_size: int = ZIP_STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    # yield a zip archive of the files under path, as it is being written, so that it never needs to fit in memory
+    if path.is_dir():
+        # keep the directory structure within the zip archive
+        files = [(file_path, file_path.relative_to(path)) for file_path in sorted(path.rglob(pattern))]
+        files = [(file_path, arcname) for file_path, arcname in files if file_path.is_file()]
+    else:
+        files = [(path, path.name)]
+    sink = _ZipStreamSink()
+    with zipfile.ZipFile(sink, "w") as zip_file:
+        for file_path, arcname in files:
+            # ZipInfo.from_file sets the file size, so that ZIP64 extensions are used where needed
+            zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+            with open(file_path, "rb") as src, zip_file.open(zinfo, "w") as dst:
+                while chunk := src.read(chunk_size):
+                    dst.write(chunk)
+                    if data := sink.pop():
+                        yield data
+            yield sink.pop()
+    # central directory
+    yield sink.pop()
+
+
+def _to_json_str(obj: BaseModel) -> str:
+    return obj.model_dump_json(
         # pretty print JSON
         indent=2,
         # serialize with camelCase aliases for platform compatibility
         by_alias=True,
     )
+
+
+def write_to_json(file_path: Path, obj: BaseModel) -> None:
+    json_str = _to_json_str(obj)
     lock_file = file_path.with_suffix(".lock")
     lock = FileLock(lock_file)
     with lock:
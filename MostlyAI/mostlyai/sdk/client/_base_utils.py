@@ -15,14 +15,24 @@
 import base64
 import io
 import warnings
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
 from pathlib import Path
 from typing import Any, Literal
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import csv
 
 warnings.simplefilter("always", DeprecationWarning)
 
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+# number of rows which are converted to Arrow at a time, when writing DataFrames to Parquet files
+PARQUET_WRITE_CHUNK_SIZE = 100_000
+# max number of rows to hold back, while the types of all-null columns of an Arrow stream are still unknown
+ARROW_STREAM_MAX_BUFFERED_ROWS = 100_000
+
 
 def convert_to_base64(
     df: pd.DataFrame | list[dict[str, Any]],
@@ -61,6 +71,30 @@ def convert_to_base64(
     return base64_encoded_str
 
 
+def write_parquet_file(df: pd.DataFrame, path: str | Path, chunk_size: int = PARQUET_WRITE_CHUNK_SIZE) -> None:
+    """
+    Write a DataFrame to a Parquet file. Unlike `df.to_parquet`, the DataFrame is converted to Arrow in chunks of
+    rows, so that the memory overhead is bounded by the chunk size rather than by the size of the DataFrame.
+
+    Args:
+        df: The DataFrame to write.
+        path: The path of the Parquet file.
+        chunk_size: The number of rows to convert at a time.
+    """
+    if df.__class__.__name__ == "DataFrame" and df.__class__.__module__.startswith("pyspark.sql"):
+        # Convert PySpark DataFrame to Pandas DataFrame (safely)
+        df = pd.DataFrame(df.collect(), columns=df.columns)
+    # clear any (potentially non-serializable) attributes that might stop us from saving to PQT
+    if df.attrs:
+        df.attrs.clear()
+    # infer the schema from all rows, so that it fits all chunks
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for start in range(0, max(len(df), 1), chunk_size):
+            chunk = pa.Table.from_pandas(df.iloc[start : start + chunk_size], schema=schema, preserve_index=False)
+            writer.write_table(chunk)
+
+
 def convert_to_df(data: str, format: Literal["parquet", "jsonl"] = "parquet") -> pd.DataFrame:
     # Load the DataFrame from a base64 encoded string
     binary_data = base64.b64decode(data)
@@ -72,6 +106,138 @@ def convert_to_df(data: str, format: Literal["parquet", "jsonl"] = "parquet") ->
     return df
 
 
+def _has_null_fields(schema: pa.Schema) -> bool:
+    return any(pa.types.is_null(field.type) for field in schema)
+
+
+def encode_arrow_stream(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """
+    Encode DataFrame chunks as an Arrow IPC stream, yielding the encoded bytes chunk by chunk.
+
+    The schema of the stream is unified across the leading chunks, as long as these contain all-null columns, whose
+    type is thus still unknown; up to `ARROW_STREAM_MAX_BUFFERED_ROWS` rows are held back for that. Columns that are
+    still all-null by then are streamed as strings.
+
+    Args:
+        chunks: The DataFrame chunks to encode. All chunks are cast to the schema of the stream.
+
+    Returns:
+        An iterator over the bytes of the Arrow IPC stream.
+    """
+    sink = io.BytesIO()
+    writer, schema = None, None
+    buffered, n_buffered_rows = [], 0
+
+    def open_stream(tables: list[pa.Table], is_complete: bool) -> pa.Schema:
+        nonlocal writer
+        schema = pa.unify_schemas([t.schema for t in tables], promote_options="permissive")
+        if not is_complete:
+            schema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in schema])
+        writer = pa.ipc.new_stream(sink, schema)
+        for table in tables:
+            writer.write_table(table.cast(schema))
+        return schema
+
+    for df in chunks:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if writer is None:
+            buffered.append(table)
+            n_buffered_rows += table.num_rows
+            unified = pa.unify_schemas([t.schema for t in buffered], promote_options="permissive")
+            if _has_null_fields(unified) and n_buffered_rows < ARROW_STREAM_MAX_BUFFERED_ROWS:
+                continue
+            schema = open_stream(buffered, is_complete=False)
+            buffered = []
+        else:
+            writer.write_table(table.cast(schema) if table.schema != schema else table)
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    if writer is None:
+        open_stream(buffered or [pa.table({})], is_complete=True)
+    writer.close()
+    yield sink.getvalue()
+
+
+class _IterableReader(io.RawIOBase):
+    # file-like adapter over an iterable of bytes, so that these can be decoded while being received
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            self._buffer = next(self._chunks, None)
+            if self._buffer is None:
+                self._buffer = b""
+                return 0
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def decode_arrow_stream(chunks: Iterable[bytes]) -> pd.DataFrame:
+    """
+    Decode an Arrow IPC stream into a DataFrame, record batch by record batch, as its bytes arrive.
+
+    Args:
+        chunks: The bytes of the Arrow IPC stream, e.g. as received from a streamed HTTP response.
+
+    Returns:
+        The decoded DataFrame.
+    """
+    with pa.ipc.open_stream(io.BufferedReader(_IterableReader(chunks))) as reader:
+        return reader.read_pandas()
+
+
+def _feed_sse_line(line: str, data: list[str]) -> str | None:
+    # collect the data of the current event, and return it once the event is dispatched
+    if line == "":
+        # a blank line dispatches the event
+        event = "\n".join(data) if data else None
+        data.clear()
+        return event
+    if line.startswith("data:"):
+        data.append(line.removeprefix("data:").removeprefix(" "))
+    return None
+
+
+def iter_sse_data(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Extract the data of Server-Sent Events from the lines of an event stream.
+
+    Args:
+        lines: The lines of the event stream, without line endings.
+
+    Returns:
+        An iterator over the data of each event. Comments and other fields are ignored.
+    """
+    data = []
+    for line in lines:
+        if (event := _feed_sse_line(line, data)) is not None:
+            yield event
+
+
+async def aiter_sse_data(lines: AsyncIterable[str]) -> AsyncIterator[str]:
+    """
+    Async counterpart of `iter_sse_data`.
+
+    Args:
+        lines: The lines of the event stream, without line endings.
+
+    Returns:
+        An async iterator over the data of each event.
+    """
+    data = []
+    async for line in lines:
+        if (event := _feed_sse_line(line, data)) is not None:
+            yield event
+
+
 def read_table_from_path(path: str | Path) -> (str, pd.DataFrame):
     # read data from file
     fn = str(path)
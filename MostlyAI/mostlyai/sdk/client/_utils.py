@@ -12,12 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import logging
 import time
 from pathlib import Path
 from typing import Union, Any
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
 from urllib.parse import urlparse
 
+import httpx
 import pandas as pd
 import rich
 from rich import box
@@ -39,14 +42,22 @@ from mostlyai.sdk.domain import (
     StepCode,
     ProgressStatus,
     Generator,
+    GeneratorConfig,
     SyntheticDatasetConfig,
     SyntheticProbeConfig,
     SyntheticTableConfiguration,
     SyntheticTableConfig,
     GeneratorListItem,
+    JobProgress,
 )
+from mostlyai.sdk.client._base_utils import convert_to_base64, read_table_from_path
 from mostlyai.sdk.client._naming_conventions import map_camel_to_snake_case
 
+_LOG = logging.getLogger(__name__)
+
+# seconds to wait after a job has completed, to give the system a moment to update the status
+JOB_COMPLETION_DELAY = 1
+
 
 def check_local_mode_available() -> None:
     """
@@ -86,18 +97,61 @@ def validate_api_key(api_key: str) -> None:
         raise APIError("Invalid API key format.")
 
 
-def job_wait(
-    get_progress: Callable,
+def _iter_job_progress(
+    get_progress: Callable[[], JobProgress],
     interval: float,
-    progress_bar: bool = True,
-) -> None:
-    # ensure that interval is at least 1 sec
-    interval = max(interval, 1)
-    # retrieve current JobProgress
-    job = get_progress()
-    if progress_bar:
+    stream_progress: Callable[[], Iterator[JobProgress]] | None = None,
+) -> Iterator[JobProgress]:
+    # yield updates of the JobProgress; these are streamed as they happen, if supported by the server
+    if stream_progress is not None:
+        job = None
+        try:
+            for job in stream_progress():
+                yield job
+        except (APIError, httpx.HTTPError) as e:
+            _LOG.info(f"progress stream got interrupted, falling back to polling: {e}")
+        if job is not None and job.status in (ProgressStatus.done, ProgressStatus.failed, ProgressStatus.canceled):
+            return
+    # otherwise poll for updates every interval seconds
+    while True:
+        time.sleep(interval)
+        yield get_progress()
+
+
+async def _aiter_job_progress(
+    get_progress: Callable[[], Awaitable[JobProgress]],
+    interval: float,
+    stream_progress: Callable[[], AsyncIterator[JobProgress]] | None = None,
+) -> AsyncIterator[JobProgress]:
+    # async counterpart of _iter_job_progress
+    if stream_progress is not None:
+        job = None
+        try:
+            async for job in stream_progress():
+                yield job
+        except (APIError, httpx.HTTPError) as e:
+            _LOG.info(f"progress stream got interrupted, falling back to polling: {e}")
+        if job is not None and job.status in (ProgressStatus.done, ProgressStatus.failed, ProgressStatus.canceled):
+            return
+    while True:
+        await asyncio.sleep(interval)
+        yield await get_progress()
+
+
+class _JobProgressDisplay:
+    """
+    Render the updates of a job, either as live progress bars, or as a final status message.
+    """
+
+    def __init__(self, job: JobProgress, interval: float, progress_bar: bool):
+        self.progress_bar = progress_bar
+        # whether the job has run to completion, as opposed to failed or canceled
+        self.is_complete = False
+        self.step = None
+        if not progress_bar:
+            return
         # initialize progress bars
-        progress = Progress(
+        self.progress = Progress(
             TextColumn("[progress.description]{task.description}"),
             BarColumn(
                 style=Style(color="rgb(245,245,245)"),
@@ -110,8 +164,8 @@ def job_wait(
             auto_refresh=False,  # auto refresh will be handled by Live object
             expand=True,
         )
-        progress_bars = {
-            "overall": progress.add_task(
+        self.progress_bars = {
+            "overall": self.progress.add_task(
                 description="[bold]Overall job progress[/b]",
                 start=job.start_date is not None,
                 completed=0,
@@ -122,19 +176,32 @@ def job_wait(
             step_code = step.step_code.value
             if step_code == StepCode.train_model.value:
                 step_code += " :gem:"
-            progress_bars |= {
-                step.id: progress.add_task(
+            self.progress_bars |= {
+                step.id: self.progress.add_task(
                     description=f"Step {step.model_label or 'common'} [#808080]{step_code}[/]",
                     start=step.start_date is not None,
                     completed=0,
                     total=step.progress.max,
                 )
             }
-        layout = Table.grid(expand=True)
-        layout.add_row(progress)
-        live = Live(layout, refresh_per_second=1 / interval)
-        step_id_to_layout_idx = {}
+        self.layout = Table.grid(expand=True)
+        self.layout.add_row(self.progress)
+        self.live = Live(self.layout, refresh_per_second=1 / interval)
+        self.step_id_to_layout_idx = {}
+
+    def start(self) -> None:
+        if self.progress_bar:
+            self.live.start()
 
+    def stop(self) -> None:
+        if self.progress_bar:
+            self.live.stop()
+
+    def interrupt(self) -> None:
+        if self.step is not None:
+            rich.print(f"[red]Step {self.step.model_label} {self.step.step_code.value} {self.step.status.lower()}")
+
+    @staticmethod
     def _rich_table_delete_row(table: Table, idx: int = -1) -> Table:
         # helper method to delete a row from a rich table
         for column in table.columns:
@@ -142,6 +209,7 @@ def job_wait(
         table.rows = table.rows[:idx] + table.rows[idx + 1 :]
         return table
 
+    @staticmethod
     def _rich_table_insert_row(*renderables: RenderableType | None, table: Table, idx: int = -1) -> Table:
         # helper method to insert a row into a rich table
         table.add_row(*renderables)
@@ -152,103 +220,144 @@ def job_wait(
         table.rows.pop()
         return table
 
-    try:
-        if progress_bar:
-            # loop until job has completed
-            live.start()
-        while True:
-            # sleep for interval seconds
-            time.sleep(interval)
-            # retrieve current JobProgress
-            job = get_progress()
-            if progress_bar:
-                current_task_id = progress_bars["overall"]
-                current_task = progress.tasks[current_task_id]
-                if not current_task.started and job.start_date is not None:
-                    progress.start_task(current_task_id)
-                # update progress bars
+    def update(self, job: JobProgress) -> bool:
+        """
+        Render an update of the job. Returns True, once the job has finished.
+        """
+        if not self.progress_bar:
+            if job.end_date or job.status in (
+                ProgressStatus.failed,
+                ProgressStatus.canceled,
+            ):
+                rich.print(f"Job {job.status.lower()}")
+                return True
+            return False
+
+        progress, layout = self.progress, self.layout
+        current_task_id = self.progress_bars["overall"]
+        current_task = progress.tasks[current_task_id]
+        if not current_task.started and job.start_date is not None:
+            progress.start_task(current_task_id)
+        # update progress bars
+        progress.update(
+            current_task_id,
+            total=job.progress.max,
+            completed=job.progress.value,
+        )
+        if current_task.started and job.end_date is not None:
+            progress.stop_task(current_task_id)
+
+        for i, step in enumerate(job.steps):
+            self.step = step
+            # create the latest training log table
+            if step.step_code == StepCode.train_model:
+                messages = step.messages or []
+                messages = messages[-6:]
+                last_checkpoint_idx = next(
+                    (len(messages) - 1 - j for j, msg in enumerate(reversed(messages)) if msg["is_checkpoint"]),
+                    -1,
+                )
+                training_log = Table(
+                    title=f"Training log for `{step.model_label}`",
+                    box=box.SIMPLE_HEAD,
+                    expand=True,
+                    header_style="none",
+                )
+                columns = ["Epochs", "Samples", "Elapsed Time", "Val Loss"]
+                if messages and messages[0].get("dp_eps"):
+                    columns.append("Diff Privacy (ε/δ)")
+                for col in columns:
+                    training_log.add_column(col, justify="right")
+                for j, message in enumerate(messages):
+                    formatted_message = [
+                        f"{message['epoch']:.2f}" if message.get("epoch") else "-",
+                        f"{message['samples']:,}" if message.get("samples") else "-",
+                        f"{message['total_time']:.0f}s" if message.get("total_time") else "-",
+                        f"{message['val_loss']:.4f}" if message.get("val_loss") else "-",
+                    ]
+                    if message.get("dp_eps"):
+                        formatted_message += [f"{message['dp_eps']:.2f} / {message['dp_delta']:.0e}"]
+                    style = "#14b57d on #f0fff7" if j == last_checkpoint_idx else "bright_black"
+                    training_log.add_row(*formatted_message, style=style)
+            current_task_id = self.progress_bars[step.id]
+            current_task = progress.tasks[current_task_id]
+            if not current_task.started and step.start_date is not None:
+                progress.start_task(current_task_id)
+                if step.step_code == StepCode.train_model:
+                    layout.add_row(Text("\n\n"))
+                    layout.add_row(training_log)
+                    self.step_id_to_layout_idx[step.id] = len(layout.rows) - 1
+            if step.progress.max > 0:
                 progress.update(
                     current_task_id,
-                    total=job.progress.max,
-                    completed=job.progress.value,
+                    total=step.progress.max,
+                    completed=step.progress.value,
                 )
-                if current_task.started and job.end_date is not None:
+            if current_task.started:
+                if step.step_code == StepCode.train_model:
+                    self._rich_table_delete_row(layout, self.step_id_to_layout_idx[step.id])
+                    self._rich_table_insert_row(training_log, table=layout, idx=self.step_id_to_layout_idx[step.id])
+                if step.end_date is not None:
                     progress.stop_task(current_task_id)
+            self.live.update(layout)
+            # break if step has failed or been canceled
+            if step.status in (ProgressStatus.failed, ProgressStatus.canceled):
+                rich.print(f"[red]Step {step.model_label} {step.step_code.value} {step.status.lower()}")
+                return True
+        # check whether we are done
+        if job.progress.value >= job.progress.max:
+            self.live.refresh()
+            self.is_complete = True
+            return True
+        return False
 
-                for i, step in enumerate(job.steps):
-                    # create the latest training log table
-                    if step.step_code == StepCode.train_model:
-                        messages = step.messages or []
-                        messages = messages[-6:]
-                        last_checkpoint_idx = next(
-                            (len(messages) - 1 - j for j, msg in enumerate(reversed(messages)) if msg["is_checkpoint"]),
-                            -1,
-                        )
-                        training_log = Table(
-                            title=f"Training log for `{step.model_label}`",
-                            box=box.SIMPLE_HEAD,
-                            expand=True,
-                            header_style="none",
-                        )
-                        columns = ["Epochs", "Samples", "Elapsed Time", "Val Loss"]
-                        if messages and messages[0].get("dp_eps"):
-                            columns.append("Diff Privacy (ε/δ)")
-                        for col in columns:
-                            training_log.add_column(col, justify="right")
-                        for j, message in enumerate(messages):
-                            formatted_message = [
-                                f"{message['epoch']:.2f}" if message.get("epoch") else "-",
-                                f"{message['samples']:,}" if message.get("samples") else "-",
-                                f"{message['total_time']:.0f}s" if message.get("total_time") else "-",
-                                f"{message['val_loss']:.4f}" if message.get("val_loss") else "-",
-                            ]
-                            if message.get("dp_eps"):
-                                formatted_message += [f"{message['dp_eps']:.2f} / {message['dp_delta']:.0e}"]
-                            style = "#14b57d on #f0fff7" if j == last_checkpoint_idx else "bright_black"
-                            training_log.add_row(*formatted_message, style=style)
-                    current_task_id = progress_bars[step.id]
-                    current_task = progress.tasks[current_task_id]
-                    if not current_task.started and step.start_date is not None:
-                        progress.start_task(current_task_id)
-                        if step.step_code == StepCode.train_model:
-                            layout.add_row(Text("\n\n"))
-                            layout.add_row(training_log)
-                            step_id_to_layout_idx[step.id] = len(layout.rows) - 1
-                    if step.progress.max > 0:
-                        progress.update(
-                            current_task_id,
-                            total=step.progress.max,
-                            completed=step.progress.value,
-                        )
-                    if current_task.started:
-                        if step.step_code == StepCode.train_model:
-                            _rich_table_delete_row(layout, step_id_to_layout_idx[step.id])
-                            _rich_table_insert_row(training_log, table=layout, idx=step_id_to_layout_idx[step.id])
-                        if step.end_date is not None:
-                            progress.stop_task(current_task_id)
-                    live.update(layout)
-                    # break if step has failed or been canceled
-                    if step.status in (ProgressStatus.failed, ProgressStatus.canceled):
-                        rich.print(f"[red]Step {step.model_label} {step.step_code.value} {step.status.lower()}")
-                        return
-                # check whether we are done
-                if job.progress.value >= job.progress.max:
-                    live.refresh()
-                    time.sleep(1)  # give the system a moment to update the status
-                    return
-            else:
-                if job.end_date or job.progress in (
-                    ProgressStatus.failed,
-                    ProgressStatus.canceled,
-                ):
-                    rich.print(f"Job {job.status.lower()}")
-                    return
+
+def job_wait(
+    get_progress: Callable[[], JobProgress],
+    interval: float,
+    progress_bar: bool = True,
+    stream_progress: Callable[[], Iterator[JobProgress]] | None = None,
+) -> None:
+    # ensure that interval is at least 1 sec
+    interval = max(interval, 1)
+    # retrieve current JobProgress
+    job = get_progress()
+    display = _JobProgressDisplay(job, interval, progress_bar)
+    try:
+        # loop until job has completed
+        display.start()
+        for job in _iter_job_progress(get_progress, interval, stream_progress):
+            if display.update(job):
+                if display.is_complete:
+                    time.sleep(JOB_COMPLETION_DELAY)
+                return
     except KeyboardInterrupt:
-        rich.print(f"[red]Step {step.model_label} {step.step_code.value} {step.status.lower()}")
+        display.interrupt()
         return
     finally:
-        if progress_bar:
-            live.stop()
+        display.stop()
+
+
+async def async_job_wait(
+    get_progress: Callable[[], Awaitable[JobProgress]],
+    interval: float,
+    progress_bar: bool = True,
+    stream_progress: Callable[[], AsyncIterator[JobProgress]] | None = None,
+) -> None:
+    # async counterpart of job_wait; progress bars of concurrently awaited jobs interfere with each other,
+    # so these are best disabled when fanning out
+    interval = max(interval, 1)
+    job = await get_progress()
+    display = _JobProgressDisplay(job, interval, progress_bar)
+    try:
+        display.start()
+        async for job in _aiter_job_progress(get_progress, interval, stream_progress):
+            if display.update(job):
+                if display.is_complete:
+                    await asyncio.sleep(JOB_COMPLETION_DELAY)
+                return
+    finally:
+        display.stop()
 
 
 def get_subject_table_names(generator: Generator) -> list[str]:
@@ -263,6 +372,67 @@ def get_subject_table_names(generator: Generator) -> list[str]:
 Seed = Union[pd.DataFrame, str, Path, list[dict[str, Any]]]
 
 
+def prepare_generator_config(
+    config: GeneratorConfig | dict, upload: Callable[[pd.DataFrame], str] | None = None
+) -> GeneratorConfig | dict:
+    # DataFrames are sent via `upload` as binary Parquet files, if provided, and otherwise embedded as base64
+    if isinstance(config, dict) and config.get("tables"):
+        for table in config["tables"]:
+            # convert `data` to base64-encoded Parquet files
+            if table.get("data") is not None:
+                if isinstance(table["data"], (str, Path)):
+                    name, df = read_table_from_path(table["data"])
+                    if "name" not in table:
+                        table["name"] = name
+                elif isinstance(table["data"], pd.DataFrame) or (
+                    table["data"].__class__.__name__ == "DataFrame"
+                    and table["data"].__class__.__module__.startswith("pyspark.sql")
+                ):
+                    df = table["data"]
+                else:
+                    raise ValueError("data must be a DataFrame or a file path")
+                if upload is not None:
+                    table["source_connector_id"] = upload(df)
+                    del table["data"]
+                else:
+                    table["data"] = convert_to_base64(df)
+                del df
+            if table.get("columns"):
+                # convert `columns` to list[dict], if provided as list[str]
+                table["columns"] = [{"name": col} if isinstance(col, str) else col for col in table["columns"]]
+    return config
+
+
+def harmonize_generator_config(
+    config: GeneratorConfig | dict | None = None,
+    data: pd.DataFrame | str | Path | None = None,
+    name: str | None = None,
+    upload: Callable[[pd.DataFrame], str] | None = None,
+) -> GeneratorConfig:
+    if data is None and config is None:
+        raise ValueError("Either config or data must be provided")
+    if data is not None and config is not None:
+        raise ValueError("Either config or data must be provided, but not both")
+    if config is not None and isinstance(config, (pd.DataFrame, str, Path)) is None:
+        # map config to data, in case user incorrectly provided data as first argument
+        data = config
+    if isinstance(data, (str, Path)):
+        name, df = read_table_from_path(data)
+        data = df
+        config = {"name": name}
+    elif isinstance(data, pd.DataFrame) or (
+        data.__class__.__name__ == "DataFrame" and data.__class__.__module__.startswith("pyspark.sql")
+    ):
+        config = {}
+    if data is not None:
+        config["tables"] = [{"data": data, "name": config.get("name", "data")}]
+    if isinstance(config, dict):
+        config = GeneratorConfig(**prepare_generator_config(config, upload))
+    if name is not None:
+        config.name = name
+    return config
+
+
 def harmonize_sd_config(
     generator: Generator | str | None = None,
     get_generator: Callable[[str], Generator] | None = None,
@@ -20,7 +20,7 @@ import rich
 from rich.prompt import Prompt
 
 from mostlyai import sdk
-from mostlyai.sdk.client.base import GET, _MostlyBaseClient, DEFAULT_BASE_URL
+from mostlyai.sdk.client.base import GET, _MostlyBaseClient, DEFAULT_BASE_URL, DEFAULT_MAX_CONNECTIONS
 from mostlyai.sdk.client.connectors import _MostlyConnectorsClient
 from mostlyai.sdk.client.generators import _MostlyGeneratorsClient
 from mostlyai.sdk.domain import (
@@ -31,7 +31,6 @@ from mostlyai.sdk.domain import (
     ModelType,
     ConnectorConfig,
     GeneratorConfig,
-    SourceTableConfig,
     SyntheticDatasetConfig,
     SyntheticProbeConfig,
     AboutService,
@@ -40,8 +39,8 @@ from mostlyai.sdk.client.synthetic_datasets import (
     _MostlySyntheticDatasetsClient,
     _MostlySyntheticProbesClient,
 )
-from mostlyai.sdk.client._base_utils import convert_to_base64, read_table_from_path
 from mostlyai.sdk.client._utils import (
+    harmonize_generator_config,
     harmonize_sd_config,
     Seed,
     check_local_mode_available,
@@ -62,6 +61,8 @@ class MostlyAI(_MostlyBaseClient):
         local_port (int | None): The port to use for local mode with TCP transport. If not provided, UDS transport is used.
         timeout (float): Timeout for HTTPS requests in seconds. Default is 60 seconds.
         ssl_verify (bool): Whether to verify SSL certificates. Default is True.
+        http2 (bool): Whether to use HTTP/2 in CLIENT mode. Requires the `h2` package, e.g. via `pip install httpx[http2]`. Default is False.
+        max_connections (int): Max number of HTTP connections, which are kept alive and re-used across requests. Default is 20.
         quiet (bool): Whether to suppress rich output. Default is False.
 
     Example for SDK in CLIENT mode with explicit arguments:
@@ -101,6 +102,13 @@ class MostlyAI(_MostlyBaseClient):
         mostly
         # MostlyAI(local=True, local_port=8080)
         ```
+
+    Example for releasing the HTTP connections once done:
+        ```python
+        from mostlyai.sdk import MostlyAI
+        with MostlyAI() as mostly:
+            mostly.me()
+        ```
     """
 
     def __init__(
@@ -112,6 +120,8 @@ class MostlyAI(_MostlyBaseClient):
         local_port: int | None = None,
         timeout: float = 60.0,
         ssl_verify: bool = True,
+        http2: bool = False,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
         quiet: bool = False,
     ):
         import warnings
@@ -188,7 +198,9 @@ class MostlyAI(_MostlyBaseClient):
             "timeout": timeout,
             "ssl_verify": ssl_verify,
         }
-        super().__init__(**client_kwargs)
+        super().__init__(**client_kwargs, http2=http2, max_connections=max_connections)
+        # all sub-clients share the connection pool of this instance
+        client_kwargs["http_client"] = self.http_client
         self.connectors = _MostlyConnectorsClient(**client_kwargs)
         self.generators = _MostlyGeneratorsClient(**client_kwargs)
         self.synthetic_datasets = _MostlySyntheticDatasetsClient(**client_kwargs)
@@ -233,6 +245,16 @@ class MostlyAI(_MostlyBaseClient):
             return f"MostlyAI(local=True, local_port={self.local_server.port})"
         return f"MostlyAI(base_url='{self.base_url}', api_key=***)"
 
+    def close(self) -> None:
+        """
+        Close the pooled HTTP connections, and stop the local server in LOCAL mode.
+
+        The instance can not be used for any further requests. Alternatively, use the instance as a context manager.
+        """
+        super().close()
+        if self.local:
+            self.local_server.stop()
+
     def connect(
         self,
         config: ConnectorConfig | dict[str, Any],
@@ -547,30 +569,9 @@ class MostlyAI(_MostlyBaseClient):
             }, start=True, wait=True)
             ```
         """
-        if data is None and config is None:
-            raise ValueError("Either config or data must be provided")
-        if data is not None and config is not None:
-            raise ValueError("Either config or data must be provided, but not both")
-        if config is not None and isinstance(config, (pd.DataFrame, str, Path)) is None:
-            # map config to data, in case user incorrectly provided data as first argument
-            data = config
-        if isinstance(data, (str, Path)):
-            name, df = read_table_from_path(data)
-            config = GeneratorConfig(
-                name=name,
-                tables=[SourceTableConfig(data=convert_to_base64(df), name=name)],
-            )
-        elif isinstance(data, pd.DataFrame) or (
-            data.__class__.__name__ == "DataFrame" and data.__class__.__module__.startswith("pyspark.sql")
-        ):
-            df = data
-            config = GeneratorConfig(
-                tables=[SourceTableConfig(data=convert_to_base64(df), name="data")],
-            )
-        if isinstance(config, dict):
-            config = GeneratorConfig(**config)
-        if name is not None:
-            config.name = name
+        # in LOCAL mode, training data is uploaded as binary Parquet files, rather than embedded as base64
+        upload = self.generators._upload_data if self.local else None
+        config = harmonize_generator_config(config=config, data=data, name=name, upload=upload)
         g = self.generators.create(config)
         if start:
             g.training.start()
@@ -0,0 +1,260 @@
+# Copyright 2024-2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from pathlib import Path
+from typing import Literal
+
+import pandas as pd
+import rich
+
+from mostlyai.sdk.client.api import MostlyAI
+from mostlyai.sdk.client.base import GET, DEFAULT_MAX_CONNECTIONS, _MostlyAsyncBaseClient
+from mostlyai.sdk.client.generators import _MostlyAsyncGeneratorsClient
+from mostlyai.sdk.client.synthetic_datasets import (
+    _MostlyAsyncSyntheticDatasetsClient,
+    _MostlyAsyncSyntheticProbesClient,
+)
+from mostlyai.sdk.client._utils import Seed, harmonize_generator_config, harmonize_sd_config
+from mostlyai.sdk.domain import (
+    AboutService,
+    CurrentUser,
+    Generator,
+    GeneratorConfig,
+    SyntheticDataset,
+    SyntheticDatasetConfig,
+    SyntheticProbeConfig,
+)
+
+
+class AsyncMostlyAI(_MostlyAsyncBaseClient):
+    """
+    Instantiate an async SDK instance, either in CLIENT or in LOCAL mode.
+
+    Its methods mirror those of `MostlyAI`, but are coroutines, so that many generators, synthetic datasets and
+    probes can be handled concurrently from a single event loop. The returned objects are bound to the sync
+    instance `sync`, so that their methods, e.g. `g.reload()`, can still be called as usual.
+
+    Args:
+        base_url (str | None): The base URL. If not provided, env var `MOSTLY_BASE_URL` is used if available, otherwise `https://app.mostly.ai`.
+        api_key (str | None): The API key for authenticating. If not provided, env var `MOSTLY_API_KEY` is used if available.
+        local (bool | None): Whether to run in local mode or not. If not provided, user is prompted to choose between CLIENT and LOCAL mode.
+        local_dir (str | Path | None): The directory to use for local mode. If not provided, `~/mostlyai` is used.
+        local_port (int | None): The port to use for local mode with TCP transport. If not provided, UDS transport is used.
+        timeout (float): Timeout for HTTPS requests in seconds. Default is 60 seconds.
+        ssl_verify (bool): Whether to verify SSL certificates. Default is True.
+        http2 (bool): Whether to use HTTP/2 in CLIENT mode. Requires the `h2` package, e.g. via `pip install httpx[http2]`. Default is False.
+        max_connections (int): Max number of HTTP connections, which are kept alive and re-used across requests. Default is 20.
+        quiet (bool): Whether to suppress rich output. Default is False.
+
+    Example for probing many generators concurrently:
+        ```python
+        import asyncio
+        from mostlyai.sdk import AsyncMostlyAI
+
+        async def main(generator_ids):
+            async with AsyncMostlyAI() as mostly:
+                return await asyncio.gather(*[mostly.probe(g, size=10) for g in generator_ids])
+
+        probes = asyncio.run(main(['INSERT_YOUR_GENERATOR_ID', 'INSERT_ANOTHER_GENERATOR_ID']))
+        ```
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        local: bool | None = None,
+        local_dir: str | Path | None = None,
+        local_port: int | None = None,
+        timeout: float = 60.0,
+        ssl_verify: bool = True,
+        http2: bool = False,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        quiet: bool = False,
+    ):
+        # the sync instance determines the SDK mode, and runs the local server in LOCAL mode
+        self.sync = MostlyAI(
+            base_url=base_url,
+            api_key=api_key,
+            local=local,
+            local_dir=local_dir,
+            local_port=local_port,
+            timeout=timeout,
+            ssl_verify=ssl_verify,
+            http2=http2,
+            quiet=quiet,
+        )
+        client_kwargs = {
+            "base_url": self.sync.base_url,
+            "api_key": self.sync.api_key,
+            "uds": self.sync.local_server.uds if self.sync.local else None,
+            "timeout": timeout,
+            "ssl_verify": ssl_verify,
+        }
+        super().__init__(**client_kwargs, http2=http2, max_connections=max_connections, sync_client=self.sync)
+        # all sub-clients share the connection pool of this instance
+        client_kwargs["http_client"] = self.http_client
+        self.generators = _MostlyAsyncGeneratorsClient(**client_kwargs, sync_client=self.sync.generators)
+        self.synthetic_datasets = _MostlyAsyncSyntheticDatasetsClient(
+            **client_kwargs, sync_client=self.sync.synthetic_datasets
+        )
+        self.synthetic_probes = _MostlyAsyncSyntheticProbesClient(
+            **client_kwargs, sync_client=self.sync.synthetic_probes
+        )
+
+    def __repr__(self) -> str:
+        return f"Async{self.sync!r}"
+
+    async def close(self) -> None:
+        """
+        Close the pooled HTTP connections, and stop the local server in LOCAL mode.
+
+        The instance can not be used for any further requests. Alternatively, use the instance as an async context
+        manager.
+        """
+        await super().close()
+        self.sync.close()
+
+    async def train(
+        self,
+        config: GeneratorConfig | dict | None = None,
+        data: pd.DataFrame | str | Path | None = None,
+        name: str | None = None,
+        start: bool = True,
+        wait: bool = True,
+        progress_bar: bool = True,
+    ) -> Generator:
+        """
+        Train a generator. See [`MostlyAI.train`](api_client.md#mostlyai.sdk.client.api.MostlyAI.train) for details.
+
+        Args:
+            config (GeneratorConfig | dict | None): The configuration parameters of the generator to be created. Either `config` or `data` must be provided.
+            data (pd.DataFrame | str | Path | None): A single pandas DataFrame, or a path to a CSV or PARQUET file. Either `config` or `data` must be provided.
+            name (str | None): Name of the generator.
+            start (bool): Whether to start training immediately. Default is True.
+            wait (bool): Whether to wait for training to finish. Default is True.
+            progress_bar (bool): Whether to display a progress bar during training. Disable it when training concurrently. Default is True.
+
+        Returns:
+            Generator: The created generator.
+        """
+        # reading and encoding, or uploading, the training data is blocking, thus keep it off the event loop
+        upload = self.sync.generators._upload_data if self.sync.local else None
+        config = await asyncio.to_thread(harmonize_generator_config, config=config, data=data, name=name, upload=upload)
+        g = await self.generators.create(config)
+        if start:
+            await self.generators._training_start(g.id)
+            rich.print("Started generator training")
+        if start and wait:
+            g = await self.generators._training_wait(g.id, progress_bar=progress_bar, interval=2)
+        return g
+
+    async def generate(
+        self,
+        generator: Generator | str,
+        config: SyntheticDatasetConfig | dict | None = None,
+        size: int | dict[str, int] | None = None,
+        seed: Seed | dict[str, Seed] | None = None,
+        name: str | None = None,
+        start: bool = True,
+        wait: bool = True,
+        progress_bar: bool = True,
+    ) -> SyntheticDataset:
+        """
+        Generate synthetic data. See [`MostlyAI.generate`](api_client.md#mostlyai.sdk.client.api.MostlyAI.generate) for details.
+
+        Args:
+            generator (Generator | str): The generator instance or its UUID.
+            config (SyntheticDatasetConfig | dict | None): Configuration for the synthetic dataset.
+            size (int | dict[str, int] | None): Sample size(s) for the subject table(s).
+            seed (Seed | dict[str, Seed] | None): Seed data for the subject table(s).
+            name (str | None): Name of the synthetic dataset.
+            start (bool): Whether to start generation immediately. Default is True.
+            wait (bool): Whether to wait for generation to finish. Default is True.
+            progress_bar (bool): Whether to display a progress bar during generation. Disable it when generating concurrently. Default is True.
+
+        Returns:
+            SyntheticDataset: The created synthetic dataset.
+        """
+        config = await asyncio.to_thread(
+            harmonize_sd_config,
+            generator,
+            get_generator=self.sync.generators.get,
+            size=size,
+            seed=seed,
+            config=config,
+            config_type=SyntheticDatasetConfig,
+            name=name,
+        )
+        sd = await self.synthetic_datasets.create(config)
+        if start:
+            await self.synthetic_datasets._generation_start(sd.id)
+            rich.print("Started synthetic dataset generation")
+        if start and wait:
+            sd = await self.synthetic_datasets._generation_wait(sd.id, progress_bar=progress_bar, interval=2)
+        return sd
+
+    async def probe(
+        self,
+        generator: Generator | str,
+        size: int | dict[str, int] | None = None,
+        seed: Seed | dict[str, Seed] | None = None,
+        config: SyntheticProbeConfig | dict | None = None,
+        return_type: Literal["auto", "dict"] = "auto",
+    ) -> pd.DataFrame | dict[str, pd.DataFrame]:
+        """
+        Probe a generator. See [`MostlyAI.probe`](api_client.md#mostlyai.sdk.client.api.MostlyAI.probe) for details.
+
+        Args:
+            generator (Generator | str): The generator instance or its UUID.
+            size (int | dict[str, int] | None): Sample size(s) for the subject table(s). Default is 1, if no seed is provided.
+            seed (Seed | dict[str, Seed] | None): Seed data for the subject table(s).
+            config (SyntheticProbeConfig | dict | None): Configuration for the probe.
+            return_type (Literal["auto", "dict"]): Format of the return value. "auto" for pandas DataFrame if a single table, otherwise a dictionary. Default is "auto".
+
+        Returns:
+            pd.DataFrame | dict[str, pd.DataFrame]: The created synthetic probe.
+        """
+        config = await asyncio.to_thread(
+            harmonize_sd_config,
+            generator,
+            get_generator=self.sync.generators.get,
+            size=size,
+            seed=seed,
+            config=config,
+            config_type=SyntheticProbeConfig,
+        )
+        dfs = await self.synthetic_probes.create(config)
+        if return_type == "auto" and len(dfs) == 1:
+            return list(dfs.values())[0]
+        return dfs
+
+    async def me(self) -> CurrentUser:
+        """
+        Retrieve information about the current user.
+
+        Returns:
+            CurrentUser: Information about the current user.
+        """
+        return await self.request(verb=GET, path=["users", "me"], response_type=CurrentUser)
+
+    async def about(self) -> AboutService:
+        """
+        Retrieve information about the platform.
+
+        Returns:
+            AboutService: Information about the platform.
+        """
+        return await self.request(verb=GET, path=["about"], response_type=AboutService)
@@ -17,6 +17,10 @@ import os
 import sys
 import warnings
 import webbrowser
+from collections import deque
+from collections.abc import AsyncGenerator, Generator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from typing import (
     Annotated,
     Any,
@@ -47,6 +51,14 @@ HttpVerb = Literal[GET, POST, PATCH, DELETE]
 
 DEFAULT_BASE_URL = "https://app.mostly.ai"
 MAX_REQUEST_SIZE = 250_000_000
+# max number of pooled connections of the HTTP client, which is shared by all sub-clients of an SDK instance
+DEFAULT_MAX_CONNECTIONS = 20
+# seconds for which idle connections are kept open for re-use, e.g. across the polls of `job_wait`
+KEEPALIVE_EXPIRY = 30.0
+# number of objects, which `Paginator` fetches per request
+DEFAULT_PAGE_SIZE = 50
+# max number of pages, which `Paginator` fetches ahead of the caller; stays well below the connection pool size
+DEFAULT_PREFETCH_PAGES = 4
 
 T = TypeVar("T")
 
@@ -66,13 +78,41 @@ class _MostlyBaseClient:
         uds: str | None = None,
         timeout: float = 60.0,
         ssl_verify: bool = True,
+        http2: bool = False,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        http_client: httpx.Client | None = None,
     ):
         self.base_url = (base_url or os.getenv("MOSTLY_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
         self.api_key = api_key or os.getenv("MOSTLY_API_KEY")
         self.local = self.api_key == "local"
-        self.transport = httpx.HTTPTransport(uds=uds) if uds else None
         self.timeout = timeout
         self.ssl_verify = ssl_verify
+        # connections are kept alive and re-used across requests; pass `http_client` to share its pool
+        self.http_client = http_client or self._create_http_client(uds, http2, max_connections)
+
+    def _create_http_client(self, uds: str | None, http2: bool, max_connections: int) -> httpx.Client:
+        limits = _http_limits(max_connections)
+        # HTTP/2 is only negotiated via TLS, and thus not applicable to the UDS transport of LOCAL mode
+        transport = httpx.HTTPTransport(uds=uds, limits=limits) if uds else None
+        return httpx.Client(
+            timeout=self.timeout,
+            verify=self.ssl_verify,
+            http2=http2 and transport is None,
+            limits=limits,
+            transport=transport,
+        )
+
+    def close(self) -> None:
+        """
+        Close the pooled connections of the HTTP client. The client can not be used for any further requests.
+        """
+        self.http_client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def headers(self):
         return {
@@ -115,6 +155,72 @@ class _MostlyBaseClient:
             APIStatusError: For HTTP errors (non-2XX responses).
             APIError: For network issues or request errors.
         """
+        full_url, kwargs = self._prepare_request(path, is_api_call, do_json_camel_case, **kwargs)
+
+        try:
+            response = self.http_client.request(method=verb, url=full_url, **kwargs)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            raise self._map_status_error(exc) from None
+        except httpx.RequestError as exc:
+            # Handle request errors (e.g., network issues)
+            raise APIError(f"An error occurred while requesting {exc.request.url!r}.") from None
+
+        return self._process_response(
+            response,
+            response_type=response_type,
+            raw_response=raw_response,
+            do_response_dict_snake_case=do_response_dict_snake_case,
+            do_include_client=do_include_client,
+            extra_key_values=extra_key_values,
+        )
+
+    @contextmanager
+    def stream_request(
+        self,
+        path: str | list[Any],
+        verb: HttpVerb,
+        is_api_call: bool = True,
+        do_json_camel_case: bool = True,
+        raise_for_status: bool = True,
+        **kwargs,
+    ) -> Generator[httpx.Response, None, None]:
+        """
+        Send an HTTP request, and provide the response without reading its body, so that it can be consumed
+        incrementally, e.g. via `response.iter_bytes()`.
+
+        Args:
+            path (str | list[Any]): A single string or a list of parts of the path to concatenate.
+            verb (HttpVerb): HTTP method (GET, POST, PATCH, DELETE).
+            is_api_call (bool): If False, skips prefixing API_SECTION and SECTION. Defaults to True.
+            do_json_camel_case (bool): Convert the provided JSON to camelCase. Defaults to True.
+            raise_for_status (bool): If False, non-2XX responses are provided as well. Defaults to True.
+            **kwargs: Additional arguments passed to the HTTP request.
+
+        Yields:
+            The streamed response.
+
+        Raises:
+            APIStatusError: For HTTP errors (non-2XX responses), if raise_for_status is True.
+            APIError: For network issues or request errors.
+        """
+        full_url, kwargs = self._prepare_request(path, is_api_call, do_json_camel_case, **kwargs)
+
+        try:
+            with self.http_client.stream(method=verb, url=full_url, **kwargs) as response:
+                if response.is_error and raise_for_status:
+                    response.read()
+                    response.raise_for_status()
+                yield response
+        except httpx.HTTPStatusError as exc:
+            raise self._map_status_error(exc) from None
+        except httpx.RequestError as exc:
+            # Handle request errors (e.g., network issues)
+            raise APIError(f"An error occurred while requesting {exc.request.url!r}.") from None
+
+    def _prepare_request(
+        self, path: str | list[Any], is_api_call: bool, do_json_camel_case: bool, **kwargs
+    ) -> tuple[str, dict]:
         path_list = [path] if isinstance(path, str) else [str(p) for p in path]
         prefix = self.API_SECTION + self.SECTION if is_api_call else []
         full_path = [self.base_url] + prefix + path_list
@@ -133,37 +239,25 @@ class _MostlyBaseClient:
             if isinstance(kwargs["params"], BaseModel):
                 kwargs["params"] = kwargs["params"].model_dump()
             kwargs["params"] = map_snake_to_camel_case(kwargs["params"])
+        return full_url, kwargs
 
-        try:
-            with httpx.Client(timeout=self.timeout, verify=self.ssl_verify, transport=self.transport) as client:
-                response = client.request(method=verb, url=full_url, **kwargs)
-            response.raise_for_status()
-        except httpx.HTTPStatusError as exc:
-            try:
-                json = exc.response.json()
-                if "message" in json:
-                    error_msg = json["message"]
-                elif "detail" in json:
-                    error_msg = json["detail"]
-                else:
-                    error_msg = "An error occurred."
-            except Exception:
-                error_msg = exc.response.content
-            # Handle HTTP errors (not in 2XX range)
-            raise APIStatusError(f"HTTP {exc.response.status_code}: {error_msg}") from None
-        except httpx.RequestError as exc:
-            # Handle request errors (e.g., network issues)
-            raise APIError(f"An error occurred while requesting {exc.request.url!r}.") from None
-
+    def _process_response(
+        self,
+        response: httpx.Response,
+        response_type: type,
+        raw_response: bool,
+        do_response_dict_snake_case: bool,
+        do_include_client: bool,
+        extra_key_values: dict | None,
+    ) -> Any:
         if raw_response:
             return response
 
         if response.content:
-            # this section could be split into a separate method
             response_json = response.json()
             if isinstance(response_json, dict) and response_type is not dict:
                 if do_include_client:
-                    response_json["client"] = self
+                    response_json["client"] = self.object_client
                 if isinstance(extra_key_values, dict):
                     response_json["extra_key_values"] = extra_key_values
             elif response_type is dict and do_response_dict_snake_case:
@@ -172,46 +266,220 @@ class _MostlyBaseClient:
         else:
             return None
 
+    @property
+    def object_client(self) -> "_MostlyBaseClient":
+        # the client that is attached to the returned objects, to be used by their methods
+        return self
+
+    @staticmethod
+    def _map_status_error(exc: httpx.HTTPStatusError) -> APIStatusError:
+        try:
+            json = exc.response.json()
+            if "message" in json:
+                error_msg = json["message"]
+            elif "detail" in json:
+                error_msg = json["detail"]
+            else:
+                error_msg = "An error occurred."
+        except Exception:
+            error_msg = exc.response.content
+        # Handle HTTP errors (not in 2XX range)
+        return APIStatusError(f"HTTP {exc.response.status_code}: {error_msg}")
+
+
+class _MostlyAsyncBaseClient(_MostlyBaseClient):
+    """
+    Async counterpart of the base client, which sends requests via a pooled `httpx.AsyncClient`.
+
+    Objects returned by its subclasses are attached to `sync_client`, if provided, so that their methods, e.g.
+    `reload()`, remain usable outside of an event loop.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        uds: str | None = None,
+        timeout: float = 60.0,
+        ssl_verify: bool = True,
+        http2: bool = False,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        http_client: httpx.AsyncClient | None = None,
+        sync_client: _MostlyBaseClient | None = None,
+    ):
+        super().__init__(
+            base_url=base_url,
+            api_key=api_key,
+            uds=uds,
+            timeout=timeout,
+            ssl_verify=ssl_verify,
+            http2=http2,
+            max_connections=max_connections,
+            http_client=http_client,
+        )
+        self.sync_client = sync_client
+
+    def _create_http_client(self, uds: str | None, http2: bool, max_connections: int) -> httpx.AsyncClient:
+        limits = _http_limits(max_connections)
+        transport = httpx.AsyncHTTPTransport(uds=uds, limits=limits) if uds else None
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            verify=self.ssl_verify,
+            http2=http2 and transport is None,
+            limits=limits,
+            transport=transport,
+        )
+
+    @property
+    def object_client(self) -> _MostlyBaseClient:
+        return self.sync_client or self
+
+    async def close(self) -> None:
+        """
+        Close the pooled connections of the HTTP client. The client can not be used for any further requests.
+        """
+        await self.http_client.aclose()
+
+    def __enter__(self):
+        raise TypeError("Use `async with` instead")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def request(
+        self,
+        path: str | list[Any],
+        verb: HttpVerb,
+        response_type: type = dict,
+        raw_response: bool = False,
+        is_api_call: bool = True,
+        do_json_camel_case: bool = True,
+        do_response_dict_snake_case: bool = True,
+        do_include_client: bool = True,
+        extra_key_values: dict | None = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Send an HTTP request and process the response. See `_MostlyBaseClient.request` for the arguments.
+        """
+        full_url, kwargs = self._prepare_request(path, is_api_call, do_json_camel_case, **kwargs)
+
+        try:
+            response = await self.http_client.request(method=verb, url=full_url, **kwargs)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            raise self._map_status_error(exc) from None
+        except httpx.RequestError as exc:
+            # Handle request errors (e.g., network issues)
+            raise APIError(f"An error occurred while requesting {exc.request.url!r}.") from None
+
+        return self._process_response(
+            response,
+            response_type=response_type,
+            raw_response=raw_response,
+            do_response_dict_snake_case=do_response_dict_snake_case,
+            do_include_client=do_include_client,
+            extra_key_values=extra_key_values,
+        )
+
+    @asynccontextmanager
+    async def stream_request(
+        self,
+        path: str | list[Any],
+        verb: HttpVerb,
+        is_api_call: bool = True,
+        do_json_camel_case: bool = True,
+        raise_for_status: bool = True,
+        **kwargs,
+    ) -> AsyncGenerator[httpx.Response, None]:
+        """
+        Send an HTTP request, and provide the response without reading its body, so that it can be consumed
+        incrementally, e.g. via `response.aiter_bytes()`. See `_MostlyBaseClient.stream_request` for the arguments.
+        """
+        full_url, kwargs = self._prepare_request(path, is_api_call, do_json_camel_case, **kwargs)
+
+        try:
+            async with self.http_client.stream(method=verb, url=full_url, **kwargs) as response:
+                if response.is_error and raise_for_status:
+                    await response.aread()
+                    response.raise_for_status()
+                yield response
+        except httpx.HTTPStatusError as exc:
+            raise self._map_status_error(exc) from None
+        except httpx.RequestError as exc:
+            # Handle request errors (e.g., network issues)
+            raise APIError(f"An error occurred while requesting {exc.request.url!r}.") from None
+
+
+def _http_limits(max_connections: int) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
 
 class Paginator(Generic[T]):
-    def __init__(self, client: _MostlyBaseClient, response_class: T, **kwargs):
+    def __init__(
+        self,
+        client: _MostlyBaseClient,
+        response_class: T,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch_pages: int = DEFAULT_PREFETCH_PAGES,
+        **kwargs,
+    ):
         """
         Generic paginator for listing objects with pagination.
 
+        While the caller consumes a page, the next pages are fetched in the background. Once the total count of
+        objects is known, these pages are fetched concurrently, otherwise one at a time.
+
         Args:
             client (_MostlyBaseClient): The client instance to use for the requests.
             response_class (type[T]): Class of the objects to be listed.
+            page_size (int): Number of objects to fetch per request. Default is 50.
+            prefetch_pages (int): Max number of pages to fetch ahead of the caller. Set to 0 to fetch pages on demand only. Default is 4.
             **kwargs (dict): Additional filter parameters including 'offset' and 'limit'.
         """
         self.client = client
         self.response_class = response_class
         self.offset = max(0, kwargs.pop("offset", 0))
         self.limit = kwargs.pop("limit", None)
-        self.page_limit = min(self.limit, 50) if self.limit is not None else 50
+        self.page_limit = min(self.limit, page_size) if self.limit is not None else page_size
+        self.next_offset = self.offset
+        self.prefetch_pages = max(0, prefetch_pages)
         self.params = map_snake_to_camel_case(kwargs)
         self.page_items = []
         self.index_in_page = 0
         self.index = 0
         self.is_last_page = False
+        self.total_count = None
+        # offsets and futures of the pages fetched ahead of the caller, in the order of their offsets
+        self._pending_pages: deque[tuple[int, Future]] = deque()
+        self._executor: ThreadPoolExecutor | None = None
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        # Any cleanup if necessary
-        pass
+        self.close()
 
     def __iter__(self):
         return self
 
     def __next__(self) -> T:
         if self.limit is not None and self.index >= self.limit:
+            self.close()
             raise StopIteration
 
         if self.index_in_page >= len(self.page_items):
             self._fetch_page()
             self.index_in_page = 0
             if not self.page_items:
+                self.close()
                 raise StopIteration
 
         item = self.page_items[self.index_in_page]
@@ -219,20 +487,71 @@ class Paginator(Generic[T]):
         self.index += 1
         return self.response_class(**item, client=self.client)
 
-    def _fetch_page(self):
+    def close(self) -> None:
+        """
+        Cancel any pages, which are still being fetched in the background.
+        """
+        self._cancel_pending_pages()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _cancel_pending_pages(self) -> None:
+        for _, future in self._pending_pages:
+            future.cancel()
+        self._pending_pages.clear()
+
+    def _end_offset(self) -> int | None:
+        end_offsets = [self.total_count] if self.total_count is not None else []
+        if self.limit is not None:
+            end_offsets.append(self.offset + self.limit)
+        return min(end_offsets) if end_offsets else None
+
+    def _has_next_page(self) -> bool:
         if self.is_last_page:
+            return False
+        end_offset = self._end_offset()
+        return end_offset is None or self.next_offset < end_offset
+
+    def _request_page(self, offset: int) -> dict:
+        page_params = self.params | {"offset": offset, "limit": self.page_limit}
+        return self.client.request(verb=GET, path=[], params=page_params)
+
+    def _fetch_page(self):
+        if self._pending_pages:
+            offset, future = self._pending_pages.popleft()
+            response = future.result()
+        elif self._has_next_page():
+            offset = self.next_offset
+            response = self._request_page(offset)
+            self.next_offset += self.page_limit
+        else:
             self.page_items = []
             return
 
-        page_params = self.params | {"offset": self.offset, "limit": self.page_limit}
-        response = self.client.request(verb=GET, path=[], params=page_params)
-
         self.page_items = response.get("results", [])
-        total_count = response.get("total_count", 0)
-        self.offset += len(self.page_items)
-
-        if self.offset >= total_count:
-            self.is_last_page = True
+        self.total_count = response.get("total_count")
+        if len(self.page_items) < self.page_limit:
+            end_offset = self._end_offset()
+            if self.total_count is None or not self.page_items:
+                # without a total count, a partial page marks the end
+                self.is_last_page = True
+            elif offset + len(self.page_items) < end_offset:
+                # the server caps the page size; continue with its page size right after this page, and re-request
+                # the pages, which have been fetched ahead with the larger page size
+                self._cancel_pending_pages()
+                self.page_limit = len(self.page_items)
+                self.next_offset = offset + len(self.page_items)
+        self._prefetch_pages()
+
+    def _prefetch_pages(self):
+        # offsets of all remaining pages are only known to exist once the total count is known
+        max_pending_pages = self.prefetch_pages if self.total_count is not None else min(self.prefetch_pages, 1)
+        while len(self._pending_pages) < max_pending_pages and self._has_next_page():
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.prefetch_pages, thread_name_prefix="paginator")
+            self._pending_pages.append((self.next_offset, self._executor.submit(self._request_page, self.next_offset)))
+            self.next_offset += self.page_limit
 
 
 class CustomBaseModel(BaseModel):
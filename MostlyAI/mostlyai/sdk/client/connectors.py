@@ -18,9 +18,11 @@ import io
 from typing import Any
 from collections.abc import Iterator
 
+import httpx
 import rich
 import pandas as pd
 
+from mostlyai.sdk.client._base_utils import ARROW_STREAM_MEDIA_TYPE, decode_arrow_stream
 from mostlyai.sdk.client.base import (
     DELETE,
     GET,
@@ -174,19 +176,16 @@ class _MostlyConnectorsClient(_MostlyBaseClient):
     def _read_data(
         self, connector_id: str, location: str, limit: int | None = None, shuffle: bool = False
     ) -> pd.DataFrame:
-        response = self.request(
+        with self.stream_request(
             verb=POST,
             path=[connector_id, "read-data"],
             json={"location": location, "limit": limit, "shuffle": shuffle},
             headers={
                 "Content-Type": "application/json",
-                "Accept": "application/octet-stream, application/json",
+                "Accept": f"{ARROW_STREAM_MEDIA_TYPE}, application/octet-stream, application/json",
             },
-            raw_response=True,
-        )
-        content_bytes = response.content
-        df = pd.read_parquet(io.BytesIO(content_bytes))
-        return df
+        ) as response:
+            return _read_data_response(response)
 
     def _write_data(
         self, connector_id: str, data: pd.DataFrame | None, location: str, if_exists: IfExists = IfExists.fail
@@ -224,16 +223,20 @@ class _MostlyConnectorsClient(_MostlyBaseClient):
         )
 
     def _query(self, connector_id: str, sql: str) -> pd.DataFrame:
-        response = self.request(
+        with self.stream_request(
             verb=POST,
             path=[connector_id, "query"],
             json={"sql": sql},
             headers={
                 "Content-Type": "application/json",
-                "Accept": "application/octet-stream, application/json",
+                "Accept": f"{ARROW_STREAM_MEDIA_TYPE}, application/octet-stream, application/json",
             },
-            raw_response=True,
-        )
-        content_bytes = response.content
-        df = pd.read_parquet(io.BytesIO(content_bytes))
-        return df
+        ) as response:
+            return _read_data_response(response)
+
+
+def _read_data_response(response: httpx.Response) -> pd.DataFrame:
+    # decode Arrow IPC streams while these are being received; fall back to Parquet for servers not supporting these
+    if response.headers.get("content-type", "").startswith(ARROW_STREAM_MEDIA_TYPE):
+        return decode_arrow_stream(response.iter_bytes())
+    return pd.read_parquet(io.BytesIO(response.read()))
@@ -12,9 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import json
 from pathlib import Path
 from typing import Any
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 import re
 import requests
 from urllib.parse import urlparse
@@ -30,6 +32,7 @@ from mostlyai.sdk.client.base import (
     PATCH,
     POST,
     Paginator,
+    _MostlyAsyncBaseClient,
     _MostlyBaseClient,
 )
 from mostlyai.sdk.domain import (
@@ -40,8 +43,21 @@ from mostlyai.sdk.domain import (
     GeneratorPatchConfig,
     ModelType,
 )
-from mostlyai.sdk.client._base_utils import convert_to_base64, read_table_from_path
-from mostlyai.sdk.client._utils import job_wait
+from mostlyai.sdk.client._base_utils import (
+    PARQUET_MEDIA_TYPE,
+    aiter_sse_data,
+    iter_sse_data,
+    write_parquet_file,
+)
+from mostlyai.sdk.client._utils import async_job_wait, job_wait, prepare_generator_config
+
+
+def _print_created_generator(client: _MostlyBaseClient, generator: Generator) -> None:
+    gid = generator.id
+    if client.local:
+        rich.print(f"Created generator [dodger_blue2]{gid}[/]")
+    else:
+        rich.print(f"Created generator [link={client.base_url}/d/generators/{gid} dodger_blue2 underline]{gid}[/]")
 
 
 class _MostlyGeneratorsClient(_MostlyBaseClient):
@@ -158,32 +174,9 @@ class _MostlyGeneratorsClient(_MostlyBaseClient):
             # status: DONE
             ```
         """
-        if isinstance(config, dict) and config.get("tables"):
-            for table in config["tables"]:
-                # convert `data` to base64-encoded Parquet files
-                if table.get("data") is not None:
-                    if isinstance(table["data"], (str, Path)):
-                        name, df = read_table_from_path(table["data"])
-                        table["data"] = convert_to_base64(df)
-                        if "name" not in table:
-                            table["name"] = name
-                        del df
-                    elif isinstance(table["data"], pd.DataFrame) or (
-                        table["data"].__class__.__name__ == "DataFrame"
-                        and table["data"].__class__.__module__.startswith("pyspark.sql")
-                    ):
-                        table["data"] = convert_to_base64(table["data"])
-                    else:
-                        raise ValueError("data must be a DataFrame or a file path")
-                if table.get("columns"):
-                    # convert `columns` to list[dict], if provided as list[str]
-                    table["columns"] = [{"name": col} if isinstance(col, str) else col for col in table["columns"]]
+        config = prepare_generator_config(config, upload=self._upload_data if self.local else None)
         generator = self.request(verb=POST, path=[], json=config, response_type=Generator)
-        gid = generator.id
-        if self.local:
-            rich.print(f"Created generator [dodger_blue2]{gid}[/]")
-        else:
-            rich.print(f"Created generator [link={self.base_url}/d/generators/{gid} dodger_blue2 underline]{gid}[/]")
+        _print_created_generator(self, generator)
         return generator
 
     def import_from_file(
@@ -321,6 +314,22 @@ class _MostlyGeneratorsClient(_MostlyBaseClient):
         )
         return response.text
 
+    def _upload_data(self, df: pd.DataFrame) -> str:
+        # upload a DataFrame as a binary Parquet file, which is streamed from disk rather than embedded as base64
+        # into the JSON payload; returns the ID of the resulting FILE_UPLOAD connector
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "data.parquet"
+            write_parquet_file(df, path)
+            with open(path, "rb") as f:
+                connector = self.request(
+                    verb=POST,
+                    path=[*self.API_SECTION, "connectors", "file-upload"],
+                    is_api_call=False,
+                    content=f,
+                    headers={"Content-Type": PARQUET_MEDIA_TYPE},
+                )
+        return connector["id"]
+
     def _training_start(self, generator_id: str) -> None:
         self.request(verb=POST, path=[generator_id, "training", "start"])
 
@@ -331,8 +340,25 @@ class _MostlyGeneratorsClient(_MostlyBaseClient):
         response = self.request(verb=GET, path=[generator_id, "training"], response_type=JobProgress)
         return response
 
+    def _training_progress_stream(self, generator_id: str) -> Iterator[JobProgress]:
+        # yields nothing, if the server does not support progress streams
+        with self.stream_request(
+            verb=GET,
+            path=[generator_id, "training", "stream"],
+            headers={"Accept": "text/event-stream"},
+            raise_for_status=False,
+        ) as response:
+            if response.is_success:
+                for data in iter_sse_data(response.iter_lines()):
+                    yield JobProgress(**json.loads(data))
+
     def _training_wait(self, generator_id: str, progress_bar: bool, interval: float) -> Generator:
-        job_wait(lambda: self._training_progress(generator_id), interval, progress_bar)
+        job_wait(
+            lambda: self._training_progress(generator_id),
+            interval,
+            progress_bar,
+            stream_progress=lambda: self._training_progress_stream(generator_id),
+        )
         generator = self.get(generator_id)
         return generator
 
@@ -352,3 +378,72 @@ class _MostlyGeneratorsClient(_MostlyBaseClient):
         content_bytes = response.content
         filename = f"generator-{generator_id[:8]}-logs.zip"
         return content_bytes, filename
+
+
+class _MostlyAsyncGeneratorsClient(_MostlyAsyncBaseClient):
+    """
+    Async counterpart of the generators client, covering the retrieval, creation and training of generators.
+    """
+
+    SECTION = ["generators"]
+
+    async def get(self, generator_id: str) -> Generator:
+        """
+        Retrieve a generator by its ID.
+
+        Args:
+            generator_id: The unique identifier of the generator.
+
+        Returns:
+            Generator: The retrieved generator object.
+        """
+        if not isinstance(generator_id, str) or len(generator_id) != 36:
+            raise ValueError("The provided generator_id must be a UUID string")
+        return await self.request(verb=GET, path=[generator_id], response_type=Generator)
+
+    async def create(self, config: GeneratorConfig | dict) -> Generator:
+        """
+        Create a generator. The generator will be in the NEW state and will need to be trained before it can be used.
+
+        Args:
+            config: Configuration for the generator.
+
+        Returns:
+            The created generator object.
+        """
+        # encoding and uploading the training data is blocking, thus keep it off the event loop
+        upload = self.sync_client._upload_data if self.local and self.sync_client is not None else None
+        config = await asyncio.to_thread(prepare_generator_config, config, upload)
+        generator = await self.request(verb=POST, path=[], json=config, response_type=Generator)
+        _print_created_generator(self, generator)
+        return generator
+
+    async def _training_start(self, generator_id: str) -> None:
+        await self.request(verb=POST, path=[generator_id, "training", "start"])
+
+    async def _training_cancel(self, generator_id: str) -> None:
+        await self.request(verb=POST, path=[generator_id, "training", "cancel"])
+
+    async def _training_progress(self, generator_id: str) -> JobProgress:
+        return await self.request(verb=GET, path=[generator_id, "training"], response_type=JobProgress)
+
+    async def _training_progress_stream(self, generator_id: str) -> AsyncIterator[JobProgress]:
+        # yields nothing, if the server does not support progress streams
+        async with self.stream_request(
+            verb=GET,
+            path=[generator_id, "training", "stream"],
+            headers={"Accept": "text/event-stream"},
+            raise_for_status=False,
+        ) as response:
+            if response.is_success:
+                async for data in aiter_sse_data(response.aiter_lines()):
+                    yield JobProgress(**json.loads(data))
+
+    async def _training_wait(self, generator_id: str, progress_bar: bool, interval: float) -> Generator:
+        await async_job_wait(
+            lambda: self._training_progress(generator_id),
+            interval,
+            progress_bar,
+            stream_progress=lambda: self._training_progress_stream(generator_id),
+        )
+        return await self.get(generator_id)
@@ -12,13 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import io
+import json
+import os
 import re
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
 import zipfile
-from typing import Any
-from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Literal
+from collections.abc import AsyncIterator, Iterator
 
+import httpx
 import pandas as pd
+import pyarrow.dataset as ds
 import rich
 
 from mostlyai.sdk.client.base import (
@@ -27,6 +38,7 @@ from mostlyai.sdk.client.base import (
     PATCH,
     POST,
     Paginator,
+    _MostlyAsyncBaseClient,
     _MostlyBaseClient,
 )
 from mostlyai.sdk.domain import (
@@ -40,7 +52,131 @@ from mostlyai.sdk.domain import (
     SyntheticDatasetReportType,
     ModelType,
 )
-from mostlyai.sdk.client._utils import job_wait
+from mostlyai.sdk.client._base_utils import aiter_sse_data, iter_sse_data
+from mostlyai.sdk.client._utils import async_job_wait, job_wait
+
+
+# directory in which synthetic datasets are cached, when these are loaded lazily
+DEFAULT_CACHE_DIR = Path(os.getenv("MOSTLY_CACHE_DIR") or Path.home() / ".cache" / "mostlyai")
+# size of the chunks in which archives are streamed to the cache
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# file within a cached synthetic dataset, which holds the ETag of the downloaded archive
+_CACHE_ETAG_FILE = ".etag"
+# file within the cache dir of a synthetic dataset, which holds the name of its current version
+_CACHE_CURRENT_FILE = "current"
+# prefix of the versions within the cache dir of a synthetic dataset
+_CACHE_VERSION_PREFIX = "v-"
+# datasets, which have been opened per cached version, so that versions in use are not pruned
+_CACHE_VERSIONS_IN_USE: dict[Path, weakref.WeakSet] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _print_created_synthetic_dataset(client: _MostlyBaseClient, synthetic_dataset: SyntheticDataset) -> None:
+    sid = synthetic_dataset.id
+    gid = synthetic_dataset.generator_id
+    if client.local:
+        rich.print(f"Created synthetic dataset [dodger_blue2]{sid}[/] with generator [dodger_blue2]{gid}[/]")
+    else:
+        rich.print(
+            f"Created synthetic dataset [link={client.base_url}/d/synthetic-datasets/{sid} dodger_blue2 underline]{sid}[/] with generator [link={client.base_url}/d/generators/{gid} dodger_blue2 underline]{gid}[/]"
+        )
+
+
+def _download_request_kwargs(ds_format: SyntheticDatasetFormat | str, short_lived_file_token: str | None) -> dict:
+    return {
+        "params": {
+            "format": ds_format.upper() if isinstance(ds_format, str) else ds_format.value,
+            "slft": short_lived_file_token,
+        },
+        "headers": {
+            "Content-Type": "application/zip",
+            "Accept": "application/json, text/plain, */*",
+        },
+    }
+
+
+def _download_filename(response: httpx.Response, synthetic_dataset_id: str) -> str:
+    # Check if 'Content-Disposition' header is present
+    if "Content-Disposition" in response.headers:
+        content_disposition = response.headers["Content-Disposition"]
+        return re.findall("filename=(.+)", content_disposition)[0]
+    return f"synthetic-dataset-{synthetic_dataset_id[:8]}.zip"
+
+
+def _read_parquet_zip(pqt_zip_bytes: bytes) -> dict[str, pd.DataFrame]:
+    # read each parquet file into a pandas dataframe
+    with zipfile.ZipFile(io.BytesIO(pqt_zip_bytes), "r") as z:
+        dir_list = {name.split("/")[0] for name in z.namelist()}
+        dfs = {}
+        for table in dir_list:
+            pqt_files = [name for name in z.namelist() if name.startswith(f"{table}/") and name.endswith(".parquet")]
+            dfs[table] = pd.concat([pd.read_parquet(z.open(name)) for name in pqt_files], axis=0)
+            dfs[table].name = table
+    return dfs
+
+
+def _cached_dataset_dir(cache_dir: str | Path | None, synthetic_dataset_id: str) -> Path:
+    dataset_dir = Path(cache_dir or DEFAULT_CACHE_DIR) / "synthetic-datasets" / synthetic_dataset_id
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+    return dataset_dir
+
+
+def _current_cache_version(dataset_dir: Path) -> Path | None:
+    try:
+        return dataset_dir / (dataset_dir / _CACHE_CURRENT_FILE).read_text()
+    except OSError:
+        return None
+
+
+def _cached_etag(dataset_dir: Path) -> str | None:
+    version_dir = _current_cache_version(dataset_dir)
+    try:
+        return (version_dir / _CACHE_ETAG_FILE).read_text() if version_dir else None
+    except OSError:
+        return None
+
+
+def _prune_cache_versions(dataset_dir: Path) -> None:
+    # remove superseded versions, unless datasets of these are still referenced within this process
+    current_dir = _current_cache_version(dataset_dir)
+    for version_dir in dataset_dir.glob(f"{_CACHE_VERSION_PREFIX}*"):
+        if version_dir != current_dir and not _CACHE_VERSIONS_IN_USE.get(version_dir):
+            shutil.rmtree(version_dir, ignore_errors=True)
+            _CACHE_VERSIONS_IN_USE.pop(version_dir, None)
+
+
+def _extract_to_cache(zip_path: Path, dataset_dir: Path, etag: str | None) -> None:
+    # extract into a new version, so that readers never see a partially extracted dataset, and so that
+    # datasets, which have been opened from a previous version, remain readable
+    tmp_dir = Path(tempfile.mkdtemp(dir=dataset_dir, prefix=".tmp-"))
+    try:
+        with zipfile.ZipFile(zip_path) as z:
+            z.extractall(tmp_dir)
+        if etag:
+            (tmp_dir / _CACHE_ETAG_FILE).write_text(etag)
+        with _CACHE_LOCK:
+            version_dir = dataset_dir / f"{_CACHE_VERSION_PREFIX}{uuid.uuid4().hex}"
+            os.replace(tmp_dir, version_dir)
+            # switch to the new version atomically, so that there is no moment without a valid cache
+            current_file = dataset_dir / f".tmp-{_CACHE_CURRENT_FILE}-{uuid.uuid4().hex}"
+            current_file.write_text(version_dir.name)
+            os.replace(current_file, dataset_dir / _CACHE_CURRENT_FILE)
+            _prune_cache_versions(dataset_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def _open_cached_datasets(dataset_dir: Path) -> dict[str, ds.Dataset]:
+    with _CACHE_LOCK:
+        version_dir = _current_cache_version(dataset_dir)
+        datasets = {
+            table_dir.name: ds.dataset([str(path) for path in sorted(table_dir.rglob("*.parquet"))], format="parquet")
+            for table_dir in sorted(version_dir.iterdir())
+            if table_dir.is_dir()
+        }
+        _CACHE_VERSIONS_IN_USE.setdefault(version_dir, weakref.WeakSet()).update(datasets.values())
+    return datasets
 
 
 class _MostlySyntheticDatasetsClient(_MostlyBaseClient):
@@ -159,14 +295,7 @@ class _MostlySyntheticDatasetsClient(_MostlyBaseClient):
             json=config,
             response_type=SyntheticDataset,
         )
-        sid = synthetic_dataset.id
-        gid = synthetic_dataset.generator_id
-        if self.local:
-            rich.print(f"Created synthetic dataset [dodger_blue2]{sid}[/] with generator [dodger_blue2]{gid}[/]")
-        else:
-            rich.print(
-                f"Created synthetic dataset [link={self.base_url}/d/synthetic-datasets/{sid} dodger_blue2 underline]{sid}[/] with generator [link={self.base_url}/d/generators/{gid} dodger_blue2 underline]{gid}[/]"
-            )
+        _print_created_synthetic_dataset(self, synthetic_dataset)
         return synthetic_dataset
 
     # PRIVATE METHODS #
@@ -205,24 +334,10 @@ class _MostlySyntheticDatasetsClient(_MostlyBaseClient):
         response = self.request(
             verb=GET,
             path=[synthetic_dataset_id, "download"],
-            params={
-                "format": ds_format.upper() if isinstance(ds_format, str) else ds_format.value,
-                "slft": short_lived_file_token,
-            },
-            headers={
-                "Content-Type": "application/zip",
-                "Accept": "application/json, text/plain, */*",
-            },
+            **_download_request_kwargs(ds_format, short_lived_file_token),
             raw_response=True,
         )
-        content_bytes = response.content
-        # Check if 'Content-Disposition' header is present
-        if "Content-Disposition" in response.headers:
-            content_disposition = response.headers["Content-Disposition"]
-            filename = re.findall("filename=(.+)", content_disposition)[0]
-        else:
-            filename = f"synthetic-dataset-{synthetic_dataset_id[:8]}.zip"
-        return content_bytes, filename
+        return response.content, _download_filename(response, synthetic_dataset_id)
 
     def _data(self, synthetic_dataset_id: str, short_lived_file_token: str | None) -> dict[str, pd.DataFrame]:
         # download pqt
@@ -231,17 +346,27 @@ class _MostlySyntheticDatasetsClient(_MostlyBaseClient):
             ds_format=SyntheticDatasetFormat.parquet,
             short_lived_file_token=short_lived_file_token,
         )
-        # read each parquet file into a pandas dataframe
-        with zipfile.ZipFile(io.BytesIO(pqt_zip_bytes), "r") as z:
-            dir_list = {name.split("/")[0] for name in z.namelist()}
-            dfs = {}
-            for table in dir_list:
-                pqt_files = [
-                    name for name in z.namelist() if name.startswith(f"{table}/") and name.endswith(".parquet")
-                ]
-                dfs[table] = pd.concat([pd.read_parquet(z.open(name)) for name in pqt_files], axis=0)
-                dfs[table].name = table
-        return dfs
+        return _read_parquet_zip(pqt_zip_bytes)
+
+    def _data_lazy(
+        self, synthetic_dataset_id: str, short_lived_file_token: str | None, cache_dir: str | Path | None = None
+    ) -> dict[str, ds.Dataset]:
+        dataset_dir = _cached_dataset_dir(cache_dir, synthetic_dataset_id)
+        kwargs = _download_request_kwargs(SyntheticDatasetFormat.parquet, short_lived_file_token)
+        if etag := _cached_etag(dataset_dir):
+            # revalidate the cached copy, rather than downloading it again
+            kwargs["headers"]["If-None-Match"] = etag
+        with tempfile.TemporaryDirectory(dir=dataset_dir.parent) as tmp_dir:
+            zip_path = Path(tmp_dir) / "data.zip"
+            with self.stream_request(verb=GET, path=[synthetic_dataset_id, "download"], **kwargs) as response:
+                if response.status_code != 304:
+                    etag = response.headers.get("etag")
+                    with open(zip_path, "wb") as f:
+                        for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+            if zip_path.exists():
+                _extract_to_cache(zip_path, dataset_dir, etag)
+        return _open_cached_datasets(dataset_dir)
 
     def _report(
         self,
@@ -280,11 +405,24 @@ class _MostlySyntheticDatasetsClient(_MostlyBaseClient):
         )
         return response
 
+    def _generation_progress_stream(self, synthetic_dataset_id: str) -> Iterator[JobProgress]:
+        # yields nothing, if the server does not support progress streams
+        with self.stream_request(
+            verb=GET,
+            path=[synthetic_dataset_id, "generation", "stream"],
+            headers={"Accept": "text/event-stream"},
+            raise_for_status=False,
+        ) as response:
+            if response.is_success:
+                for data in iter_sse_data(response.iter_lines()):
+                    yield JobProgress(**json.loads(data))
+
     def _generation_wait(self, synthetic_dataset_id: str, progress_bar: bool, interval: float) -> SyntheticDataset:
         job_wait(
             lambda: self._generation_progress(synthetic_dataset_id),
             interval,
             progress_bar,
+            stream_progress=lambda: self._generation_progress_stream(synthetic_dataset_id),
         )
         synthetic_dataset = self.get(synthetic_dataset_id)
         return synthetic_dataset
@@ -328,3 +466,165 @@ class _MostlySyntheticProbesClient(_MostlyBaseClient):
             json=config,
         )
         return {dct["name"]: pd.DataFrame(dct["rows"]) for dct in dicts}
+
+
+class _MostlyAsyncSyntheticDatasetsClient(_MostlyAsyncBaseClient):
+    """
+    Async counterpart of the synthetic datasets client, covering the retrieval, creation, generation and download
+    of synthetic datasets.
+    """
+
+    SECTION = ["synthetic-datasets"]
+
+    async def get(self, synthetic_dataset_id: str) -> SyntheticDataset:
+        """
+        Retrieve a synthetic dataset by its ID.
+
+        Args:
+            synthetic_dataset_id: The unique identifier of the synthetic dataset.
+
+        Returns:
+            SyntheticDataset: The retrieved synthetic dataset object.
+        """
+        if not isinstance(synthetic_dataset_id, str) or len(synthetic_dataset_id) != 36:
+            raise ValueError("The provided synthetic_dataset_id must be a UUID string")
+        return await self.request(verb=GET, path=[synthetic_dataset_id], response_type=SyntheticDataset)
+
+    async def create(self, config: SyntheticDatasetConfig | dict[str, Any]) -> SyntheticDataset:
+        """
+        Create a synthetic dataset. The synthetic dataset will be in the NEW state and will need to be generated before it can be used.
+
+        Args:
+            config: Configuration for the synthetic dataset.
+
+        Returns:
+            The created synthetic dataset object.
+        """
+        synthetic_dataset = await self.request(verb=POST, path=[], json=config, response_type=SyntheticDataset)
+        _print_created_synthetic_dataset(self, synthetic_dataset)
+        return synthetic_dataset
+
+    async def data(
+        self,
+        synthetic_dataset: SyntheticDataset | str,
+        return_type: Literal["auto", "dict"] = "auto",
+        lazy: bool = False,
+        cache_dir: str | Path | None = None,
+    ) -> pd.DataFrame | dict[str, pd.DataFrame] | ds.Dataset | dict[str, ds.Dataset]:
+        """
+        Download a synthetic dataset and return it as pandas DataFrames, or as lazy pyarrow datasets.
+
+        Args:
+            synthetic_dataset: The synthetic dataset instance or its UUID.
+            return_type: The format of the returned data. "auto" for a single table, if there is only one, otherwise a dictionary. Default is "auto".
+            lazy: Whether to stream the synthetic dataset to an on-disk cache, and return it as `pyarrow.dataset.Dataset` objects. Default is False.
+            cache_dir: The cache directory, if lazy. Default is env var `MOSTLY_CACHE_DIR` if set, otherwise `~/.cache/mostlyai`.
+
+        Returns:
+            pd.DataFrame | dict[str, pd.DataFrame] | ds.Dataset | dict[str, ds.Dataset]: The synthetic dataset.
+        """
+        if isinstance(synthetic_dataset, str):
+            synthetic_dataset_id, short_lived_file_token = synthetic_dataset, None
+        else:
+            synthetic_dataset_id = synthetic_dataset.id
+            metadata = synthetic_dataset.metadata
+            short_lived_file_token = metadata.short_lived_file_token if metadata else None
+        if lazy:
+            dfs = await self._data_lazy(synthetic_dataset_id, short_lived_file_token, cache_dir)
+        else:
+            dfs = await self._data(synthetic_dataset_id, short_lived_file_token)
+        if return_type == "auto" and len(dfs) == 1:
+            return list(dfs.values())[0]
+        return dfs
+
+    async def _download(
+        self,
+        synthetic_dataset_id: str,
+        ds_format: SyntheticDatasetFormat = SyntheticDatasetFormat.parquet,
+        short_lived_file_token: str | None = None,
+    ) -> (bytes, str | None):
+        response = await self.request(
+            verb=GET,
+            path=[synthetic_dataset_id, "download"],
+            **_download_request_kwargs(ds_format, short_lived_file_token),
+            raw_response=True,
+        )
+        return response.content, _download_filename(response, synthetic_dataset_id)
+
+    async def _data(self, synthetic_dataset_id: str, short_lived_file_token: str | None) -> dict[str, pd.DataFrame]:
+        pqt_zip_bytes, _ = await self._download(
+            synthetic_dataset_id=synthetic_dataset_id,
+            ds_format=SyntheticDatasetFormat.parquet,
+            short_lived_file_token=short_lived_file_token,
+        )
+        # decoding the parquet files is CPU-bound, thus keep it off the event loop
+        return await asyncio.to_thread(_read_parquet_zip, pqt_zip_bytes)
+
+    async def _data_lazy(
+        self, synthetic_dataset_id: str, short_lived_file_token: str | None, cache_dir: str | Path | None = None
+    ) -> dict[str, ds.Dataset]:
+        dataset_dir = _cached_dataset_dir(cache_dir, synthetic_dataset_id)
+        kwargs = _download_request_kwargs(SyntheticDatasetFormat.parquet, short_lived_file_token)
+        if etag := _cached_etag(dataset_dir):
+            kwargs["headers"]["If-None-Match"] = etag
+        with tempfile.TemporaryDirectory(dir=dataset_dir.parent) as tmp_dir:
+            zip_path = Path(tmp_dir) / "data.zip"
+            async with self.stream_request(verb=GET, path=[synthetic_dataset_id, "download"], **kwargs) as response:
+                if response.status_code != 304:
+                    etag = response.headers.get("etag")
+                    with open(zip_path, "wb") as f:
+                        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            # writing to disk blocks, thus keep it off the event loop
+                            await asyncio.to_thread(f.write, chunk)
+            if zip_path.exists():
+                await asyncio.to_thread(_extract_to_cache, zip_path, dataset_dir, etag)
+        return _open_cached_datasets(dataset_dir)
+
+    async def _generation_start(self, synthetic_dataset_id: str) -> None:
+        await self.request(verb=POST, path=[synthetic_dataset_id, "generation", "start"])
+
+    async def _generation_cancel(self, synthetic_dataset_id: str) -> None:
+        await self.request(verb=POST, path=[synthetic_dataset_id, "generation", "cancel"])
+
+    async def _generation_progress(self, synthetic_dataset_id: str) -> JobProgress:
+        return await self.request(verb=GET, path=[synthetic_dataset_id, "generation"], response_type=JobProgress)
+
+    async def _generation_progress_stream(self, synthetic_dataset_id: str) -> AsyncIterator[JobProgress]:
+        # yields nothing, if the server does not support progress streams
+        async with self.stream_request(
+            verb=GET,
+            path=[synthetic_dataset_id, "generation", "stream"],
+            headers={"Accept": "text/event-stream"},
+            raise_for_status=False,
+        ) as response:
+            if response.is_success:
+                async for data in aiter_sse_data(response.aiter_lines()):
+                    yield JobProgress(**json.loads(data))
+
+    async def _generation_wait(
+        self, synthetic_dataset_id: str, progress_bar: bool, interval: float
+    ) -> SyntheticDataset:
+        await async_job_wait(
+            lambda: self._generation_progress(synthetic_dataset_id),
+            interval,
+            progress_bar,
+            stream_progress=lambda: self._generation_progress_stream(synthetic_dataset_id),
+        )
+        return await self.get(synthetic_dataset_id)
+
+
+class _MostlyAsyncSyntheticProbesClient(_MostlyAsyncBaseClient):
+    SECTION = ["synthetic-probes"]
+
+    async def create(self, config: SyntheticProbeConfig | dict[str, Any]) -> dict[str, pd.DataFrame]:
+        """
+        Create a synthetic probe.
+
+        Args:
+            config: Configuration for the synthetic probe.
+
+        Returns:
+            A dictionary mapping probe names to pandas DataFrames.
+        """
+        dicts = await self.request(verb=POST, path=[], json=config)
+        return {dct["name"]: pd.DataFrame(dct["rows"]) for dct in dicts}
@@ -28,11 +28,14 @@ import zipfile
 import sys
 import inspect
 from mostlyai.sdk.client._base_utils import convert_to_base64, read_table_from_path
-from typing import Any, ClassVar, Literal, Annotated
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, Annotated
 
 from mostlyai.sdk.client.base import CustomBaseModel
 from pydantic import Field, RootModel
 
+if TYPE_CHECKING:
+    import pyarrow.dataset
+
 
 class AboutService(CustomBaseModel):
     """
@@ -3264,20 +3267,46 @@ class SyntheticDataset(CustomBaseModel):
         file_path.write_bytes(bytes)
         return file_path
 
-    def data(self, return_type: Literal["auto", "dict"] = "auto") -> pd.DataFrame | dict[str, pd.DataFrame]:
+    def data(
+        self,
+        return_type: Literal["auto", "dict"] = "auto",
+        lazy: bool = False,
+        cache_dir: str | Path | None = None,
+    ) -> pd.DataFrame | dict[str, pd.DataFrame] | pyarrow.dataset.Dataset | dict[str, pyarrow.dataset.Dataset]:
         """
         Download synthetic dataset and return as dictionary of pandas DataFrames.
 
+        If lazy is True, the synthetic dataset is streamed to an on-disk cache instead, and returned as
+        `pyarrow.dataset.Dataset` objects, which allow to process data that does not fit into memory, e.g. via
+        `to_batches()`. Repeated calls re-use the cache, as long as the server confirms it to be up to date.
+
         Args:
             return_type (Literal["auto", "dict"]): The format of the returned data. Default is "auto".
+            lazy (bool): Whether to return lazy pyarrow datasets, backed by an on-disk cache. Default is False.
+            cache_dir (str | Path | None): The cache directory, if lazy. Default is env var `MOSTLY_CACHE_DIR` if set, otherwise `~/.cache/mostlyai`.
 
         Returns:
-            Union[pd.DataFrame, dict[str, pd.DataFrame]]: The synthetic dataset as a dictionary of pandas DataFrames.
+            Union[pd.DataFrame, dict[str, pd.DataFrame]]: The synthetic dataset as a dictionary of pandas DataFrames, or of pyarrow datasets if lazy.
+
+        Example for processing a synthetic dataset in batches:
+            ```python
+            ds = sd.data(lazy=True)
+            for batch in ds.to_batches(batch_size=100_000):
+                df = batch.to_pandas()
+            ```
         """
-        dfs = self.client._data(
-            synthetic_dataset_id=self.id,
-            short_lived_file_token=(self.metadata.short_lived_file_token if self.metadata else None),
-        )
+        short_lived_file_token = self.metadata.short_lived_file_token if self.metadata else None
+        if lazy:
+            dfs = self.client._data_lazy(
+                synthetic_dataset_id=self.id,
+                short_lived_file_token=short_lived_file_token,
+                cache_dir=cache_dir,
+            )
+        else:
+            dfs = self.client._data(
+                synthetic_dataset_id=self.id,
+                short_lived_file_token=short_lived_file_token,
+            )
         if return_type == "auto" and len(dfs) == 1:
             return list(dfs.values())[0]
         else:
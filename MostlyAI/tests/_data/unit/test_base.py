@@ -277,6 +277,35 @@ class TestSchema:
             assert n1 in expected_adjacency_list
             assert n2 in expected_adjacency_list[n1]
 
+    def test_relation_index(self, schema):
+        index = schema.relation_index
+        assert schema.relation_index is index
+        assert index.relations == tuple(schema.relations)
+        assert index.parent_context_relation["linked_hop_2"].parent.table == "linked_hop_1"
+        assert [rel.child.table for rel in index.child_context_relations["subject"]] == ["linked_hop_1"]
+        assert index.non_context_relations_to == {}
+        with pytest.raises(TypeError):
+            index.relations_from["subject"] = ()
+
+    def test_relation_index_invalidation(self, schema):
+        index = schema.relation_index
+        # re-assigning foreign keys invalidates the index
+        schema.tables["linked_hop_2"].foreign_keys = [
+            ForeignKey(column="sub_id", referenced_table="subject", is_context=False)
+        ]
+        assert schema.relation_index is not index
+        assert schema.get_parent("linked_hop_2") is None
+        assert schema.get_non_context_relations_to_table("linked_hop_2") == [
+            NonContextRelation(DataIdentifier("subject", "id"), DataIdentifier("linked_hop_2", "sub_id"))
+        ]
+        # adding a table invalidates the index
+        index = schema.relation_index
+        schema.tables["linked_hop_3"] = TheSimplestDataTable(
+            foreign_keys=[ForeignKey(column="sub_id", referenced_table="linked_hop_1", is_context=True)],
+        )
+        assert schema.relation_index is not index
+        assert sorted(schema.get_context_children("linked_hop_1")) == ["linked_hop_3"]
+
     @pytest.fixture
     def another_linked_hop_1(self):
         yield pd.DataFrame({"sub_id": [1, 2, 2], "another_1_hop_param": ["l1", "l1", "l2"]})
@@ -517,3 +546,48 @@ class TestSchemaAdvanced:
         )
         to_order = order_management_schema.subset(relations_to="Order")
         assert set(to_order_ctx.relations) | set(to_order_non_ctx.relations) == set(to_order.relations)
+
+    def test_subset_shares_tables(self, order_management_schema):
+        to_order = order_management_schema.subset(relation_type=ContextRelation, relations_to="Order")
+        # tables, whose foreign keys are not affected by the subset, are shared
+        assert to_order.tables["BusinessPartner"] is order_management_schema.tables["BusinessPartner"]
+        # other tables only hold the foreign keys of the subset, while the original tables are left untouched
+        assert to_order.tables["Order"] is not order_management_schema.tables["Order"]
+        assert to_order.tables["Order"].foreign_keys == [
+            ForeignKey(column="customer_id", referenced_table="Customer", is_context=True)
+        ]
+        assert to_order.get_foreign_keys("Order") == to_order.tables["Order"].foreign_keys
+        assert len(order_management_schema.tables["Order"].foreign_keys) == 3
+        # subsets of subsets are restricted further
+        none_to_order = to_order.subset(relation_type=NonContextRelation)
+        assert none_to_order.relations == []
+        assert none_to_order.tables["Order"].foreign_keys == []
+        assert to_order.tables["Order"].foreign_keys != []
+
+    def test_subset_of_given_tables(self, order_management_schema):
+        # foreign keys of tables, which are passed as a dict, are respected
+        tables = {name: order_management_schema.copy_table(name) for name in ["Customer", "Order"]}
+        tables["Order"].foreign_keys = [ForeignKey(column="customer_id", referenced_table="Customer", is_context=False)]
+        subset = order_management_schema.subset(tables=tables)
+        assert subset.relations == [
+            NonContextRelation(DataIdentifier("Customer", "id"), DataIdentifier("Order", "customer_id"))
+        ]
+        assert subset.tables["Order"].foreign_keys == tables["Order"].foreign_keys
+        ctx_subset = order_management_schema.subset(relation_type=ContextRelation, tables=tables)
+        assert ctx_subset.relations == []
+        assert ctx_subset.tables["Order"].foreign_keys == []
+        assert len(tables["Order"].foreign_keys) == 1
+
+    def test_subset_copy_on_write(self, order_management_schema):
+        order = order_management_schema.tables["Order"]
+        to_order = order_management_schema.subset(relation_type=ContextRelation, relations_to="Order")
+        to_order.remove_cascading_keys_relations()
+        writable_order = to_order.get_writable_table("Order")
+        assert writable_order is not order
+        assert writable_order.foreign_keys == [
+            ForeignKey(column="customer_id", referenced_table="Customer", is_context=True)
+        ]
+        writable_order.foreign_keys = []
+        assert to_order.relations == []
+        assert len(order.foreign_keys) == 3
+        assert len(order_management_schema.get_relations_to_table("Order")) == 3
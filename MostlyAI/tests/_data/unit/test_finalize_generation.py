@@ -12,20 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
 import math
 import zipfile
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 import pytest
+from pyarrow.parquet import ParquetFile
 
-from mostlyai.sdk._data.base import Schema
+from mostlyai.sdk._data.base import ForeignKey, Schema
 from mostlyai.sdk._data.dtype import STRING
 from mostlyai.sdk._data.file.table.csv import CsvDataTable
 from mostlyai.sdk._data.file.table.parquet import ParquetDataTable
 from mostlyai.sdk._local.execution.step_finalize_generation import (
     finalize_table_generation,
     export_data_to_excel,
+    export_random_samples,
+    format_datetime,
+    ZIP_WINDOW_SIZE,
+    _DeflatedZipWriter,
+    _deflate_chunk,
+    get_zip_data,
+    postprocess_temp_columns,
+    sample_parquet_row_groups,
+    write_csv_batch,
     zip_data,
 )
 from mostlyai.sdk._local.execution.jobs import _merge_tabular_language_data
@@ -80,6 +93,217 @@ def test_finalize_table_generation(tmp_path, tgt_data):
     assert post_csv["gender"].dtype == STRING
 
 
+def test_finalize_table_generation_concurrent_partitions(tmp_path):
+    gen_data_path = tmp_path / "gen"
+    gen_data_path.mkdir()
+    for i in range(7):
+        pd.DataFrame({"id": range(i * 10, (i + 1) * 10)}).to_parquet(gen_data_path / f"part.{i:06}.parquet")
+    gen_table = ParquetDataTable(path=gen_data_path, columns=["id"], name="tgt")
+    finalize_table_generation(
+        generated_data_schema=Schema(tables={"tgt": gen_table}),
+        target_table_name="tgt",
+        delivery_dir=tmp_path,
+        export_csv=True,
+        n_jobs=3,
+    )
+    assert len(list((tmp_path / "tgt" / "parquet").glob("*.parquet"))) == 7
+    # CSV is appended in partition order
+    post_csv = pd.read_csv(tmp_path / "tgt" / "csv" / "tgt.csv")
+    assert post_csv["id"].to_list() == list(range(70))
+
+
+def test_finalize_table_generation_seed(tmp_path):
+    non_ctx_path = tmp_path / "non_ctx"
+    non_ctx_path.mkdir()
+    pd.DataFrame({"id": [f"c{i}" for i in range(100)]}).to_parquet(non_ctx_path / "part.000000.parquet")
+    gen_data_path = tmp_path / "gen"
+    gen_data_path.mkdir()
+    for i in range(3):
+        pd.DataFrame({"id": range(i * 20, (i + 1) * 20), "uncle.non_ctx._is_null": ["False"] * 20}).to_parquet(
+            gen_data_path / f"part.{i:06}.parquet"
+        )
+    schema = Schema(
+        tables={
+            "tgt": ParquetDataTable(
+                path=gen_data_path,
+                name="tgt",
+                columns=["id", "uncle"],
+                foreign_keys=[ForeignKey(column="uncle", referenced_table="non_ctx", is_context=False)],
+            ),
+            "non_ctx": ParquetDataTable(path=non_ctx_path, name="non_ctx", primary_key="id"),
+        }
+    )
+
+    def _finalize(seed: int, n_jobs: int) -> list:
+        delivery_dir = tmp_path / f"delivery-{seed}-{n_jobs}"
+        finalize_table_generation(
+            generated_data_schema=schema,
+            target_table_name="tgt",
+            delivery_dir=delivery_dir,
+            export_csv=False,
+            n_jobs=n_jobs,
+            seed=seed,
+        )
+        return ParquetDataTable(path=delivery_dir / "tgt" / "parquet").read_data()["uncle"].to_list()
+
+    # sampled non-context keys are reproducible for a given seed, regardless of concurrency
+    keys = _finalize(seed=1, n_jobs=1)
+    assert all(key.startswith("c") for key in keys)
+    assert keys == _finalize(seed=1, n_jobs=3)
+    assert keys != _finalize(seed=2, n_jobs=1)
+
+
+def test_finalize_table_generation_row_groups(tmp_path):
+    gen_data_path = tmp_path / "gen"
+    gen_data_path.mkdir()
+    pd.DataFrame({"id": range(1_000)}).to_parquet(gen_data_path / "part.000000.parquet")
+    gen_table = ParquetDataTable(path=gen_data_path, columns=["id"], name="tgt")
+    with patch("mostlyai.sdk._local.execution.step_finalize_generation.FINALIZE_ROW_GROUP_SIZE", 100):
+        finalize_table_generation(
+            generated_data_schema=Schema(tables={"tgt": gen_table}),
+            target_table_name="tgt",
+            delivery_dir=tmp_path,
+            export_csv=False,
+        )
+    paths = sorted((tmp_path / "tgt" / "parquet").glob("*.parquet"))
+    # finalized partitions consist of bounded row groups
+    assert ParquetFile(paths[0]).metadata.num_row_groups == 10
+
+    with patch(
+        "pyarrow.parquet.ParquetFile.read_row_group", autospec=True, side_effect=ParquetFile.read_row_group
+    ) as m:
+        df = sample_parquet_row_groups(paths, n=50, seed=42)
+    # sampling only reads a single row group, rather than the whole partition
+    assert len(df) == 50
+    assert sum(call.args[0].metadata.row_group(call.args[1]).num_rows for call in m.call_args_list) == 100
+
+
+def test_finalize_table_generation_csv_formatting(tmp_path):
+    gen_data_path = tmp_path / "gen"
+    gen_data_path.mkdir()
+    df = pd.DataFrame(
+        {
+            "dt": pd.to_datetime(["2020-01-01 10:00:00.5", "1969-12-31 23:59:59.5", None]),
+            "flag": pd.array([True, False, None], dtype="boolean"),
+            "txt": ["a", "b,c", None],
+        }
+    )
+    # an empty first partition, so that the header must still be written once
+    df.iloc[:0].to_parquet(gen_data_path / "part.000000.parquet")
+    df.to_parquet(gen_data_path / "part.000001.parquet")
+    gen_table = ParquetDataTable(path=gen_data_path, columns=list(df.columns), name="tgt")
+    finalize_table_generation(
+        generated_data_schema=Schema(tables={"tgt": gen_table}),
+        target_table_name="tgt",
+        delivery_dir=tmp_path,
+        export_csv=True,
+    )
+    post_csv = pd.read_csv(tmp_path / "tgt" / "csv" / "tgt.csv", dtype=str, keep_default_na=False)
+    # datetimes are formatted as in format_datetime, booleans as by pandas
+    expected = format_datetime(df.copy()).astype(object).fillna("").astype(str)
+    expected["flag"] = ["True", "False", ""]
+    pd.testing.assert_frame_equal(post_csv, expected)
+
+
+def test_finalize_table_generation_csv_matches_pandas(tmp_path):
+    gen_data_path = tmp_path / "gen"
+    gen_data_path.mkdir()
+    partitions = [
+        pd.DataFrame({"id": [1, 2], "x, y": [1.0, 0.1], "txt": ["a", "b"]}),
+        pd.DataFrame({"id": [3, None], "x, y": [1e-05, None], "txt": ['b,"c"', "d\ne"]}),
+    ]
+    for i, df in enumerate(partitions):
+        df.astype({"id": "Int64"}).to_parquet(gen_data_path / f"part.{i:06}.parquet")
+    gen_table = ParquetDataTable(path=gen_data_path, columns=["id", "x, y", "txt"], name="tgt")
+    finalize_table_generation(
+        generated_data_schema=Schema(tables={"tgt": gen_table}),
+        target_table_name="tgt",
+        delivery_dir=tmp_path,
+        export_csv=True,
+    )
+    # the CSV is byte-identical to the one written by pandas, incl. header, floats and quoting
+    expected = pd.concat(partitions).astype({"id": "Int64"}).to_csv(index=False)
+    assert (tmp_path / "tgt" / "csv" / "tgt.csv").read_text() == expected
+
+
+def test_write_csv_batch_text_heavy():
+    rng = np.random.default_rng(0)
+    words = np.array(["lorem", "ipsum,", '"dolor"', "sit\namet", "", "ünïcode"])
+    n = 5_000
+    df = pd.DataFrame(
+        {
+            "id": pd.array(np.arange(n), dtype="Int64"),
+            "text": [" ".join(rng.choice(words, size=8)) for _ in range(n)],
+            "amount": np.round(rng.normal(size=n) * 10.0 ** rng.integers(-6, 18, size=n), 3),
+            "flag": rng.choice([True, False], size=n),
+        }
+    )
+    df.loc[::7, "text"] = None
+    df.loc[::11, "amount"] = np.nan
+    batch = pa.RecordBatch.from_pandas(df, preserve_index=False)
+    buffer = io.BytesIO()
+    # text-heavy batches are rendered by Arrow, without falling back to pandas
+    with patch.object(pd.DataFrame, "to_csv") as to_csv:
+        write_csv_batch(batch, buffer)
+    to_csv.assert_not_called()
+    assert buffer.getvalue().decode() == df.to_csv(index=False, header=False)
+
+    # empty values are quoted, if these are the only value of a row
+    df = pd.DataFrame({"x": ["a", "", None]})
+    buffer = io.BytesIO()
+    write_csv_batch(pa.RecordBatch.from_pandas(df, preserve_index=False), buffer)
+    assert buffer.getvalue().decode() == df.to_csv(index=False, header=False)
+
+
+def test_finalize_table_generation_csv_without_partitions(tmp_path):
+    gen_data_path = tmp_path / "gen"
+    gen_data_path.mkdir()
+    gen_table = ParquetDataTable(path=gen_data_path, columns=["id", "name"], name="tgt")
+    finalize_table_generation(
+        generated_data_schema=Schema(tables={"tgt": gen_table}),
+        target_table_name="tgt",
+        delivery_dir=tmp_path,
+        export_csv=True,
+    )
+    # the header is written, even if there is no data
+    assert (tmp_path / "tgt" / "csv" / "tgt.csv").read_text() == "id,name\n"
+
+
+def test_sample_parquet_row_groups(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"part.{i:06}.parquet"
+        pd.DataFrame({"id": range(i * 100, (i + 1) * 100)}).to_parquet(path, row_group_size=10)
+        paths.append(path)
+    with patch(
+        "pyarrow.parquet.ParquetFile.read_row_group", autospec=True, side_effect=ParquetFile.read_row_group
+    ) as m:
+        df = sample_parquet_row_groups(paths, n=25, seed=42)
+    # only as many row groups as needed are read
+    assert m.call_count == 3
+    assert len(df) == 25
+    assert df["id"].is_unique
+    pd.testing.assert_frame_equal(df, sample_parquet_row_groups(paths, n=25, seed=42))
+    # all rows are returned, if fewer than requested
+    assert sorted(sample_parquet_row_groups(paths, n=1_000)["id"]) == list(range(500))
+    assert sample_parquet_row_groups([], n=10).empty
+
+
+def test_export_random_samples(tmp_path):
+    delivery_dir = tmp_path / "FinalizedSyntheticData"
+    for table in ["A", "B"]:
+        pqt_dir = delivery_dir / table / "parquet"
+        pqt_dir.mkdir(parents=True)
+        for i in range(3):
+            pd.DataFrame({"id": range(i * 50, (i + 1) * 50)}).to_parquet(pqt_dir / f"part.{i:06}.parquet")
+    random_samples_dir = tmp_path / "RandomSamples"
+    export_random_samples(delivery_dir=delivery_dir, random_samples_dir=random_samples_dir, limit=100, seed=0)
+    for table in ["A", "B"]:
+        samples = pd.read_json(random_samples_dir / f"{table}.json", orient="records")
+        assert len(samples) == 100
+        assert samples["id"].is_unique
+
+
 def test_export_data_to_excel(tmp_path):
     # prepare parquet files
     delivery_dir = tmp_path / "FinalizedSyntheticData"
@@ -141,6 +365,116 @@ def test_zip_data(tmp_path):
     assert n_zipped_files == 10 * 5  # 10 tables, 5 partitions each
 
 
+def test_zip_data_csv(tmp_path):
+    # write CSV files of varying sizes, incl. an empty one, to FinalizedSyntheticData
+    delivery_dir = tmp_path / "FinalizedSyntheticData"
+    rng = np.random.default_rng(0)
+    contents = {}
+    for tidx, n_rows in enumerate([0, 10, 50_000]):
+        dir = delivery_dir / f"table_{tidx}" / "csv"
+        dir.mkdir(parents=True, exist_ok=True)
+        content = "".join(f"{i},{rng.integers(1_000)}\n" for i in range(n_rows)).encode()
+        (dir / f"table_{tidx}.csv").write_bytes(content)
+        contents[f"table_{tidx}/table_{tidx}.csv"] = content
+    # execute zip_data with small chunks, so that each file is deflated in many chunks concurrently
+    zip_dir = tmp_path / "ZIP"
+    with patch("mostlyai.sdk._local.execution.step_finalize_generation.ZIP_CHUNK_SIZE", 10_000):
+        zip_path = zip_data(delivery_dir=delivery_dir, format="csv", out_dir=zip_dir, n_jobs=3)
+    with zipfile.ZipFile(zip_path, "r") as zipf:
+        assert zipf.testzip() is None
+        assert sorted(zipf.namelist()) == sorted(contents)
+        for name, content in contents.items():
+            assert zipf.read(name) == content
+            assert zipf.getinfo(name).compress_type == zipfile.ZIP_DEFLATED
+    assert list(zip_dir.glob("*.tmp")) == []
+
+
+def test_get_zip_data(tmp_path):
+    delivery_dir = tmp_path / "FinalizedSyntheticData"
+    dir = delivery_dir / "table" / "parquet"
+    dir.mkdir(parents=True)
+    pd.DataFrame({"id": range(10)}).to_parquet(dir / "part.000000.parquet")
+    zip_dir = tmp_path / "ZIP"
+    # archive is built on first request, and reused afterwards
+    zip_path = get_zip_data(delivery_dir=delivery_dir, format="parquet", out_dir=zip_dir)
+    assert zip_path == zip_dir / "synthetic-parquet-data.zip"
+    with patch("mostlyai.sdk._local.execution.step_finalize_generation.zip_data") as zip_data_mock:
+        assert get_zip_data(delivery_dir=delivery_dir, format="parquet", out_dir=zip_dir) == zip_path
+        zip_data_mock.assert_not_called()
+    # delivered files are kept
+    assert (dir / "part.000000.parquet").exists()
+    with zipfile.ZipFile(zip_path, "r") as zipf:
+        assert zipf.namelist() == ["table/part.000000.parquet"]
+    # no archive for formats which have not been delivered
+    assert get_zip_data(delivery_dir=delivery_dir, format="csv", out_dir=zip_dir) is None
+
+
+def test_deflated_zip_writer(tmp_path):
+    content = b"".join(f"{i},{i % 7}\n".encode() for i in range(20_000))
+    chunks = [content[i : i + 10_000] for i in range(0, len(content), 10_000)]
+    zdicts = [b""] + [chunk[-ZIP_WINDOW_SIZE:] for chunk in chunks[:-1]]
+    deflated = [
+        (chunk, _deflate_chunk(chunk, zdict, is_last=i == len(chunks) - 1))
+        for i, (chunk, zdict) in enumerate(zip(chunks, zdicts))
+    ]
+    zip_path = tmp_path / "data.zip"
+    date_time = (2025, 3, 4, 5, 6, 8)
+    with open(zip_path, "wb") as f:
+        writer = _DeflatedZipWriter(f)
+        writer.write("deflated.csv", date_time, len(content), deflated)
+        writer.write("empty.csv", date_time, 0, [(b"", _deflate_chunk(b"", b"", is_last=True))])
+        writer.write("tëst/ünicode.csv", date_time, 3, [(b"a,b", _deflate_chunk(b"a,b", b"", is_last=True))])
+        with pytest.raises(ValueError, match="duplicate name"):
+            writer.write("empty.csv", date_time, 0, [])
+        writer.close()
+    with zipfile.ZipFile(zip_path, "r") as zipf:
+        assert zipf.testzip() is None
+        assert zipf.namelist() == ["deflated.csv", "empty.csv", "tëst/ünicode.csv"]
+        assert zipf.read("deflated.csv") == content
+        assert zipf.read("empty.csv") == b""
+        assert zipf.read("tëst/ünicode.csv") == b"a,b"
+        info = zipf.getinfo("deflated.csv")
+        assert info.compress_type == zipfile.ZIP_DEFLATED
+        assert info.compress_size < len(content)
+        assert info.date_time == date_time
+
+
+def test_deflated_zip_writer_zip64_members(tmp_path):
+    # the number of members exceeds the limit of the plain ZIP format
+    n_members = 0xFFFF + 1
+    empty = [(b"", _deflate_chunk(b"", b"", is_last=True))]
+    zip_path = tmp_path / "data.zip"
+    with open(zip_path, "wb") as f:
+        writer = _DeflatedZipWriter(f)
+        for i in range(n_members):
+            writer.write(f"{i}.csv", (2025, 1, 1, 0, 0, 0), 0, empty)
+        writer.close()
+    with zipfile.ZipFile(zip_path, "r") as zipf:
+        assert len(zipf.namelist()) == n_members
+        assert zipf.read(f"{n_members - 1}.csv") == b""
+
+
+def test_postprocess_temp_columns(tmp_path):
+    schema = Schema(
+        tables={
+            "tgt": ParquetDataTable(
+                path=tmp_path / "tgt.parquet",
+                name="tgt",
+                foreign_keys=[ForeignKey(column="uncle", referenced_table="non_ctx", is_context=False)],
+            ),
+            "non_ctx": ParquetDataTable(path=tmp_path / "non_ctx.parquet", name="non_ctx", primary_key="id"),
+        }
+    )
+    df = pd.DataFrame({"uncle.non_ctx._is_null": ["False", "True", None, "False"]}, index=[3, 5, 7, 9])
+    df = postprocess_temp_columns(df, "tgt", schema)
+    assert list(df.columns) == ["uncle"]
+    assert df.index.tolist() == [3, 5, 7, 9]
+    assert df["uncle"].isna().tolist() == [False, True, True, False]
+    keys = df["uncle"].dropna().tolist()
+    assert len(set(keys)) == 2
+    assert all(key.startswith("mostly") and len(key) == 36 for key in keys)
+
+
 def test_merge_tabular_language_data(tmp_path):
     ctx_dir = tmp_path / "OriginalData" / "ctx-data"
     tgt_dir = tmp_path / "SyntheticData"
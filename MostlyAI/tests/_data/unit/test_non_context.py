@@ -12,13 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from unittest.mock import patch
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 from mostlyai.sdk._data.base import DataIdentifier, Schema, NonContextRelation, ForeignKey
 from mostlyai.sdk._data.file.table.parquet import ParquetDataTable
 from mostlyai.sdk._data.non_context import (
+    NonContextKeyPool,
     handle_non_context_relation,
     handle_non_context_relations,
+    is_in_parent_keys,
     postproc_non_context,
     sample_non_context_keys,
 )
@@ -173,3 +179,96 @@ def test_postproc_non_context(tmp_path):
     assert tgt_postprocessed_data["uncle"].isna()[0]
     assert not tgt_postprocessed_data["uncle"].isna()[1]
     assert "uncle._is_null" not in tgt_postprocessed_data.columns
+
+
+def test_handle_non_context_relation_reads_parent_keys_once(tmp_path):
+    pd.DataFrame({"id": [1, 2, 3]}).to_parquet(tmp_path / "non_ctx.parquet")
+    non_context_table = ParquetDataTable(path=tmp_path / "non_ctx.parquet", name="non_ctx", primary_key="id")
+    relation = NonContextRelation(
+        parent=DataIdentifier(table="non_ctx", column="id"),
+        child=DataIdentifier(table="tgt", column="non_ctx_id"),
+    )
+    parent_keys_cache = {}
+    chunks = [
+        pd.DataFrame({"non_ctx_id": [1, 4, None]}),
+        pd.DataFrame({"non_ctx_id": pd.Series([3, 2], dtype="Int32")}),
+    ]
+    with patch.object(non_context_table, "read_data", wraps=non_context_table.read_data) as read_data_mock:
+        is_null_columns = [
+            handle_non_context_relation(
+                data=chunk,
+                table=non_context_table,
+                relation=relation,
+                is_target=True,
+                parent_keys_cache=parent_keys_cache,
+            )["non_ctx_id.non_ctx._is_null"].to_list()
+            for chunk in chunks
+        ]
+    assert read_data_mock.call_count == 1
+    assert is_null_columns == [["False", "True", "True"], ["False", "False"]]
+
+
+def test_is_in_parent_keys():
+    parent_keys = pa.array(["a", "b"])
+    assert is_in_parent_keys(pd.Series(["a", None, "c"]), parent_keys).tolist() == [True, False, False]
+    # incompatible types fall back to pandas
+    assert is_in_parent_keys(pd.Series([1, "b"], dtype="object"), parent_keys).tolist() == [False, True]
+
+
+def test_postproc_non_context_shares_key_pools(tmp_path):
+    non_ctx_path = tmp_path / "non_ctx"
+    non_ctx_path.mkdir()
+    pd.DataFrame({"id": ["c0", "c1"]}).to_parquet(non_ctx_path / "part.000000.parquet")
+    pd.DataFrame({"id": ["c2"]}).to_parquet(non_ctx_path / "part.000001.parquet")
+    schema = Schema(
+        tables={
+            "tgt": ParquetDataTable(
+                path=tmp_path / "tgt.parquet",
+                name="tgt",
+                foreign_keys=[ForeignKey(column="uncle", referenced_table="non_ctx", is_context=False)],
+            ),
+            "non_ctx": ParquetDataTable(path=non_ctx_path, name="non_ctx", primary_key="id"),
+        }
+    )
+    partitions = [
+        pd.DataFrame({"id": [1, 2], "uncle.non_ctx._is_null": ["True", "False"]}),
+        pd.DataFrame({"id": [3, 4, 5], "uncle.non_ctx._is_null": ["False", "False", "True"]}),
+    ]
+
+    def _postproc(seed: int) -> list[list]:
+        key_pools = {}
+        rng = np.random.default_rng(seed)
+        results = [
+            postproc_non_context(partition, schema, "tgt", key_pools=key_pools, rng=rng)["uncle"].to_list()
+            for partition in partitions
+        ]
+        assert len(key_pools) == 1
+        assert len(next(iter(key_pools.values()))) == 3
+        return results
+
+    results = _postproc(seed=42)
+    assert results == _postproc(seed=42)  # sampling is reproducible
+    assert [[pd.isna(k) for k in keys] for keys in results] == [[True, False], [False, False, True]]
+    assert all(k in ["c0", "c1", "c2"] for keys in results for k in keys if not pd.isna(k))
+
+
+def test_non_context_key_pool_empty():
+    key_pool = NonContextKeyPool.from_series(pd.Series([], dtype="string"))
+    sampled_keys = sample_non_context_keys(pd.Series(["False", "True"]), key_pool)
+    assert sampled_keys.isna().to_list() == [True, True]
+
+
+def test_non_context_key_pool_nulls():
+    # keys without nulls are used as-is, without copying these
+    keys = pa.chunked_array([pa.array(["a", "b"]), pa.array(["c"])])
+    assert NonContextKeyPool(keys).keys is keys
+    assert NonContextKeyPool(pa.chunked_array([pa.array(["a", None, "c"])])).keys.to_pylist() == ["a", "c"]
+
+
+def test_sample_non_context_keys_global_seed():
+    tgt_is_null = pd.Series(["False"] * 20)
+    non_ctx_pks = pd.Series([f"k{i}" for i in range(100)])
+    np.random.seed(42)
+    sampled_keys = sample_non_context_keys(tgt_is_null, non_ctx_pks)
+    np.random.seed(42)
+    assert sample_non_context_keys(tgt_is_null, non_ctx_pks).to_list() == sampled_keys.to_list()
@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import uuid
+
+import pyarrow as pa
 import pytest
 from mostlyai.sdk._data.exceptions import MostlyDataException
-from mostlyai.sdk._data.util.common import assert_read_only_sql
+from mostlyai.sdk._data.util.common import assert_read_only_sql, generate_uuids
 
 
 @pytest.mark.parametrize(
@@ -175,3 +178,19 @@ def test_assert_read_only_sql(sql: str, expected_error: str | None) -> None:
         with pytest.raises(MostlyDataException) as exc_info:
             assert_read_only_sql(sql)
         assert str(exc_info.value) == expected_error
+
+
+def test_generate_uuids():
+    keys = generate_uuids(1_000)
+    assert keys.type == pa.large_string()
+    assert keys.null_count == 0
+    assert len(set(keys.to_pylist())) == 1_000
+    for key in keys.to_pylist():
+        parsed = uuid.UUID(key)
+        assert str(parsed) == key
+        assert parsed.version == 4
+        assert parsed.variant == uuid.RFC_4122
+    # prefix overwrites leading characters
+    keys = generate_uuids(10, prefix="mostly").to_pylist()
+    assert all(key.startswith("mostly") and len(key) == 36 and key[8] == "-" for key in keys)
+    assert len(generate_uuids(0)) == 0
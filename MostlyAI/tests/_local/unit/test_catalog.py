@@ -0,0 +1,123 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import shutil
+from unittest import mock
+from datetime import datetime, timezone
+
+from mostlyai.sdk._local.catalog import (
+    CATALOG_FILE,
+    CatalogKind,
+    CatalogSortBy,
+    list_resources,
+    reindex_resources,
+    unindex_resource,
+)
+from mostlyai.sdk._local.storage import write_generator_to_json, write_synthetic_dataset_to_json, write_to_json
+from mostlyai.sdk.domain import Generator, Metadata, ProgressStatus, SyntheticDataset
+
+
+def test_list_resources(tmp_path):
+    for i, (name, status) in enumerate(
+        [("census", "DONE"), ("Census 2", "NEW"), ("churn", "DONE"), ("bank", "FAILED")]
+    ):
+        generator = Generator(id=f"g{i}", name=name, description=f"desc {i}", training_status=status)
+        write_generator_to_json(tmp_path / "generators" / generator.id, generator)
+    write_synthetic_dataset_to_json(
+        tmp_path / "synthetic-datasets" / "sd1", SyntheticDataset(id="sd1", generation_status=ProgressStatus.done)
+    )
+
+    total_count, items = list_resources(tmp_path, CatalogKind.generators)
+    assert total_count == 4
+    # most recently created first
+    assert [item["id"] for item in items] == ["g3", "g2", "g1", "g0"]
+    assert items[0]["name"] == "bank"
+    assert items[0]["description"] == "desc 3"
+    assert items[0]["trainingStatus"] == "FAILED"
+
+    total_count, items = list_resources(
+        tmp_path, CatalogKind.generators, search_term="CENSUS", sort_by=CatalogSortBy.name
+    )
+    assert total_count == 2
+    assert [item["name"] for item in items] == ["census", "Census 2"]
+
+    total_count, items = list_resources(tmp_path, CatalogKind.generators, status="DONE,FAILED", offset=1, limit=1)
+    assert total_count == 3
+    assert [item["id"] for item in items] == ["g2"]
+
+    total_count, items = list_resources(tmp_path, CatalogKind.synthetic_datasets)
+    assert total_count == 1
+    assert items[0]["generationStatus"] == "DONE"
+
+    # updates via the storage functions are reflected, without changing the order
+    write_generator_to_json(tmp_path / "generators" / "g0", Generator(id="g0", name="adult", training_status="DONE"))
+    _, items = list_resources(tmp_path, CatalogKind.generators)
+    assert [(item["id"], item["name"]) for item in items][-1] == ("g0", "adult")
+
+
+def test_reindex_resources(tmp_path):
+    for i in range(3):
+        write_generator_to_json(tmp_path / "generators" / f"g{i}", Generator(id=f"g{i}", training_status="NEW"))
+    # changes which bypass the storage functions, e.g. deleted or copied generators, are picked up on reindex
+    shutil.rmtree(tmp_path / "generators" / "g0")
+    (tmp_path / "generators" / "g3").mkdir()
+    write_to_json(tmp_path / "generators" / "g3" / "generator.json", Generator(id="g3", training_status="DONE"))
+    (tmp_path / "generators" / "incomplete").mkdir()
+    total_count, _ = list_resources(tmp_path, CatalogKind.generators)
+    assert total_count == 3
+
+    reindex_resources(tmp_path)
+    total_count, items = list_resources(tmp_path, CatalogKind.generators, status="DONE")
+    assert total_count == 1
+    assert items[0]["id"] == "g3"
+
+    # deleted resources are removed from the catalog
+    shutil.rmtree(tmp_path / "generators" / "g3")
+    unindex_resource(tmp_path / "generators" / "g3")
+    _, items = list_resources(tmp_path, CatalogKind.generators)
+    assert {item["id"] for item in items} == {"g1", "g2"}
+
+    # listing does not scan the resource dirs
+    with mock.patch("mostlyai.sdk._local.catalog.os.scandir") as scandir:
+        list_resources(tmp_path, CatalogKind.generators)
+    scandir.assert_not_called()
+
+    # the catalog is rebuilt from the JSON files, if it is lost
+    (tmp_path / CATALOG_FILE).unlink()
+    total_count, items = list_resources(tmp_path, CatalogKind.generators)
+    assert total_count == 2
+    assert {item["id"] for item in items} == {"g1", "g2"}
+
+
+def test_list_resources_keeps_created_at(tmp_path):
+    # resources are ordered by their creation time, which is taken from their metadata, if available
+    for i, day in enumerate([2, 3, 1]):
+        metadata = Metadata(created_at=datetime(2025, 1, day, tzinfo=timezone.utc))
+        write_generator_to_json(tmp_path / "generators" / f"g{i}", Generator(id=f"g{i}", metadata=metadata))
+    _, items = list_resources(tmp_path, CatalogKind.generators)
+    assert [item["id"] for item in items] == ["g1", "g0", "g2"]
+
+    # the order is kept, if the catalog is rebuilt from the JSON files
+    (tmp_path / CATALOG_FILE).unlink()
+    _, items = list_resources(tmp_path, CatalogKind.generators)
+    assert [item["id"] for item in items] == ["g1", "g0", "g2"]
+
+    # resources without metadata are ordered by the creation time of their dir
+    (tmp_path / CATALOG_FILE).unlink()
+    shutil.rmtree(tmp_path / "generators")
+    for i in range(3):
+        write_generator_to_json(tmp_path / "generators" / f"g{i}", Generator(id=f"g{i}"))
+    (tmp_path / CATALOG_FILE).unlink()
+    _, items = list_resources(tmp_path, CatalogKind.generators)
+    assert [item["id"] for item in items] == ["g2", "g1", "g0"]
@@ -0,0 +1,77 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+
+from mostlyai.sdk._local.execution.concurrency import execute_concurrently
+
+
+def test_execute_concurrently():
+    dependencies = {"users": set(), "products": set(), "orders": {"users", "products"}, "events": {"users"}}
+    both_started = threading.Barrier(2, timeout=5)
+    executed = []
+
+    def execute(table_name: str):
+        if table_name in {"users", "products"}:
+            # independent items are executed concurrently
+            both_started.wait()
+        executed.append(table_name)
+
+    execute_concurrently(list(dependencies), dependencies, execute, n_jobs=2)
+    assert set(executed[:2]) == {"users", "products"}
+    assert set(executed[2:]) == {"orders", "events"}
+
+    def fail(table_name: str):
+        if table_name == "users":
+            raise RuntimeError("execution failed")
+        executed.append(table_name)
+
+    executed.clear()
+    with pytest.raises(RuntimeError, match="execution failed"):
+        execute_concurrently(["users", "events"], dependencies, fail, n_jobs=2)
+    # dependent items are not executed after the item they depend on failed
+    assert executed == []
+
+
+def test_execute_concurrently_cycles():
+    dependencies = {"a": {"b"}, "b": {"a"}}
+    executed = []
+    with pytest.raises(ValueError, match="cyclic dependencies"):
+        execute_concurrently(["a", "b"], dependencies, executed.append, n_jobs=2)
+    assert executed == []
+
+    # if cycles are broken, items are executed one at a time, in the given order
+    execute_concurrently(["a", "b"], dependencies, executed.append, n_jobs=2, break_cycles=True)
+    assert executed == ["a", "b"]
+
+
+def test_execute_concurrently_exclusive():
+    lock = threading.Lock()
+    running, max_running = set(), 0
+
+    def execute(item: int):
+        nonlocal max_running
+        with lock:
+            running.add(item)
+            max_running = max(max_running, len(running & {0, 1, 2}))
+        threading.Event().wait(0.05)
+        with lock:
+            running.discard(item)
+
+    # exclusive items, here 0, 1 and 2, are not executed concurrently with each other
+    items = list(range(6))
+    execute_concurrently(items, {item: set() for item in items}, execute, n_jobs=4, is_exclusive=lambda item: item < 3)
+    assert max_running == 1
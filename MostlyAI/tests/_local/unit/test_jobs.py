@@ -0,0 +1,157 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from mostlyai.sdk._local.execution.jobs import (
+    GENERATE_MIN_AVAILABLE_MEMORY,
+    _execute_steps_concurrently,
+    _make_generation_step_dependencies,
+)
+from mostlyai.sdk._local.execution.plan import Step, make_synthetic_dataset_execution_plan
+from mostlyai.sdk._local.execution.step_finalize_generation import create_generation_schema
+from mostlyai.sdk.domain import Generator, GeneratorConfig, StepCode
+
+
+def _make_generator() -> Generator:
+    config = GeneratorConfig(
+        tables=[
+            {"name": "users", "primary_key": "id", "columns": ["id"]},
+            {"name": "admins", "columns": ["x"]},
+            {
+                "name": "orders",
+                "primary_key": "id",
+                "columns": ["id", "user_id"],
+                "foreign_keys": [{"column": "user_id", "referenced_table": "users", "is_context": True}],
+            },
+            {
+                "name": "events",
+                "columns": ["user_id"],
+                "foreign_keys": [{"column": "user_id", "referenced_table": "users", "is_context": True}],
+            },
+            {
+                "name": "order_items",
+                "columns": [
+                    {"name": "description", "model_encoding_type": "LANGUAGE_TEXT"},
+                    {"name": "order_id", "model_encoding_type": "AUTO"},
+                ],
+                "foreign_keys": [{"column": "order_id", "referenced_table": "orders", "is_context": True}],
+            },
+        ]
+    )
+    return Generator(**config.model_dump(exclude_none=True))
+
+
+def test_make_generation_step_dependencies(tmp_path):
+    generator = _make_generator()
+    steps = make_synthetic_dataset_execution_plan(generator, is_probe=True).tasks[1].steps[:-1]
+    schema = create_generation_schema(generator=generator, job_workspace_dir=tmp_path, step="pull_context_data")
+
+    dependencies = _make_generation_step_dependencies(steps, schema)
+    labels = {step.id: (step.target_table_name, step.step_code) for step in steps}
+    dependencies = {labels[id]: {labels[dep] for dep in deps} for id, deps in dependencies.items()}
+
+    tabular, language = StepCode.generate_data_tabular, StepCode.generate_data_language
+    assert dependencies == {
+        # subject tables are independent of each other
+        ("admins", tabular): set(),
+        ("users", tabular): set(),
+        # children depend on their parent, and on their older siblings
+        ("events", tabular): {("users", tabular)},
+        ("orders", tabular): {("users", tabular), ("events", tabular)},
+        ("order_items", tabular): {("orders", tabular), ("users", tabular), ("events", tabular)},
+        # LANGUAGE models additionally depend on the TABULAR data of their own table
+        ("order_items", language): {
+            ("order_items", tabular),
+            ("orders", tabular),
+            ("users", tabular),
+            ("events", tabular),
+        },
+    }
+
+
+@pytest.fixture
+def available_memory():
+    # admission of concurrent steps must not depend on the memory of the test runner
+    with mock.patch("mostlyai.sdk._local.execution.jobs.psutil") as psutil:
+        psutil.virtual_memory.return_value.available = GENERATE_MIN_AVAILABLE_MEMORY
+        yield psutil
+
+
+def test_execute_steps_concurrently(available_memory):
+    steps = [Step(id=name, step_code=StepCode.generate_data_tabular, target_table_name=name) for name in "abcd"]
+    dependencies = {"a": set(), "b": set(), "c": {"a"}, "d": {"b", "c"}}
+    both_started = threading.Barrier(2, timeout=5)
+    executed = []
+
+    def execute_step(step: Step):
+        if step.id in {"a", "b"}:
+            # independent steps run concurrently
+            both_started.wait()
+        executed.append(step.id)
+
+    _execute_steps_concurrently(steps, dependencies, execute_step, n_jobs=2)
+    assert set(executed[:2]) == {"a", "b"}
+    assert executed[2:] == ["c", "d"]
+
+    def fail_step(step: Step):
+        if step.id == "c":
+            raise RuntimeError("generation failed")
+        executed.append(step.id)
+
+    executed.clear()
+    with pytest.raises(RuntimeError, match="generation failed"):
+        _execute_steps_concurrently(steps, dependencies, fail_step, n_jobs=2)
+    # dependent steps are not started after a failure
+    assert "d" not in executed
+
+    # no further steps are admitted, while memory is short
+    available_memory.virtual_memory.return_value.available = 0
+    executed.clear()
+    _execute_steps_concurrently(steps[:2], {"a": set(), "b": set()}, lambda step: executed.append(step.id), n_jobs=2)
+    assert executed == ["a", "b"]
+
+
+def test_execute_steps_concurrently_exclusive(available_memory):
+    steps = [Step(id=name, step_code=StepCode.generate_data_language, target_table_name=name) for name in "abc"]
+    running, max_running = set(), 0
+    lock = threading.Lock()
+
+    def execute_step(step: Step):
+        nonlocal max_running
+        with lock:
+            running.add(step.id)
+            max_running = max(max_running, len(running & {"a", "b"}))
+        time.sleep(0.05)
+        with lock:
+            running.discard(step.id)
+
+    with mock.patch("torch.set_num_threads") as set_num_threads:
+        _execute_steps_concurrently(
+            steps,
+            {"a": set(), "b": set(), "c": set()},
+            execute_step,
+            n_jobs=3,
+            is_exclusive=lambda step: step.id in {"a", "b"},
+        )
+    # exclusive steps, e.g. GPU-backed LANGUAGE steps, are executed one at a time
+    assert max_running == 1
+    # the CPUs are split across concurrent steps, and the thread count is restored afterwards
+    assert set_num_threads.call_args_list[0].args[0] == max(1, (os.cpu_count() or 1) // 3)
+    assert len(set_num_threads.call_args_list) == 2
@@ -0,0 +1,125 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+
+from mostlyai.sdk._local import storage
+from mostlyai.sdk._local.progress import JOB_PROGRESS_COMPACTION_EVENTS, LocalProgressCallback
+from mostlyai.sdk._local.storage import read_job_progress_from_json, write_job_progress_to_json
+from mostlyai.sdk.domain import JobProgress, ProgressStatus, ProgressStep, ProgressValue, StepCode
+
+
+def _write_job_progress(resource_dir, n_steps: int = 200):
+    steps = [
+        ProgressStep(
+            model_label=f"table_{i}:tabular",
+            step_code=StepCode.train_model,
+            progress=ProgressValue(value=0, max=1),
+            status=ProgressStatus.new,
+        )
+        for i in range(n_steps)
+    ]
+    job_progress = JobProgress(id="g1", progress=ProgressValue(value=0, max=n_steps), steps=steps)
+    write_job_progress_to_json(resource_dir, job_progress)
+
+
+def _read_from_scratch(resource_dir) -> JobProgress:
+    # read as another process would, which has not cached the job progress yet
+    storage._JOB_PROGRESS_CACHE.clear()
+    return read_job_progress_from_json(resource_dir)
+
+
+def test_progress_event_log(tmp_path):
+    _write_job_progress(tmp_path)
+    json_before = (tmp_path / "job_progress.json").read_text()
+    log_file = tmp_path / "job_progress.events.jsonl"
+
+    callback = LocalProgressCallback(tmp_path, model_label="table_0:tabular", step_code=StepCode.train_model)
+    callback(total=10, completed=0)
+    # updates are throttled, unless they carry a message
+    callback(completed=3)
+    callback(completed=5, message={"epoch": 1})
+
+    # updates are appended to the event log, without rewriting job_progress.json
+    assert (tmp_path / "job_progress.json").read_text() == json_before
+    log_sizes = [len(line) for line in log_file.read_text().splitlines()]
+    assert len(log_sizes) == 2
+    # events only hold the updated step, regardless of the number of steps
+    assert max(log_sizes) < 500
+
+    for job_progress in [read_job_progress_from_json(tmp_path), _read_from_scratch(tmp_path)]:
+        step = job_progress.steps[0]
+        assert step.status == ProgressStatus.in_progress
+        assert (step.progress.value, step.progress.max) == (5, 10)
+        assert step.messages == [{"epoch": 1}]
+        assert job_progress.start_date is not None
+        assert job_progress.progress.value == 0
+
+    # readers tail the event log, and pick up appended events
+    callback(completed=10)
+    job_progress = read_job_progress_from_json(tmp_path)
+    assert job_progress.steps[0].status == ProgressStatus.done
+    assert job_progress.progress.value == 1
+
+    # writing the job progress as a whole supersedes the event log
+    job_progress.status = ProgressStatus.failed
+    write_job_progress_to_json(tmp_path, job_progress)
+    assert not log_file.exists()
+    assert _read_from_scratch(tmp_path).status == ProgressStatus.failed
+
+
+def test_progress_event_log_compaction(tmp_path):
+    _write_job_progress(tmp_path, n_steps=2)
+    log_file = tmp_path / "job_progress.events.jsonl"
+
+    callback = LocalProgressCallback(tmp_path, model_label="table_0:tabular", step_code=StepCode.train_model)
+    callback(total=1_000, completed=0)
+    for i in range(1, JOB_PROGRESS_COMPACTION_EVENTS):
+        callback(message={"i": i})
+    # the event log is folded into job_progress.json once it has grown long enough
+    assert not log_file.exists()
+    messages = json.loads((tmp_path / "job_progress.json").read_text())["steps"][0]["messages"]
+    assert len(messages) == JOB_PROGRESS_COMPACTION_EVENTS - 1
+
+    # and once the job is done
+    callback(completed=1_000)
+    LocalProgressCallback(tmp_path, model_label="table_1:tabular", step_code=StepCode.train_model)(completed=1, total=1)
+    assert not log_file.exists()
+    job_progress = _read_from_scratch(tmp_path)
+    assert job_progress.status == ProgressStatus.done
+    assert job_progress.end_date is not None
+
+
+def test_progress_cache_invalidation(tmp_path, monkeypatch):
+    _write_job_progress(tmp_path, n_steps=2)
+    callback = LocalProgressCallback(tmp_path, model_label="table_0:tabular", step_code=StepCode.train_model)
+    callback(total=10, completed=0)
+    read_job_progress_from_json(tmp_path)
+    stale = storage._JOB_PROGRESS_CACHE[tmp_path]
+    stale_stat = (tmp_path / "job_progress.json").stat()
+
+    # another process compacts the event log, and appends new events, while job_progress.json keeps its timestamp
+    storage.compact_job_progress(tmp_path)
+    os.utime(tmp_path / "job_progress.json", ns=(stale_stat.st_atime_ns, stale_stat.st_mtime_ns))
+    for i in range(3):
+        callback(message={"i": i})
+    storage._JOB_PROGRESS_CACHE[tmp_path] = stale
+    assert read_job_progress_from_json(tmp_path) == _read_from_scratch(tmp_path)
+
+    # the cache is bounded
+    monkeypatch.setattr(storage, "JOB_PROGRESS_CACHE_SIZE", 2)
+    for i in range(3):
+        _write_job_progress(tmp_path / f"job_{i}", n_steps=1)
+    assert list(storage._JOB_PROGRESS_CACHE) == [tmp_path / "job_1", tmp_path / "job_2"]
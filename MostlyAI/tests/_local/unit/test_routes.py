@@ -0,0 +1,193 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import io
+import json
+import time
+import zipfile
+from unittest.mock import patch
+
+import httpx
+import pandas as pd
+import pytest
+import sqlalchemy as sa
+from fastapi import FastAPI
+
+from mostlyai.sdk._local.routes import Routes
+from mostlyai.sdk._local.storage import write_connector_to_json, write_generator_to_json, write_job_progress_to_json
+from mostlyai.sdk.client._base_utils import ARROW_STREAM_MEDIA_TYPE, decode_arrow_stream, iter_sse_data
+from mostlyai.sdk.domain import (
+    Connector,
+    ConnectorAccessType,
+    ConnectorType,
+    Generator,
+    JobProgress,
+    ProgressStatus,
+    ProgressValue,
+    SyntheticDataset,
+)
+
+
+def test_slow_probe_does_not_block_other_requests(tmp_path):
+    generator_dir = tmp_path / "generators" / "g1"
+    write_generator_to_json(generator_dir, Generator(id="g1", training_status=ProgressStatus.new))
+    write_job_progress_to_json(generator_dir, JobProgress(id="g1", progress=ProgressValue(value=0, max=1)))
+
+    def slow_probing_job(synthetic_dataset_id, home_dir):
+        time.sleep(2)
+        return []
+
+    routes = Routes(tmp_path)
+    # constructing the routes has no side effects, e.g. the scheduler is only started by the server
+    assert routes.scheduler._thread is None
+    app = FastAPI()
+    app.include_router(routes.router)
+
+    async def run_requests():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            probe = asyncio.create_task(client.post("/synthetic-probes", json={"generatorId": "g1"}))
+            await asyncio.sleep(0.2)  # let the probe start
+            latencies = []
+            for _ in range(5):
+                start = time.monotonic()
+                response = await client.get("/generators/g1/training")
+                latencies.append(time.monotonic() - start)
+                assert response.status_code == 200
+            assert not probe.done()
+            assert (await probe).status_code == 200
+            return latencies
+
+    with (
+        patch("mostlyai.sdk._local.routes.execute_probing_job", side_effect=slow_probing_job),
+        patch(
+            "mostlyai.sdk._local.routes.synthetic_datasets.create_synthetic_dataset",
+            return_value=SyntheticDataset(id="sd1"),
+        ),
+    ):
+        latencies = asyncio.run(run_requests())
+    # progress polling is served while the probe is still running
+    assert max(latencies) < 1
+
+
+@pytest.fixture
+def sqlite_connector(tmp_path):
+    database = tmp_path / "data.sqlite"
+    df = pd.DataFrame({"id": range(10), "name": [f"name_{i}" for i in range(10)]})
+    df.to_sql("data", sa.create_engine(f"sqlite:///{database}"), index=False)
+    connector = Connector(
+        id="c1",
+        type=ConnectorType.sqlite,
+        access_type=ConnectorAccessType.read_data,
+        config={"database": str(database)},
+    )
+    write_connector_to_json(tmp_path / "connectors" / "c1", connector)
+    return df
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [
+        ("/connectors/c1/read-data", {"location": "main.data"}),
+        ("/connectors/c1/query", {"sql": "SELECT * FROM data ORDER BY id"}),
+    ],
+)
+def test_read_data_content_negotiation(tmp_path, sqlite_connector, path, body):
+    routes = Routes(tmp_path)
+    app = FastAPI()
+    app.include_router(routes.router)
+
+    async def run_requests():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            arrow_response = await client.post(path, json=body, headers={"Accept": ARROW_STREAM_MEDIA_TYPE})
+            parquet_response = await client.post(path, json=body, headers={"Accept": "application/octet-stream"})
+            error_response = await client.post(
+                "/connectors/c1/query",
+                json={"sql": "SELECT * FROM missing"},
+                headers={"Accept": ARROW_STREAM_MEDIA_TYPE},
+            )
+            return arrow_response, parquet_response, error_response
+
+    arrow_response, parquet_response, error_response = asyncio.run(run_requests())
+    assert arrow_response.headers["content-type"] == ARROW_STREAM_MEDIA_TYPE
+    pd.testing.assert_frame_equal(decode_arrow_stream([arrow_response.content]), sqlite_connector, check_dtype=False)
+    # clients not accepting Arrow streams keep receiving Parquet
+    assert parquet_response.headers["content-type"] == "application/octet-stream"
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(io.BytesIO(parquet_response.content)), sqlite_connector, check_dtype=False
+    )
+    # errors are reported before streaming starts
+    assert error_response.status_code == 400
+
+
+def test_download_logs_and_synthetic_dataset(tmp_path):
+    synthetic_dataset_dir = tmp_path / "synthetic-datasets" / "sd1"
+    (synthetic_dataset_dir / "logs").mkdir(parents=True)
+    (synthetic_dataset_dir / "logs" / "generation.log").write_text("log line\n" * 10_000)
+    (synthetic_dataset_dir / "ZIP").mkdir()
+    xlsx_bytes = bytes(range(256)) * 100
+    (synthetic_dataset_dir / "ZIP" / "synthetic-samples.xlsx").write_bytes(xlsx_bytes)
+
+    routes = Routes(tmp_path)
+    app = FastAPI()
+    app.include_router(routes.router)
+
+    async def run_requests():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            logs = await client.get("/synthetic-datasets/sd1/generation/logs", params={"slft": ""})
+            url, params = "/synthetic-datasets/sd1/download", {"slft": "", "format": "XLSX"}
+            full = await client.get(url, params=params)
+            partial = await client.get(url, params=params, headers={"Range": "bytes=100-199"})
+            not_modified = await client.get(url, params=params, headers={"If-None-Match": full.headers["etag"]})
+            return logs, full, partial, not_modified
+
+    logs, full, partial, not_modified = asyncio.run(run_requests())
+    with zipfile.ZipFile(io.BytesIO(logs.content)) as zip_file:
+        assert zip_file.namelist() == ["logs/generation.log"]
+        assert zip_file.read("logs/generation.log") == b"log line\n" * 10_000
+    assert full.content == xlsx_bytes
+    assert partial.status_code == 206
+    assert partial.content == xlsx_bytes[100:200]
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == full.headers["etag"]
+
+
+def test_stream_training_progress(tmp_path):
+    generator_dir = tmp_path / "generators" / "g1"
+    write_generator_to_json(generator_dir, Generator(id="g1", training_status=ProgressStatus.in_progress))
+    job_progress = JobProgress(id="g1", progress=ProgressValue(value=0, max=1), status=ProgressStatus.in_progress)
+    write_job_progress_to_json(generator_dir, job_progress)
+
+    routes = Routes(tmp_path)
+    app = FastAPI()
+    app.include_router(routes.router)
+
+    async def run_requests():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            stream = asyncio.create_task(client.get("/generators/g1/training/stream"))
+            await asyncio.sleep(0.5)
+            assert not stream.done()
+            job_progress.progress.value = 1
+            job_progress.status = ProgressStatus.done
+            write_job_progress_to_json(generator_dir, job_progress)
+            response = await asyncio.wait_for(stream, timeout=5)
+            missing = await client.get("/generators/unknown/training/stream")
+            return response, missing
+
+    response, missing = asyncio.run(run_requests())
+    assert response.headers["content-type"].startswith("text/event-stream")
+    # the stream sends the current progress right away, then each update, and ends once the job has finished
+    events = [JobProgress(**json.loads(data)) for data in iter_sse_data(response.text.splitlines())]
+    assert [event.status for event in events] == [ProgressStatus.in_progress, ProgressStatus.done]
+    assert missing.status_code == 404
@@ -0,0 +1,126 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import time
+
+import pytest
+
+from mostlyai.sdk._local.scheduler import JobKind, JobScheduler
+from mostlyai.sdk._local.storage import (
+    read_generator_from_json,
+    read_job_progress_from_json,
+    write_generator_to_json,
+    write_job_progress_to_json,
+)
+from mostlyai.sdk.domain import Generator, JobProgress, ProgressStatus, ProgressValue
+
+
+class SleepingJobScheduler(JobScheduler):
+    # run a dummy process instead of an actual training job
+    sleep_seconds = 60
+
+    def _command(self, job):
+        return [sys.executable, "-c", f"import time; time.sleep({self.sleep_seconds})"]
+
+
+@pytest.fixture
+def home_dir(tmp_path):
+    for generator_id in ["g1", "g2", "g3"]:
+        generator_dir = tmp_path / "generators" / generator_id
+        write_generator_to_json(generator_dir, Generator(id=generator_id, training_status=ProgressStatus.new))
+        write_job_progress_to_json(generator_dir, JobProgress(id=generator_id, progress=ProgressValue(value=0, max=1)))
+    return tmp_path
+
+
+def _training_status(home_dir, generator_id):
+    return read_generator_from_json(home_dir / "generators" / generator_id).training_status
+
+
+def test_scheduler_bounds_concurrency(home_dir):
+    scheduler = SleepingJobScheduler(home_dir, max_concurrent_jobs=2, min_available_memory=0, max_cpu_percent=100)
+    try:
+        for generator_id in ["g1", "g2", "g3"]:
+            scheduler.submit(JobKind.training, generator_id)
+        assert scheduler.status(JobKind.training, "g1").status == ProgressStatus.in_progress
+        assert scheduler.status(JobKind.training, "g2").status == ProgressStatus.in_progress
+        assert scheduler.status(JobKind.training, "g3").status == ProgressStatus.queued
+        assert _training_status(home_dir, "g3") == ProgressStatus.queued
+        assert read_job_progress_from_json(home_dir / "generators" / "g3").status == ProgressStatus.queued
+
+        # canceling a running job frees capacity for the next queued job
+        assert scheduler.cancel(JobKind.training, "g1")
+        assert scheduler.status(JobKind.training, "g1") is None
+        assert _training_status(home_dir, "g1") == ProgressStatus.canceled
+        assert scheduler.status(JobKind.training, "g3").status == ProgressStatus.in_progress
+        assert not scheduler.cancel(JobKind.training, "g1")
+    finally:
+        for generator_id in ["g1", "g2", "g3"]:
+            scheduler.cancel(JobKind.training, generator_id)
+
+
+def test_scheduler_survives_restart(home_dir):
+    scheduler = SleepingJobScheduler(home_dir, max_concurrent_jobs=1)
+    scheduler.submit(JobKind.training, "g1")
+    scheduler.submit(JobKind.training, "g2")
+    # a new instance picks up the persisted queue, incl. jobs spawned by the previous instance
+    restarted = SleepingJobScheduler(home_dir, max_concurrent_jobs=1)
+    try:
+        job = restarted.status(JobKind.training, "g1")
+        assert job.status == ProgressStatus.in_progress
+        restarted.schedule()
+        assert restarted.status(JobKind.training, "g1").pid == job.pid
+        assert restarted.status(JobKind.training, "g2").status == ProgressStatus.queued
+        assert restarted.cancel(JobKind.training, "g1")
+        assert restarted.status(JobKind.training, "g2").status == ProgressStatus.in_progress
+    finally:
+        restarted.cancel(JobKind.training, "g2")
+        scheduler.schedule()  # reap processes spawned by the first instance
+
+
+def test_scheduler_reaps_finished_jobs(home_dir):
+    scheduler = SleepingJobScheduler(home_dir, max_concurrent_jobs=1)
+    scheduler.sleep_seconds = 0
+    scheduler.submit(JobKind.training, "g1")
+    scheduler.submit(JobKind.training, "g2")
+    for _ in range(100):
+        scheduler.schedule()
+        if scheduler.status(JobKind.training, "g1") is None and scheduler.status(JobKind.training, "g2") is None:
+            break
+        time.sleep(0.1)
+    # jobs which exit without updating their resource are marked as failed
+    assert scheduler.status(JobKind.training, "g1") is None
+    assert scheduler.status(JobKind.training, "g2") is None
+    assert _training_status(home_dir, "g1") == ProgressStatus.failed
+    assert _training_status(home_dir, "g2") == ProgressStatus.failed
+
+
+def test_scheduler_keeps_continue_training(home_dir):
+    generator_dir = home_dir / "generators" / "g2"
+    write_generator_to_json(generator_dir, Generator(id="g2", training_status=ProgressStatus.continue_))
+    scheduler = SleepingJobScheduler(home_dir, max_concurrent_jobs=1)
+    try:
+        scheduler.submit(JobKind.training, "g1")
+        scheduler.submit(JobKind.training, "g2")
+        # the resource is marked as queued, but the job keeps the intent to continue training
+        assert _training_status(home_dir, "g2") == ProgressStatus.queued
+        job = scheduler.status(JobKind.training, "g2")
+        assert job.continue_training
+        assert JobScheduler._command(scheduler, job)[-1] == "--continue-training"
+        assert "--continue-training" not in JobScheduler._command(scheduler, scheduler.status(JobKind.training, "g1"))
+        # the queue is replaced atomically
+        assert not list((home_dir / "jobs").glob("*.tmp"))
+    finally:
+        for generator_id in ["g1", "g2"]:
+            scheduler.cancel(JobKind.training, generator_id)
@@ -13,10 +13,67 @@
 # limitations under the License.
 
 
-from mostlyai.sdk import MostlyAI
+import asyncio
+
+import pandas as pd
+import pytest
+
+from mostlyai.sdk import AsyncMostlyAI, MostlyAI
+from mostlyai.sdk._local.server import LocalServer
+from mostlyai.sdk.client.exceptions import APIStatusError
 from mostlyai.sdk.domain import AboutService
 
 
 def test_server(tmp_path):
     mostly = MostlyAI(local=True, local_dir=str(tmp_path), quiet=True)
     assert isinstance(mostly.about(), AboutService)
+
+
+def test_server_connection_pool(tmp_path):
+    with MostlyAI(local=True, local_dir=str(tmp_path), quiet=True) as mostly:
+        # all sub-clients share the connection pool of the SDK instance
+        assert mostly.generators.http_client is mostly.http_client
+        assert mostly.synthetic_datasets.http_client is mostly.http_client
+        for _ in range(3):
+            mostly.about()
+            list(mostly.generators.list())
+        # requests re-use the same connection to the local server
+        assert len(mostly.http_client._transport._pool.connections) == 1
+    assert mostly.http_client.is_closed
+
+
+def test_async_server(tmp_path):
+    async def run():
+        async with AsyncMostlyAI(local=True, local_dir=str(tmp_path), quiet=True) as mostly:
+            abouts = await asyncio.gather(*[mostly.about() for _ in range(5)])
+            assert all(isinstance(about, AboutService) for about in abouts)
+            with pytest.raises(APIStatusError):
+                await mostly.generators.get("00000000-0000-0000-0000-000000000000")
+        return mostly
+
+    mostly = asyncio.run(run())
+    assert mostly.http_client.is_closed
+    assert mostly.sync.http_client.is_closed
+
+
+def test_server_file_upload(tmp_path):
+    df = pd.DataFrame({"id": range(1_000), "x": ["a", "b"] * 500})
+    with MostlyAI(local=True, local_dir=str(tmp_path), quiet=True) as mostly:
+        g = mostly.train(data=df, name="upload", start=False)
+        table = g.tables[0]
+        # training data is uploaded as binary Parquet file to a FILE_UPLOAD connector, rather than embedded as base64
+        assert table.source_connector_id is not None
+        assert [c.name for c in table.columns] == ["id", "x"]
+        fn = tmp_path / "connectors" / table.source_connector_id / "data.parquet"
+        pd.testing.assert_frame_equal(pd.read_parquet(fn), df, check_dtype=False)
+
+        with pytest.raises(APIStatusError, match="HTTP 400"):
+            mostly.request(verb="POST", path=["connectors", "file-upload"], content=b"not a parquet file")
+        # no connector is left behind for the rejected upload
+        assert len(list((tmp_path / "connectors").iterdir())) == 1
+
+
+def test_server_starts_and_stops_scheduler(tmp_path):
+    with LocalServer(home_dir=tmp_path) as server:
+        assert server._routes.scheduler._thread.is_alive()
+    assert server._routes.scheduler._thread is None
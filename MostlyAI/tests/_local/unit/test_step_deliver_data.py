@@ -0,0 +1,55 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import pytest
+
+from mostlyai.sdk._data.conversions import CONNECTOR_TYPE_CONTAINER_CLASS_MAP
+from mostlyai.sdk._local.execution.step_deliver_data import _get_referenced_tables, _is_bucket_destination
+from mostlyai.sdk._local.execution.step_finalize_generation import create_generation_schema
+from mostlyai.sdk.domain import Connector, ConnectorType, Generator, GeneratorConfig
+
+
+def test_get_referenced_tables(tmp_path):
+    config = GeneratorConfig(
+        tables=[
+            {"name": "users", "primary_key": "id", "columns": ["id"]},
+            {"name": "products", "primary_key": "id", "columns": ["id"]},
+            {
+                "name": "orders",
+                "primary_key": "id",
+                "columns": ["id", "user_id", "product_id"],
+                "foreign_keys": [
+                    {"column": "user_id", "referenced_table": "users", "is_context": True},
+                    {"column": "product_id", "referenced_table": "products", "is_context": False},
+                ],
+            },
+        ]
+    )
+    generator = Generator(**config.model_dump(exclude_none=True))
+    schema = create_generation_schema(generator=generator, job_workspace_dir=tmp_path, step="deliver_data")
+    # both context and non-context foreign keys are enforced by the destination
+    assert _get_referenced_tables(schema) == {"users": set(), "products": set(), "orders": {"users", "products"}}
+
+
+def test_is_bucket_destination():
+    # the delivery mode follows the container class, which a connector type is mapped to; the bucket containers
+    # depend on optional cloud SDKs, thus their common base class stands in for these
+    bucket_container = "mostlyai.sdk._data.file.container.bucket_based.BucketBasedContainer"
+    with mock.patch.dict(CONNECTOR_TYPE_CONTAINER_CLASS_MAP, {ConnectorType.s3_storage: bucket_container}):
+        assert _is_bucket_destination(Connector(id="c", type=ConnectorType.s3_storage))
+    assert not _is_bucket_destination(Connector(id="c", type=ConnectorType.sqlite))
+    with pytest.raises(ValueError, match="Unsupported destination container type"):
+        _is_bucket_destination(Connector(id="c", type=ConnectorType.file_upload))
@@ -0,0 +1,133 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from unittest import mock
+
+import pandas as pd
+
+from mostlyai.sdk._local.execution.step_generate_data import (
+    DECODED_VALUE_BYTES,
+    GENERATE_MIN_BATCH_SIZE,
+    ONE_HOT_VALUE_BYTES,
+    TGT_STATS_FILE,
+    _generate_in_batches,
+    _parse_memory,
+    get_generation_batch_size,
+)
+
+
+def _write_tgt_stats(workspace_dir, is_sequential: bool = False):
+    stats = {
+        "is_sequential": is_sequential,
+        "seq_len": {"min": 1, "median": 5, "max": 10, "deciles": [1] * 11},
+        "columns": {
+            "x": {
+                "argn_processor": "tgt",
+                "argn_table": "t0",
+                "argn_column": "c0",
+                "cardinalities": {"cat": 996},
+            }
+        },
+    }
+    stats_path = workspace_dir / "ModelStore" / "tgt-stats"
+    stats_path.mkdir(parents=True)
+    (stats_path / "stats.json").write_text(json.dumps(stats))
+
+
+def test_get_generation_batch_size(tmp_path):
+    _write_tgt_stats(tmp_path / "flat")
+    # a flat sample takes 996 * 4 bytes one-hot encoded, plus 64 bytes decoded
+    assert get_generation_batch_size(tmp_path / "flat", max_memory=4048 * 1_000_000) == 1_000_000
+    assert get_generation_batch_size(tmp_path / "flat", max_memory=1) == GENERATE_MIN_BATCH_SIZE
+
+    _write_tgt_stats(tmp_path / "sequential", is_sequential=True)
+    # sequential samples consist of up to max sequence length records
+    assert get_generation_batch_size(tmp_path / "sequential", max_memory=4048 * 1_000_000) < 1_000_000 // 10
+
+
+def test_get_generation_batch_size_without_stats(tmp_path):
+    # samples are generated without batches, if the stats of the trained model can not be read
+    assert get_generation_batch_size(tmp_path, max_memory=1) is None
+
+
+def test_get_generation_batch_size_matches_engine(tmp_path):
+    # the batch size is estimated from the stats, which the engine writes to the workspace; this pins the engine's
+    # workspace layout and encoding, which are mirrored here
+    from mostlyai.engine._common import get_cardinalities
+    from mostlyai.engine._memory import extract_memory_from_string
+    from mostlyai.engine._workspace import Workspace
+
+    assert Workspace(tmp_path).tgt_stats.path == tmp_path / TGT_STATS_FILE
+    for memory in ["4GB", "512 mb", "1.5g", "1024"]:
+        assert _parse_memory(memory) == extract_memory_from_string(memory)
+
+    _write_tgt_stats(tmp_path / "flat")
+    flat_cardinality = sum(get_cardinalities(Workspace(tmp_path / "flat").tgt_stats.read()).values())
+    _write_tgt_stats(tmp_path / "sequential", is_sequential=True)
+    sequential_cardinality = sum(get_cardinalities(Workspace(tmp_path / "sequential").tgt_stats.read()).values())
+    max_memory = 10**12
+    assert get_generation_batch_size(tmp_path / "flat", max_memory=max_memory) == max_memory // (
+        flat_cardinality * ONE_HOT_VALUE_BYTES + DECODED_VALUE_BYTES
+    )
+    # sequential samples are estimated conservatively
+    assert get_generation_batch_size(tmp_path / "sequential", max_memory=max_memory) <= max_memory // (
+        (sequential_cardinality * ONE_HOT_VALUE_BYTES + DECODED_VALUE_BYTES) * 10
+    )
+
+
+def test_generate_in_batches(tmp_path):
+    calls = []
+
+    def generate(*, seed_data, sample_size, workspace_dir, update_progress, **kwargs):
+        calls.append(sample_size)
+        # the engine resets its output dir with every call
+        output_path = workspace_dir / "SyntheticData"
+        output_path.mkdir(exist_ok=True)
+        for fn in output_path.iterdir():
+            fn.unlink()
+        # the engine reports progress in its own units, starting with a placeholder total
+        update_progress(total=1, completed=0)
+        update_progress(total=2, completed=0)
+        for part in range(2):
+            pd.DataFrame({"x": [len(calls)] * (sample_size // 2)}).to_parquet(
+                output_path / f"part.{part:06}.{0:06}.parquet"
+            )
+            update_progress(completed=part + 1)
+
+    update_progress = mock.Mock()
+    with mock.patch("mostlyai.engine.generate", side_effect=generate):
+        _generate_in_batches(
+            sample_seed=None,
+            n_samples=10,
+            batch_size=4,
+            workspace_dir=tmp_path,
+            update_progress=update_progress,
+            ctx_data=None,
+        )
+
+    assert calls == [4, 4, 2]
+    fns = sorted((tmp_path / "SyntheticData").glob("*.parquet"))
+    assert [fn.name for fn in fns][:3] == [
+        "part.000000.000000.parquet",
+        "part.000000.000001.parquet",
+        "part.000001.000000.parquet",
+    ]
+    df = pd.concat([pd.read_parquet(fn) for fn in fns], ignore_index=True)
+    assert df["x"].tolist() == [1, 1, 1, 1, 2, 2, 2, 2, 3, 3]
+    # progress of the batches adds up to the progress of the overall generation, counted in samples
+    assert {c.kwargs["total"] for c in update_progress.call_args_list} == {10}
+    completed = [c.kwargs["completed"] for c in update_progress.call_args_list]
+    assert completed == sorted(completed)
+    assert completed[-1] == 10
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import re
 from unittest import mock
 
@@ -19,7 +20,7 @@ import pytest
 import respx
 from httpx import NetworkError, Response
 
-from mostlyai.sdk.client.base import DEFAULT_BASE_URL, Paginator, _MostlyBaseClient
+from mostlyai.sdk.client.base import DEFAULT_BASE_URL, Paginator, _MostlyAsyncBaseClient, _MostlyBaseClient
 from mostlyai.sdk.client.exceptions import APIError, APIStatusError
 
 
@@ -49,6 +50,19 @@ class TestMostlyBaseClient:
         assert client.base_url == DEFAULT_BASE_URL
         assert client.api_key == "12345"
 
+    @respx.mock
+    def test_request_reuses_http_client(self):
+        respx.get("https://app.mostly.ai/api/v2/test").mock(return_value=Response(200, json={"success": True}))
+        with _MostlyBaseClient(api_key="12345") as client:
+            http_client = client.http_client
+            assert client.request(path="test", verb="GET") == {"success": True}
+            assert client.request(path="test", verb="GET") == {"success": True}
+            assert client.http_client is http_client
+            assert not http_client.is_closed
+            # clients can share the connection pool of another client
+            assert _MostlyBaseClient(api_key="12345", http_client=http_client).http_client is http_client
+        assert http_client.is_closed
+
     @respx.mock
     def test_request_success(self, mostly_base_client):
         mock_url = respx.get("https://app.mostly.ai/api/v2/test").mock(
@@ -97,6 +111,35 @@ class TestMostlyBaseClient:
         assert response == {"success": True}
 
 
+class TestMostlyAsyncBaseClient:
+    @respx.mock
+    def test_request(self):
+        respx.get("https://app.mostly.ai/api/v2/test").mock(return_value=Response(200, json={"someKey": True}))
+        respx.get("https://app.mostly.ai/api/v2/missing").mock(
+            return_value=Response(404, json={"message": "Not found"})
+        )
+
+        async def run():
+            async with _MostlyAsyncBaseClient(api_key="12345") as client:
+                responses = await asyncio.gather(*[client.request(path="test", verb="GET") for _ in range(3)])
+                with pytest.raises(APIStatusError, match="HTTP 404: Not found"):
+                    await client.request(path="missing", verb="GET")
+                async with client.stream_request(path="test", verb="GET") as response:
+                    content = b"".join([chunk async for chunk in response.aiter_bytes()])
+            return responses, content, client
+
+        responses, content, client = asyncio.run(run())
+        assert responses == [{"some_key": True}] * 3
+        assert content == b'{"someKey": true}'
+        assert client.http_client.is_closed
+
+    def test_objects_are_bound_to_sync_client(self):
+        sync_client = _MostlyBaseClient(api_key="12345")
+        client = _MostlyAsyncBaseClient(api_key="12345", sync_client=sync_client)
+        assert client.object_client is sync_client
+        assert _MostlyAsyncBaseClient(api_key="12345").object_client is not sync_client
+
+
 class TestPaginator:
     @respx.mock
     def test_iteration(self, mostly_base_client):
@@ -133,3 +176,57 @@ class TestPaginator:
 
         items = list(paginator)
         assert len(items) == 0
+
+    @respx.mock
+    def test_prefetch_pages(self, mostly_base_client):
+        ids = list(range(23))
+
+        def request_callback(request):
+            offset, limit = int(request.url.params["offset"]), int(request.url.params["limit"])
+            results = [{"id": i} for i in ids[offset : offset + limit]]
+            return Response(200, json={"results": results, "totalCount": len(ids)})
+
+        route = respx.get(url=mock.ANY).mock(side_effect=request_callback)
+
+        with Paginator(mostly_base_client, dict, page_size=5, prefetch_pages=3, offset=2) as paginator:
+            assert next(paginator)["id"] == 2
+            # next pages are fetched ahead of the caller, once the total count is known
+            assert len(paginator._pending_pages) == 3
+            items = [next(paginator)] + list(paginator)
+        assert [item["id"] for item in items] == ids[3:]
+        offsets = sorted(int(call.request.url.params["offset"]) for call in route.calls)
+        assert offsets == [2, 7, 12, 17, 22]
+
+    @respx.mock
+    def test_prefetch_pages_without_total_count(self, mostly_base_client):
+        ids = list(range(7))
+
+        def request_callback(request):
+            offset, limit = int(request.url.params["offset"]), int(request.url.params["limit"])
+            return Response(200, json={"results": [{"id": i} for i in ids[offset : offset + limit]]})
+
+        route = respx.get(url=mock.ANY).mock(side_effect=request_callback)
+
+        paginator = Paginator(mostly_base_client, dict, page_size=3, limit=5)
+        assert [item["id"] for item in paginator] == [0, 1, 2, 3, 4]
+        # pages are fetched one at a time, up to the limit
+        assert [int(call.request.url.params["offset"]) for call in route.calls] == [0, 3]
+        assert paginator._executor is None
+
+    @respx.mock
+    def test_prefetch_pages_with_capped_page_size(self, mostly_base_client):
+        ids = list(range(100))
+
+        def request_callback(request):
+            # the server caps the page size below the requested one
+            offset, limit = int(request.url.params["offset"]), min(int(request.url.params["limit"]), 20)
+            results = [{"id": i} for i in ids[offset : offset + limit]]
+            return Response(200, json={"results": results, "totalCount": len(ids)})
+
+        route = respx.get(url=mock.ANY).mock(side_effect=request_callback)
+
+        with Paginator(mostly_base_client, dict, page_size=50, prefetch_pages=2) as paginator:
+            items = list(paginator)
+        assert [item["id"] for item in items] == ids
+        # once a page turns out to be capped, pages continue with the server's page size
+        assert int(route.calls[-1].request.url.params["limit"]) == 20
@@ -0,0 +1,119 @@
+# Copyright 2025 MOSTLY AI
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import gc
+import io
+import uuid
+import zipfile
+
+import pandas as pd
+import respx
+from httpx import Response
+
+from mostlyai.sdk.client.synthetic_datasets import (
+    _MostlyAsyncSyntheticDatasetsClient,
+    _MostlySyntheticDatasetsClient,
+)
+from mostlyai.sdk.domain import SyntheticDataset
+
+
+def _parquet_zip(tables: dict[str, list[pd.DataFrame]]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        for table, parts in tables.items():
+            for i, df in enumerate(parts):
+                z.writestr(f"{table}/part.{i:06}.parquet", df.to_parquet(index=False))
+    return buffer.getvalue()
+
+
+@respx.mock
+def test_data_lazy(tmp_path):
+    sd_id = str(uuid.uuid4())
+    archive = _parquet_zip(
+        {
+            "players": [pd.DataFrame({"id": [1, 2]}), pd.DataFrame({"id": [3]})],
+            "seasons": [pd.DataFrame({"player_id": [1, 1, 3], "year": [2020, 2021, 2020]})],
+        }
+    )
+
+    def download(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return Response(304, headers={"etag": '"v1"'})
+        return Response(200, content=archive, headers={"etag": '"v1"'})
+
+    route = respx.get(f"https://app.mostly.ai/api/v2/synthetic-datasets/{sd_id}/download").mock(side_effect=download)
+    client = _MostlySyntheticDatasetsClient(api_key="test_api_key")
+    sd = SyntheticDataset(id=sd_id, client=client)
+
+    datasets = sd.data(return_type="dict", lazy=True, cache_dir=tmp_path)
+    assert set(datasets) == {"players", "seasons"}
+    assert datasets["players"].to_table().column("id").to_pylist() == [1, 2, 3]
+    assert datasets["seasons"].count_rows() == 3
+    assert [batch.num_rows for batch in datasets["players"].to_batches()] == [2, 1]
+
+    # repeated calls hit the on-disk cache, once the server confirms it to be up to date
+    datasets = sd.data(return_type="dict", lazy=True, cache_dir=tmp_path)
+    assert route.call_count == 2
+    assert route.calls.last.response.status_code == 304
+    assert datasets["players"].count_rows() == 3
+
+    # eager and lazy downloads yield the same data
+    dfs = sd.data(return_type="dict")
+    pd.testing.assert_frame_equal(dfs["seasons"], datasets["seasons"].to_table().to_pandas())
+
+
+@respx.mock
+def test_data_lazy_keeps_versions_in_use(tmp_path):
+    sd_id = str(uuid.uuid4())
+    archives = {
+        '"v1"': _parquet_zip({"players": [pd.DataFrame({"id": [1, 2]})]}),
+        '"v2"': _parquet_zip({"players": [pd.DataFrame({"id": [3]})]}),
+    }
+    etags = ['"v1"', '"v2"', '"v1"']
+
+    def download(request):
+        etag = etags.pop(0)
+        return Response(200, content=archives[etag], headers={"etag": etag})
+
+    respx.get(f"https://app.mostly.ai/api/v2/synthetic-datasets/{sd_id}/download").mock(side_effect=download)
+    client = _MostlySyntheticDatasetsClient(api_key="test_api_key")
+    dataset_dir = tmp_path / "synthetic-datasets" / sd_id
+
+    players_v1 = client._data_lazy(sd_id, None, cache_dir=tmp_path)["players"]
+    players_v2 = client._data_lazy(sd_id, None, cache_dir=tmp_path)["players"]
+    # datasets, which have been opened from a superseded version, remain readable
+    assert players_v1.to_table().column("id").to_pylist() == [1, 2]
+    assert players_v2.to_table().column("id").to_pylist() == [3]
+    assert len(list(dataset_dir.glob("v-*"))) == 2
+
+    # superseded versions are pruned, once these are no longer in use
+    del players_v1
+    gc.collect()
+    client._data_lazy(sd_id, None, cache_dir=tmp_path)
+    assert len(list(dataset_dir.glob("v-*"))) == 2
+    assert not list(dataset_dir.glob(".tmp-*"))
+
+
+@respx.mock
+def test_async_data_lazy(tmp_path):
+    sd_id = str(uuid.uuid4())
+    archive = _parquet_zip({"players": [pd.DataFrame({"id": [1, 2]}), pd.DataFrame({"id": [3]})]})
+    respx.get(f"https://app.mostly.ai/api/v2/synthetic-datasets/{sd_id}/download").mock(
+        return_value=Response(200, content=archive, headers={"etag": '"v1"'})
+    )
+    client = _MostlyAsyncSyntheticDatasetsClient(api_key="test_api_key")
+
+    datasets = asyncio.run(client._data_lazy(sd_id, None, cache_dir=tmp_path))
+    assert datasets["players"].to_table().column("id").to_pylist() == [1, 2, 3]
@@ -12,13 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import base64
 import io
 import math
 import tempfile
 import uuid
 from pathlib import Path
-from unittest.mock import patch, Mock, ANY
+from unittest.mock import patch, AsyncMock, Mock, ANY
 
 import pandas as pd
 import pytest
@@ -41,9 +42,14 @@ from mostlyai.sdk.domain import (
 )
 from mostlyai.sdk.client._base_utils import (
     convert_to_base64,
+    decode_arrow_stream,
+    encode_arrow_stream,
+    iter_sse_data,
     read_table_from_path,
 )
+from mostlyai.sdk.client.exceptions import APIError
 from mostlyai.sdk.client._utils import (
+    async_job_wait,
     job_wait,
     harmonize_sd_config,
 )
@@ -66,6 +72,39 @@ def test_convert_to_base64():
     pd.testing.assert_frame_equal(df, decoded_df)
 
 
+def test_encode_decode_arrow_stream():
+    chunks = [pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}), pd.DataFrame({"a": [3], "b": ["z"]})]
+    encoded = list(encode_arrow_stream(iter(chunks)))
+    # each chunk is encoded as soon as it is available
+    assert len(encoded) == len(chunks) + 1
+    # decoding works on arbitrarily split bytes, as received over the network
+    stream = b"".join(encoded)
+    df = decode_arrow_stream(stream[i : i + 7] for i in range(0, len(stream), 7))
+    pd.testing.assert_frame_equal(df, pd.concat(chunks, ignore_index=True))
+
+    # chunks with deviating dtypes are cast to the schema of the first chunk
+    df = decode_arrow_stream(encode_arrow_stream([pd.DataFrame({"a": [1.5]}), pd.DataFrame({"a": [2]})]))
+    assert df["a"].tolist() == [1.5, 2.0]
+
+    assert decode_arrow_stream(encode_arrow_stream([])).empty
+
+
+def test_encode_arrow_stream_with_all_null_columns():
+    chunks = [pd.DataFrame({"a": [1, 2], "b": [None, None]}), pd.DataFrame({"a": [3], "b": ["z"]})]
+    # the type of an all-null column is only determined by a later chunk
+    df = decode_arrow_stream(encode_arrow_stream(iter(chunks)))
+    assert df["b"].tolist() == [None, None, "z"]
+
+    # columns which stay all-null across the stream keep their null type
+    df = decode_arrow_stream(encode_arrow_stream([pd.DataFrame({"b": [None]}), pd.DataFrame({"b": [None]})]))
+    assert df["b"].tolist() == [None, None]
+
+    # columns which are still all-null after max buffered rows are streamed as strings
+    with patch("mostlyai.sdk.client._base_utils.ARROW_STREAM_MAX_BUFFERED_ROWS", 2):
+        encoded = list(encode_arrow_stream(iter(chunks + [pd.DataFrame({"a": [4], "b": [5]})])))
+    assert decode_arrow_stream(encoded)["b"].tolist() == [None, None, "z", "5"]
+
+
 def test_read_table_from_path():
     # Create a temporary CSV file for testing
     delimiters = ",;|\t' :"
@@ -81,6 +120,64 @@ def test_read_table_from_path():
         pd.testing.assert_frame_equal(read_df, df)
 
 
+def test_iter_sse_data():
+    lines = [": keep-alive", "", 'data: {"a": 1}', "", "event: update", "data: line 1", "data:line 2", "", "data: x"]
+    # incomplete events at the end of the stream are dropped
+    assert list(iter_sse_data(lines)) == ['{"a": 1}', "line 1\nline 2"]
+
+
+def _job_progress(value: int) -> JobProgress:
+    status = ProgressStatus.done if value >= 2 else ProgressStatus.in_progress
+    end_date = get_current_utc_time() if value >= 2 else None
+    return JobProgress(id="job1", progress=ProgressValue(value=value, max=2), status=status, end_date=end_date)
+
+
+def test_job_wait_streams_progress():
+    get_progress = Mock(return_value=_job_progress(0))
+    stream_progress = Mock(return_value=iter([_job_progress(1), _job_progress(2)]))
+    with patch("mostlyai.sdk.client._utils.time.sleep") as sleep:
+        job_wait(get_progress, interval=1, progress_bar=False, stream_progress=stream_progress)
+    # completion is detected from the stream, without polling
+    assert get_progress.call_count == 1
+    sleep.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "stream",
+    [
+        # server does not support progress streams
+        [],
+        # progress stream got interrupted
+        [_job_progress(1), APIError("connection lost", do_rich_print=False)],
+    ],
+)
+def test_job_wait_falls_back_to_polling(stream):
+    def stream_progress():
+        for item in stream:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    get_progress = Mock(side_effect=[_job_progress(0), _job_progress(1), _job_progress(2)])
+    with patch("mostlyai.sdk.client._utils.time.sleep") as sleep:
+        job_wait(get_progress, interval=1, progress_bar=False, stream_progress=stream_progress)
+    assert get_progress.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_async_job_wait():
+    async def stream_progress():
+        yield _job_progress(1)
+        raise APIError("connection lost", do_rich_print=False)
+
+    get_progress = AsyncMock(side_effect=[_job_progress(0), _job_progress(2)])
+    with patch("mostlyai.sdk.client._utils.asyncio.sleep", new=AsyncMock()) as sleep:
+        asyncio.run(async_job_wait(get_progress, interval=1, progress_bar=False, stream_progress=stream_progress))
+    # the interrupted stream is resumed by polling
+    assert get_progress.await_count == 2
+    assert sleep.await_count == 1
+
+
 @pytest.mark.skip("Fails on remote during CI")
 def test__job_wait():
     # Timeline in seconds with job and step progression:
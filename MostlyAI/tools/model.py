@@ -14,7 +14,7 @@
 import uuid
 import zipfile
 from pathlib import Path
-from typing import Annotated, Any, ClassVar, Literal
+from typing import TYPE_CHECKING, Annotated, Any, ClassVar, Literal
 
 import pandas as pd
 import rich
@@ -38,6 +38,9 @@ from mostlyai.sdk.domain import (
     SourceColumnConfig,
 )
 
+if TYPE_CHECKING:
+    import pyarrow.dataset
+
 
 class Connector:
     OPEN_URL_PARTS: ClassVar[list] = ["d", "connectors"]
@@ -749,20 +752,46 @@ class SyntheticDataset:
         file_path.write_bytes(bytes)
         return file_path
 
-    def data(self, return_type: Literal["auto", "dict"] = "auto") -> pd.DataFrame | dict[str, pd.DataFrame]:
+    def data(
+        self,
+        return_type: Literal["auto", "dict"] = "auto",
+        lazy: bool = False,
+        cache_dir: str | Path | None = None,
+    ) -> pd.DataFrame | dict[str, pd.DataFrame] | pyarrow.dataset.Dataset | dict[str, pyarrow.dataset.Dataset]:
         """
         Download synthetic dataset and return as dictionary of pandas DataFrames.
 
+        If lazy is True, the synthetic dataset is streamed to an on-disk cache instead, and returned as
+        `pyarrow.dataset.Dataset` objects, which allow to process data that does not fit into memory, e.g. via
+        `to_batches()`. Repeated calls re-use the cache, as long as the server confirms it to be up to date.
+
         Args:
             return_type (Literal["auto", "dict"]): The format of the returned data. Default is "auto".
+            lazy (bool): Whether to return lazy pyarrow datasets, backed by an on-disk cache. Default is False.
+            cache_dir (str | Path | None): The cache directory, if lazy. Default is env var `MOSTLY_CACHE_DIR` if set, otherwise `~/.cache/mostlyai`.
 
         Returns:
-            Union[pd.DataFrame, dict[str, pd.DataFrame]]: The synthetic dataset as a dictionary of pandas DataFrames.
+            Union[pd.DataFrame, dict[str, pd.DataFrame]]: The synthetic dataset as a dictionary of pandas DataFrames, or of pyarrow datasets if lazy.
+
+        Example for processing a synthetic dataset in batches:
+            ```python
+            ds = sd.data(lazy=True)
+            for batch in ds.to_batches(batch_size=100_000):
+                df = batch.to_pandas()
+            ```
         """
-        dfs = self.client._data(
-            synthetic_dataset_id=self.id,
-            short_lived_file_token=self.metadata.short_lived_file_token if self.metadata else None,
-        )
+        short_lived_file_token = self.metadata.short_lived_file_token if self.metadata else None
+        if lazy:
+            dfs = self.client._data_lazy(
+                synthetic_dataset_id=self.id,
+                short_lived_file_token=short_lived_file_token,
+                cache_dir=cache_dir,
+            )
+        else:
+            dfs = self.client._data(
+                synthetic_dataset_id=self.id,
+                short_lived_file_token=short_lived_file_token,
+            )
         if return_type == "auto" and len(dfs) == 1:
             return list(dfs.values())[0]
         else:
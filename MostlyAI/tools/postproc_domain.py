@@ -47,6 +47,7 @@ def postprocess_model_file(file_path):
     # Modify the contents
     new_lines = []
     import_typing_updated = False
+    type_checking_added = False
     private_classes = get_private_classes(MODEL_FILE_PATH)
 
     for line in lines:
@@ -69,9 +70,15 @@ def postprocess_model_file(file_path):
         elif "from typing" in line and not import_typing_updated:
             # Append ', ClassVar' to the line if it doesn't already contain ClassVar
             if "ClassVar" not in line:
+                line = line.replace("from typing import ", "from typing import TYPE_CHECKING, ")
                 line = line.rstrip() + ", ClassVar, Literal, Annotated\n"
                 import_typing_updated = True
             new_lines.append(line)
+        elif "from pydantic import Field" in line and not type_checking_added:
+            # Add imports that are only needed for type hints of the extended model
+            new_lines.append(line)
+            new_lines.append("\nif TYPE_CHECKING:\n    import pyarrow.dataset\n")
+            type_checking_added = True
         else:
             # Replace 'UUID' with 'str'
             new_line = line.replace("UUID", "str")